@@ -1,16 +1,15 @@
 import logging
 import os
 import re
-import tempfile
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Any, Callable, Iterator, List, Optional
 
 import fitz  # PyMuPDF
 
 try:
-    from pdf2image import convert_from_path
+    from PIL import Image
 except Exception:  # pragma: no cover
-    convert_from_path = None
+    Image = None
 
 try:
     import pytesseract
@@ -45,30 +44,72 @@ class PDFConverter:
 
         return markdown
 
-    def convert_to_markdown(self, pdf_path: str) -> str:
+    def convert_to_markdown(
+        self,
+        pdf_path: str,
+        on_page: Optional[Callable[[int, int], None]] = None,
+    ) -> str:
+        return "\n\n".join(self.iter_markdown_pages(pdf_path, on_page=on_page)).strip() + "\n"
+
+    def iter_markdown_pages(
+        self,
+        pdf_path: str,
+        on_page: Optional[Callable[[int, int], None]] = None,
+        ocr_memo: Optional[Any] = None,
+        render_page: Optional[Callable[[int], Any]] = None,
+        ocr_image: Optional[Callable[[Any], str]] = None,
+        map_pages: Optional[Callable[[Callable[[Any], Any], Iterator[Any]], Iterator[Any]]] = None,
+    ) -> Iterator[str]:
+        # `ocr_memo` (optional) exposes lookup(page_number) / store(page_number, text) and lets
+        # callers skip re-running OCR on scanned pages they have already seen. `render_page`
+        # (optional) returns the PIL image to OCR for a 1-based page number; by default the page
+        # is rasterized in-process with PyMuPDF. `ocr_image` (optional) reads the text off that
+        # image; by default it is pytesseract's `image_to_string`. `map_pages` (optional) is an
+        # ordered, lazy `map(fn, pages)` replacement that may walk and OCR the pages on other
+        # threads; it is closed before the document is.
         if not os.path.isfile(pdf_path):
             raise FileNotFoundError(f"PDF not found: {pdf_path}")
 
         self.logger.info("Processing PDF: %s", pdf_path)
-        pages: List[PageConversionResult] = []
 
         with fitz.open(pdf_path) as doc:
-            for index, page in enumerate(doc, start=1):
-                page_markdown = self._extract_page_markdown(page)
-
-                # OCR fallback for scanned/image-heavy pages.
-                if len(page_markdown.strip()) < 30:
-                    ocr_text = self._ocr_page(pdf_path, index)
+            total_pages = len(doc)
+
+            def pages() -> Iterator[tuple[int, str, Optional[str], Any]]:
+                for index, page in enumerate(doc, start=1):
+                    page_markdown = self._extract_page_markdown(page)
+                    ocr_text, image = None, None
+
+                    # OCR fallback for scanned/image-heavy pages.
+                    if len(page_markdown.strip()) < 30:
+                        ocr_text = ocr_memo.lookup(index) if ocr_memo is not None else None
+                        if ocr_text is None:
+                            image = self._ocr_input(page, render_page, ocr_image)
+                    yield index, page_markdown, ocr_text, image
+
+            def ocr(job: tuple[int, str, Optional[str], Any]) -> tuple[int, str, Optional[str], bool]:
+                index, page_markdown, ocr_text, image = job
+                if image is None:
+                    return index, page_markdown, ocr_text, False
+                return index, page_markdown, self._ocr_page(index, image, ocr_image), True
+
+            results = (map_pages or map)(ocr, pages())
+            try:
+                for index, page_markdown, ocr_text, fresh in results:
+                    if fresh and ocr_text and ocr_memo is not None:
+                        ocr_memo.store(index, ocr_text)
                     if ocr_text:
                         page_markdown = self._format_text_to_markdown(ocr_text)
 
-                pages.append(PageConversionResult(page_number=index, markdown=page_markdown.strip()))
-
-        rendered_pages = [
-            f"## Page {page.page_number}\n\n{page.markdown or '*No text detected on this page.*'}"
-            for page in pages
-        ]
-        return "\n\n".join(rendered_pages).strip() + "\n"
+                    result = PageConversionResult(page_number=index, markdown=page_markdown.strip())
+                    if on_page is not None:
+                        on_page(index, total_pages)
+                    yield f"## Page {result.page_number}\n\n{result.markdown or '*No text detected on this page.*'}"
+            finally:
+                # Stops a threaded `map_pages` before the document it reads from is closed.
+                close = getattr(results, "close", None)
+                if close is not None:
+                    close()
 
     def _extract_page_markdown(self, page: fitz.Page) -> str:
         text_dict = page.get_text("dict")
@@ -95,25 +136,32 @@ class PDFConverter:
         merged_text = "\n\n".join(block_text for _, _, block_text in text_blocks)
         return self._format_text_to_markdown(merged_text)
 
-    def _ocr_page(self, pdf_path: str, page_number: int) -> str:
-        if convert_from_path is None or pytesseract is None:
-            return ""
-
+    def _render_page(self, page: fitz.Page, dpi: int = 250) -> Any:
+        pix = page.get_pixmap(dpi=dpi, alpha=False)
+        mode = "RGB" if pix.n >= 3 else "L"
+        return Image.frombytes(mode, [pix.width, pix.height], pix.samples)
+
+    def _ocr_input(
+        self,
+        page: fitz.Page,
+        render_page: Optional[Callable[[int], Any]] = None,
+        ocr_image: Optional[Callable[[Any], str]] = None,
+    ) -> Any:
+        if (ocr_image is None and pytesseract is None) or (render_page is None and Image is None):
+            return None
+
+        page_number = page.number + 1
         self.logger.info("Falling back to OCR for page %s", page_number)
         try:
-            with tempfile.TemporaryDirectory(prefix="pdf_ocr_") as temp_dir:
-                images = convert_from_path(
-                    pdf_path,
-                    dpi=250,
-                    first_page=page_number,
-                    last_page=page_number,
-                    output_folder=temp_dir,
-                    fmt="png",
-                )
-                if not images:
-                    return ""
-
-                return pytesseract.image_to_string(images[0]).strip()
+            return render_page(page_number) if render_page is not None else self._render_page(page)
+        except Exception as exc:
+            self.logger.warning("OCR fallback unavailable for page %s: %s", page_number, str(exc))
+            return None
+
+    def _ocr_page(self, page_number: int, image: Any, ocr_image: Optional[Callable[[Any], str]] = None) -> str:
+        try:
+            text = ocr_image(image) if ocr_image is not None else pytesseract.image_to_string(image)
+            return text.strip()
         except Exception as exc:
             self.logger.warning("OCR fallback unavailable for page %s: %s", page_number, str(exc))
             return ""
@@ -1 +1,5 @@
 # FastAPI app package.
+import time
+
+# Marks when the backend started importing, for the startup report in main.py.
+IMPORT_STARTED = time.perf_counter()
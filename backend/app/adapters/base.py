@@ -20,6 +20,10 @@ class AdapterInfo:
     supports_options: list[str] = field(default_factory=list)
     latency_hint: Optional[str] = None
     cost_hint: Optional[str] = None
+    max_concurrency: Optional[int] = None
+    version: str = "1"
+    health_ttl_seconds: Optional[int] = None
+    warm: bool = False
 
 
 @dataclass
@@ -5,8 +5,6 @@ import os
 import tempfile
 from typing import Any, Optional
 
-from pdf2image import convert_from_path
-
 from .base import AdapterExecution, AdapterHealth, AdapterInfo
 
 logger = logging.getLogger(__name__)
@@ -125,13 +123,14 @@ class HfSpaceAdapter:
             pass
 
         try:
-            # Try page image input if space expects images.
+            # Try page image input if space expects images; only page 1 is sent, so only page 1 is rendered.
+            from ..rasters import render_pdf_page
+
+            page = render_pdf_page(pdf_path, 1, dpi=220, adaptive=False)
             with tempfile.TemporaryDirectory(prefix="hfspace_") as tmp:
-                pages = convert_from_path(pdf_path, dpi=220, output_folder=tmp, fmt="png")
-                if not pages:
-                    raise RuntimeError("No pages rendered for space input")
+                # The Space client uploads files by path, so this one PNG still goes through disk.
                 image_path = os.path.join(tmp, "page_1.png")
-                pages[0].save(image_path, format="PNG")
+                page.save(image_path, format="PNG")
                 result = client.predict(image_path, api_name=self.api_name)
                 markdown = self._extract_markdown(result)
                 if markdown:
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
-from ..models.base import ModelDefinition
+from ..model_loader import LocalModel
+from ..options import get_max_pages
+from ..progress import run_scope
+from ..runtimes import RUNTIMES
 from .base import AdapterExecution, AdapterHealth, AdapterInfo
 
 
 class LocalModelAdapter:
-    def __init__(self, model: ModelDefinition, enabled: bool = True):
+    def __init__(self, model: LocalModel, enabled: bool = True):
         self.model = model
         self.info = AdapterInfo(
             model_id=model.model_id,
@@ -27,7 +30,31 @@ class LocalModelAdapter:
     def convert_with_meta(
         self, pdf_path: str, options: Optional[dict[str, Any]] = None
     ) -> tuple[str, AdapterExecution]:
-        markdown = self.model.converter.convert(pdf_path, options)
+        # The converter's `last_run` is read back from this call's own scope, not from whichever
+        # concurrent conversion on the same converter finished last.
+        with run_scope():
+            markdown = self.model.converter.convert(pdf_path, options)
+            return markdown, self.last_execution()
+
+    @property
+    def supports_page_stream(self) -> bool:
+        return self.model.supports_page_stream
+
+    def iter_pages(self, pdf_path: str, options: Optional[dict[str, Any]] = None) -> Iterator[str]:
+        # Raw page chunks; read `last_execution()` once the iterator is exhausted, inside the
+        # same `run_scope()` the pages were iterated in.
+        return self.model.converter.iter_pages(pdf_path, options)
+
+    def page_limit(self, options: Optional[dict[str, Any]] = None) -> Optional[int]:
+        # The most pages a conversion with these options covers: the converter's own cap where
+        # it has one (e.g. docTR stops at 30), otherwise just `maxPages`.
+        limit = getattr(self.model.converter, "page_limit", None)
+        return limit(options) if callable(limit) else get_max_pages(options)
+
+    def runtimes(self) -> list[dict[str, Any]]:
+        return RUNTIMES.describe(self.model.model_id)
+
+    def last_execution(self) -> AdapterExecution:
         run = getattr(self.model.converter, "last_run", None)
 
         if isinstance(run, dict):
@@ -43,13 +70,10 @@ class LocalModelAdapter:
             fallback_used = not available and self.info.model_id != "native"
             note = reason
 
-        return (
-            markdown,
-            AdapterExecution(
-                requested_model=self.info.model_id,
-                engine_used=engine_used,
-                provider_used=provider_used,
-                fallback_used=fallback_used,
-                note=note,
-            ),
+        return AdapterExecution(
+            requested_model=self.info.model_id,
+            engine_used=engine_used,
+            provider_used=provider_used,
+            fallback_used=fallback_used,
+            note=note,
         )
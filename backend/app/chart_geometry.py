@@ -10,7 +10,7 @@ from typing import Any
 import cv2
 import numpy as np
 
-from .models.common import render_pdf_images
+from .rasters import page_range, render_pdf_page
 
 
 def _extract_label_candidates(markdown: str) -> list[str]:
@@ -257,13 +257,13 @@ def _build_geometry_preview(
 
 
 def extract_geometry_graph_charts(pdf_path: str, markdown: str, max_pages: int = 1) -> list[dict[str, Any]]:
-    images = render_pdf_images(pdf_path, max_pages=max_pages, dpi=220)
-    if not images:
+    # Only the first page is analysed, so only the first page is rendered.
+    page_numbers, _ = page_range(pdf_path, 1)
+    if not page_numbers:
         return []
-
-    page_image = images[0].convert("RGB")
-    page = np.array(page_image)
-    gray = cv2.cvtColor(page, cv2.COLOR_RGB2GRAY)
+    # Fixed 220 DPI: the circle and edge detectors are tuned in pixels. Grayscale, like the
+    # OCR-only render, so the request raster cache can serve (or downsample) that page.
+    gray = render_pdf_page(pdf_path, page_numbers[0], dpi=220, layout="gray", adaptive=False)
     gray = cv2.GaussianBlur(gray, (5, 5), 0)
 
     circles = _detect_circles(gray)
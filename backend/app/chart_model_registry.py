@@ -1,14 +1,9 @@
 from __future__ import annotations
 
+import importlib.util
 from dataclasses import dataclass
 from typing import Any
 
-try:
-    import cv2  # type: ignore
-except Exception:  # pragma: no cover
-    cv2 = None
-
-from .chart_geometry import extract_geometry_graph_charts
 from .chart_sidecar import extract_charts_sidecar
 
 
@@ -40,7 +35,8 @@ CHART_MODELS: dict[str, ChartModelDef] = {
 
 
 def list_chart_models() -> list[dict[str, Any]]:
-    cv2_available = cv2 is not None
+    # Checked without importing OpenCV; chart_geometry is only imported when it is used.
+    cv2_available = importlib.util.find_spec("cv2") is not None
     return [
         {
             "model_id": item.model_id,
@@ -75,6 +71,8 @@ def extract_with_chart_model(
     if selected == "geometry-graph-v1":
         if _pdf_path:
             try:
+                from .chart_geometry import extract_geometry_graph_charts
+
                 charts = extract_geometry_graph_charts(_pdf_path, markdown)
             except Exception as exc:
                 fallback_used = True
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import math
+import os
+from collections import Counter
+from typing import Optional
+
+import fitz
+import numpy as np
+
+# Body-text size the converters' configured DPIs were tuned for.
+REFERENCE_TEXT_PT = 11.0
+# Resolution of the pre-render used to measure text lines on pages without a text layer.
+PROBE_DPI = 72
+# Inked height of a text line as a share of its font size (median over the sample PDFs in pdfs/).
+INK_TO_FONT = 0.7
+# Bump when planning changes so page-cache entries rendered under the old plan stop matching.
+PLANNER_VERSION = "2"
+
+
+def adaptive_dpi_enabled() -> bool:
+    return os.getenv("RASTER_ADAPTIVE_DPI", "on").strip().lower() not in {"0", "off", "false", "no"}
+
+
+def text_layer_size(page: fitz.Page, min_chars: int = 40) -> Optional[float]:
+    # The smallest font size carrying at least a fifth of the page's characters, so body text
+    # (not a handful of footnotes, nor large headings) decides the resolution.
+    sizes: Counter[float] = Counter()
+    for span in page.get_texttrace():
+        if span.get("size"):
+            sizes[round(float(span["size"]), 1)] += len(span.get("chars") or ())
+    total = sum(sizes.values())
+    if total < min_chars:
+        return None
+    for size in sorted(sizes):
+        if sizes[size] * 5 >= total:
+            return size
+    return None
+
+
+def scanned_text_size(page: fitz.Page, min_lines: int = 5) -> Optional[float]:
+    # Median height of the inked row runs of a low-resolution grayscale render, converted to
+    # points and scaled up by INK_TO_FONT (most lines have few descenders).
+    pix = page.get_pixmap(dpi=PROBE_DPI, colorspace=fitz.csGRAY, alpha=False)
+    gray = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.height, pix.stride)[:, : pix.width]
+    inked = (gray < 160).mean(axis=1) > 0.01
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], inked.astype(np.int8), [0]))))
+    heights = edges[1::2] - edges[::2]
+    # Single specks and figure-sized blocks are not text lines.
+    heights = heights[(heights >= 3) & (heights <= pix.height * 0.05)]
+    if heights.size < min_lines:
+        return None
+    return float(np.median(heights)) * 72.0 / PROBE_DPI / INK_TO_FONT
+
+
+def plan_dpi(page: fitz.Page, reference_dpi: int) -> int:
+    """Picks the render DPI for one page from its text size, given the engine's reference DPI.
+
+    `reference_dpi` is what the engine needs for REFERENCE_TEXT_PT body text; a page of 22pt
+    slides gets half of it, a page of 8pt print proportionally more. The result is clamped to
+    [max(72, reference / 3), 1.5 x reference] and rounded up to a multiple of 10. Pages whose
+    text size cannot be measured keep the reference DPI.
+
+    Scanned pages are never planned below the reference: on dense scans adjacent lines merge
+    into one ink run, so `scanned_text_size` can overestimate the text size several times over.
+    They still get more pixels for small print.
+    """
+    floor = max(72.0, reference_dpi / 3.0)
+    size = text_layer_size(page)
+    if not size:
+        size = scanned_text_size(page)
+        floor = float(reference_dpi)
+    if not size:
+        return reference_dpi
+    dpi = reference_dpi * REFERENCE_TEXT_PT / size
+    dpi = min(max(dpi, floor), reference_dpi * 1.5)
+    return int(math.ceil(dpi / 10.0) * 10)
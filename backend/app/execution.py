@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+
+def _default_workers() -> int:
+    raw = os.getenv("CONVERTER_WORKERS")
+    if raw:
+        try:
+            return max(1, int(raw))
+        except ValueError:
+            pass
+    return max(2, min(8, os.cpu_count() or 2))
+
+
+@dataclass
+class ExecutionTiming:
+    queue_wait_ms: float
+    run_ms: float
+
+
+class ConversionExecutor:
+    """Runs blocking converter calls on a bounded thread pool instead of the event loop.
+
+    Each key (normally a model id) can carry its own concurrency cap; calls over the cap
+    wait on an asyncio semaphore before they are handed to the pool, so a burst of slow
+    OCR requests for one model cannot occupy every worker.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or _default_workers()
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="convert")
+        self._limits: dict[str, tuple[int, asyncio.Semaphore]] = {}
+
+    def _semaphore(self, key: str, limit: Optional[int]) -> Optional[asyncio.Semaphore]:
+        if not limit or limit <= 0:
+            return None
+        current = self._limits.get(key)
+        if current is None or current[0] != limit:
+            current = (limit, asyncio.Semaphore(limit))
+            self._limits[key] = current
+        return current[1]
+
+    async def run(
+        self,
+        key: str,
+        limit: Optional[int],
+        fn: Callable[..., Any],
+        *args: Any,
+    ) -> tuple[Any, ExecutionTiming]:
+        loop = asyncio.get_running_loop()
+        submitted = time.perf_counter()
+        started: list[float] = []
+
+        def call() -> Any:
+            started.append(time.perf_counter())
+            return fn(*args)
+
+        semaphore = self._semaphore(key, limit)
+        if semaphore is None:
+            result = await loop.run_in_executor(self._pool, call)
+        else:
+            async with semaphore:
+                result = await loop.run_in_executor(self._pool, call)
+
+        finished = time.perf_counter()
+        start = started[0] if started else submitted
+        return result, ExecutionTiming(
+            queue_wait_ms=round((start - submitted) * 1000.0, 2),
+            run_ms=round((finished - start) * 1000.0, 2),
+        )
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class SingleFlight:
+    """Coalesces identical in-flight work: the first caller for a key runs it, later callers
+    for the same key await that result instead of starting their own.
+
+    The work runs as its own task, so a leader whose request goes away does not cancel the
+    conversion its followers are waiting on.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def run(self, key: str, start: Callable[[], Awaitable[Any]]) -> tuple[Any, bool]:
+        # Returns (result, shared); `start` is only called when this caller becomes the leader.
+        task = self._inflight.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(start())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task), shared
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved when every waiter has already gone away.
+            task.exception()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from .adapters.base import AdapterHealth, ModelAdapter
+from .execution import ConversionExecutor
+
+logger = logging.getLogger(__name__)
+
+
+def _env_seconds(name: str, default: float) -> float:
+    try:
+        return max(1.0, float(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+@dataclass
+class HealthStatus:
+    ok: bool
+    note: Optional[str]
+    last_checked: float
+
+
+class HealthCache:
+    """Remembers each adapter's last health probe for its TTL.
+
+    Probes can be slow (Space round-trips, CLI `--help` calls, heavy imports), so `/health` and
+    `/models` read this cache and a background task re-probes entries as they expire. Reads of
+    an expired entry keep returning the last result until the refresher replaces it.
+    """
+
+    def __init__(self, executor: ConversionExecutor, default_ttl: Optional[float] = None):
+        self.executor = executor
+        self.default_ttl = default_ttl or _env_seconds("HEALTH_TTL_SECONDS", 300)
+        self.refresh_interval = _env_seconds("HEALTH_REFRESH_INTERVAL_SECONDS", 15)
+        self._entries: dict[str, HealthStatus] = {}
+        self._probing: dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def ttl(self, adapter: ModelAdapter) -> float:
+        return float(adapter.info.health_ttl_seconds or self.default_ttl)
+
+    def peek(self, model_id: str) -> Optional[HealthStatus]:
+        with self._lock:
+            return self._entries.get(model_id)
+
+    def _expired(self, model_id: str, adapter: ModelAdapter, now: float) -> bool:
+        entry = self.peek(model_id)
+        return entry is None or now - entry.last_checked >= self.ttl(adapter)
+
+    def _probe_blocking(self, model_id: str, adapter: ModelAdapter) -> HealthStatus:
+        try:
+            health = adapter.health()
+        except Exception as exc:
+            health = AdapterHealth(ok=False, note=f"health check failed: {exc}")
+        status = HealthStatus(ok=health.ok, note=health.note, last_checked=time.time())
+        with self._lock:
+            self._entries[model_id] = status
+        return status
+
+    async def probe(self, model_id: str, adapter: ModelAdapter) -> HealthStatus:
+        # Concurrent callers share one probe per adapter.
+        task = self._probing.get(model_id)
+        if task is None:
+            # Capped at two so slow probes never hold more than a couple of conversion workers.
+            task = asyncio.ensure_future(self.executor.run("health", 2, self._probe_blocking, model_id, adapter))
+            self._probing[model_id] = task
+            task.add_done_callback(lambda _: self._probing.pop(model_id, None))
+        status, _ = await asyncio.shield(task)
+        return status
+
+    async def statuses(
+        self, adapters: dict[str, ModelAdapter], refresh: bool = False
+    ) -> dict[str, Optional[HealthStatus]]:
+        # Cached entries are returned as they are; only never-probed adapters (or every
+        # adapter, with `refresh`) are probed inline.
+        pending = {
+            model_id: adapter
+            for model_id, adapter in adapters.items()
+            if refresh or self.peek(model_id) is None
+        }
+        probed = dict(zip(pending, await asyncio.gather(*(self.probe(m, a) for m, a in pending.items()))))
+        return {model_id: probed.get(model_id) or self.peek(model_id) for model_id in adapters}
+
+    async def refresh_expired(self, adapters: dict[str, ModelAdapter]) -> None:
+        now = time.time()
+        expired = {model_id: adapter for model_id, adapter in adapters.items() if self._expired(model_id, adapter, now)}
+        if expired:
+            await asyncio.gather(*(self.probe(model_id, adapter) for model_id, adapter in expired.items()))
+
+    async def _refresh_loop(self, adapters: dict[str, ModelAdapter]) -> None:
+        while True:
+            try:
+                await self.refresh_expired(adapters)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("health refresh failed: %s", exc)
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self, adapters: dict[str, ModelAdapter]) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop(adapters))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+@dataclass
+class Job:
+    job_id: str
+    model_id: str
+    pdf_path: str
+    options: dict[str, Any]
+    content_hash: Optional[str] = None
+    status: str = "queued"
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    pages_done: int = 0
+    pages_total: Optional[int] = None
+    result: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in {"succeeded", "failed"}
+
+    def update_progress(self, pages_done: int, pages_total: Optional[int] = None) -> None:
+        if pages_total is not None:
+            self.pages_total = pages_total
+        self.pages_done = pages_done
+
+
+class JobStore:
+    """In-process job table; finished jobs are evicted `ttl_seconds` after completion."""
+
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds or _env_int("JOB_TTL_SECONDS", 3600)
+        self._jobs: dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def create(
+        self,
+        model_id: str,
+        pdf_path: str,
+        options: dict[str, Any],
+        content_hash: Optional[str] = None,
+    ) -> Job:
+        job = Job(
+            job_id=uuid.uuid4().hex,
+            model_id=model_id,
+            pdf_path=pdf_path,
+            options=options,
+            content_hash=content_hash,
+        )
+        with self._lock:
+            self._jobs[job.job_id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self.evict_expired()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def discard(self, job_id: str) -> None:
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def evict_expired(self) -> int:
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = [
+                job_id
+                for job_id, job in self._jobs.items()
+                if job.finished and job.finished_at is not None and job.finished_at < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+        return len(expired)
+
+
+class JobQueue:
+    """Bounded FIFO of conversion jobs drained by a fixed number of asyncio workers."""
+
+    def __init__(
+        self,
+        store: JobStore,
+        runner: Callable[[Job], Awaitable[dict[str, Any]]],
+        workers: Optional[int] = None,
+        max_queued: Optional[int] = None,
+    ):
+        self.store = store
+        self.runner = runner
+        self.workers = workers or _env_int("JOB_WORKERS", 2)
+        self.max_queued = max_queued or _env_int("JOB_QUEUE_MAX", 500)
+        self._queue: Optional[asyncio.Queue[Job]] = None
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        self._tasks = [asyncio.create_task(self._worker(idx)) for idx in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, job: Job) -> None:
+        if self._queue is None:
+            raise RuntimeError("job queue is not running")
+        # Raises asyncio.QueueFull when the backlog is at capacity.
+        self._queue.put_nowait(job)
+
+    def queued(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _worker(self, idx: int) -> None:
+        assert self._queue is not None
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            job.started_at = time.time()
+            try:
+                job.result = await self.runner(job)
+                job.status = "succeeded"
+                if job.pages_total is not None:
+                    job.pages_done = job.pages_total
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("job %s (%s) failed on worker %s: %s", job.job_id, job.model_id, idx, exc)
+                job.error = str(exc)
+                job.status = "failed"
+            finally:
+                job.finished_at = time.time()
+                if os.path.exists(job.pdf_path):
+                    try:
+                        os.remove(job.pdf_path)
+                    except OSError:
+                        pass
+                self._queue.task_done()
+                self.store.evict_expired()
@@ -1,15 +1,49 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import logging
 import os
+import re
 import tempfile
-from typing import Any, Optional
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
 
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi import FastAPI, File, Form, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from . import IMPORT_STARTED
 from .adapter_registry import AdapterRegistry
+from .adapters.base import AdapterExecution, ModelAdapter
 from .chart_model_registry import extract_with_chart_model, list_chart_models
-from .models.common import parse_options_json
+from .execution import ConversionExecutor, SingleFlight
+from .health_cache import HealthCache
+from .jobs import Job, JobQueue, JobStore
+from .model_loader import import_report
+from .options import apply_common_options, get_max_pages, parse_options_json
+from .progress import ProgressCallback, details_scope, progress_scope, run_scope
+from .raster_cache import RasterCache, raster_scope
+from .result_cache import build_result_cache, make_cache_key
+from .runtimes import RUNTIMES
+from .warmup import Warmup
+
+# uvicorn only configures its own loggers; log startup details through them so they are visible.
+logger = logging.getLogger("uvicorn.error")
+
+
+class RuntimeInfo(BaseModel):
+    name: str
+    state: str
+    in_use: int = 0
+    memory_mb: Optional[float] = None
+    peak_memory_mb: Optional[float] = None
+    last_used: Optional[float] = None
+    evictions: int = 0
+    last_evicted_at: Optional[float] = None
+    last_eviction_reason: Optional[str] = None
 
 
 class ModelInfo(BaseModel):
@@ -23,6 +57,8 @@ class ModelInfo(BaseModel):
     supports_options: list[str] = []
     latency_hint: Optional[str] = None
     cost_hint: Optional[str] = None
+    last_checked: Optional[float] = None
+    runtimes: list[RuntimeInfo] = []
 
 
 class ConversionResponse(BaseModel):
@@ -33,6 +69,18 @@ class ConversionResponse(BaseModel):
     chart_execution: dict[str, Any] | None = None
 
 
+class JobStatus(BaseModel):
+    job_id: str
+    model_id: str
+    status: str
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    pages_done: int = 0
+    pages_total: Optional[int] = None
+    error: Optional[str] = None
+
+
 class ChartModelInfo(BaseModel):
     model_id: str
     name: str
@@ -44,18 +92,101 @@ class ChartModelInfo(BaseModel):
 
 app = FastAPI(title="PDF to Markdown Model Server", version="3.0.0")
 REGISTRY = AdapterRegistry()
+EXECUTOR = ConversionExecutor()
+RESULT_CACHE = build_result_cache()
+IN_FLIGHT = SingleFlight()
+HEALTH = HealthCache(EXECUTOR)
+WARMUP = Warmup(EXECUTOR)
+_IMPORT_MS = round((time.perf_counter() - IMPORT_STARTED) * 1000.0, 1)
+
+
+@app.on_event("startup")
+def start_background_tasks() -> None:
+    report = import_report(REGISTRY.local_models)
+    logger.info(
+        "backend ready in %.1f ms; model modules imported at startup: %s; deferred until first use: %s",
+        _IMPORT_MS,
+        report["imported_ms"] or "none",
+        ", ".join(report["deferred"]) or "none",
+    )
+    HEALTH.start(REGISTRY.all())
+    RUNTIMES.start_reaper()
+    WARMUP.start(REGISTRY.all())
+
+
+@app.on_event("shutdown")
+async def stop_background_tasks() -> None:
+    await WARMUP.stop()
+    await HEALTH.stop()
+    RUNTIMES.stop_reaper()
+    EXECUTOR.shutdown()
+    # Imported here so startup does not pay for PyMuPDF or pytesseract; the pools only hold
+    # anything if pages were rendered or OCR'd.
+    from .rasters import shutdown_render_pool
+
+    shutdown_render_pool()
+    from .ocr_engine import TESSERACT
+
+    TESSERACT.close()
+
+
+def _convert_document(
+    adapter: ModelAdapter,
+    model_id: str,
+    pdf_path: str,
+    options: dict[str, Any],
+    progress: ProgressCallback | None = None,
+    rasters: RasterCache | None = None,
+) -> tuple[str, dict[str, Any]]:
+    # Runs on an executor worker thread; never call this from the event loop directly.
+    with progress_scope(progress), details_scope() as details, raster_scope(rasters):
+        markdown, execution = _convert_with_adapter(adapter, model_id, pdf_path, options)
+    execution.update(details)
+    return markdown, execution
+
+
+def _execution_dict(execution_meta: AdapterExecution) -> dict[str, Any]:
+    return {
+        "requested_model": execution_meta.requested_model,
+        "engine_used": execution_meta.engine_used,
+        "provider_used": execution_meta.provider_used,
+        "fallback_used": execution_meta.fallback_used,
+        "note": execution_meta.note,
+    }
+
+
+def _convert_with_adapter(
+    adapter: ModelAdapter,
+    model_id: str,
+    pdf_path: str,
+    options: dict[str, Any],
+) -> tuple[str, dict[str, Any]]:
+    if hasattr(adapter, "convert_with_meta"):
+        markdown, execution_meta = adapter.convert_with_meta(pdf_path, options)
+        return markdown, _execution_dict(execution_meta)
+
+    markdown = adapter.convert(pdf_path, options)
+    return markdown, {
+        "requested_model": model_id,
+        "engine_used": model_id,
+        "provider_used": adapter.info.provider,
+        "fallback_used": False,
+        "note": None,
+    }
 
 
 @app.get("/health")
-def health() -> dict:
+async def health(refresh: bool = Query(default=False)) -> dict:
     adapters = REGISTRY.all()
+    statuses = await HEALTH.statuses(adapters, refresh=refresh)
     details = {}
     for model_id, adapter in adapters.items():
-        h = adapter.health()
+        h = statuses.get(model_id)
         details[model_id] = {
-            "available": h.ok,
-            "note": h.note,
+            "available": bool(h and h.ok),
+            "note": h.note if h else None,
             "provider": adapter.info.provider,
+            "last_checked": h.last_checked if h else None,
         }
     return {"ok": True, "models": sorted(adapters.keys()), "availability": details}
 
@@ -65,11 +196,28 @@ def health_head() -> dict:
     return {}
 
 
+@app.get("/ready")
+def ready(response: Response) -> dict:
+    # 503 until every `warm` model has been loaded (or has failed/been skipped).
+    if not WARMUP.ready:
+        response.status_code = 503
+    return {
+        "ready": WARMUP.ready,
+        "warmup": {
+            model_id: {"status": state.status, "duration_ms": state.duration_ms, "note": state.note}
+            for model_id, state in WARMUP.states.items()
+        },
+    }
+
+
 @app.get("/models", response_model=list[ModelInfo])
-def list_models() -> list[ModelInfo]:
+async def list_models(refresh: bool = Query(default=False)) -> list[ModelInfo]:
+    adapters = REGISTRY.all()
+    statuses = await HEALTH.statuses(adapters, refresh=refresh)
     output: list[ModelInfo] = []
-    for model_id, adapter in REGISTRY.all().items():
-        h = adapter.health()
+    for model_id, adapter in adapters.items():
+        h = statuses.get(model_id)
+        runtimes = adapter.runtimes() if hasattr(adapter, "runtimes") else []
         output.append(
             ModelInfo(
                 model_id=model_id,
@@ -77,11 +225,13 @@ def list_models() -> list[ModelInfo]:
                 capabilities=adapter.info.capabilities,
                 provider=adapter.info.provider,
                 enabled=adapter.info.enabled,
-                available=h.ok,
-                availability_note=h.note,
+                available=bool(h and h.ok),
+                availability_note=h.note if h else None,
                 supports_options=adapter.info.supports_options,
                 latency_hint=adapter.info.latency_hint,
                 cost_hint=adapter.info.cost_hint,
+                last_checked=h.last_checked if h else None,
+                runtimes=[RuntimeInfo(**runtime) for runtime in runtimes],
             )
         )
     return output
@@ -104,17 +254,7 @@ def list_chart_model_options() -> list[ChartModelInfo]:
     return output
 
 
-@app.post("/convert/{model_id}", response_model=ConversionResponse)
-async def convert_pdf(
-    model_id: str,
-    file: UploadFile | None = File(default=None),
-    pdf: UploadFile | None = File(default=None),
-    options: str = Form(default="{}"),
-) -> ConversionResponse:
-    adapter = REGISTRY.get(model_id)
-    if adapter is None:
-        raise HTTPException(status_code=404, detail=f"Unknown model: {model_id}")
-
+def _validated_upload(file: UploadFile | None, pdf: UploadFile | None) -> UploadFile:
     uploaded = file or pdf
     if uploaded is None:
         raise HTTPException(status_code=400, detail="No PDF uploaded in field `file` (or legacy field `pdf`).")
@@ -122,58 +262,386 @@ async def convert_pdf(
     filename = uploaded.filename or "upload.pdf"
     if not filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Uploaded file must be a PDF")
+    return uploaded
 
-    parsed_options: dict[str, Any] = parse_options_json(options)
 
-    temp_path = None
+async def _save_upload(uploaded: UploadFile) -> tuple[str, str]:
+    data = await uploaded.read()
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
+        temp_file.write(data)
+        return temp_file.name, hashlib.sha256(data).hexdigest()
+
+
+def _cache_key(model_id: str, adapter: ModelAdapter, content_hash: str | None, options: dict[str, Any]) -> str | None:
+    if RESULT_CACHE is None or not content_hash:
+        return None
+    return make_cache_key(content_hash, model_id, options, adapter.info.version)
+
+
+async def _cached_response(model_id: str, key: str | None) -> ConversionResponse | None:
+    if RESULT_CACHE is None or key is None:
+        return None
+    payload, timing = await EXECUTOR.run("cache", None, RESULT_CACHE.get, key)
+    if not payload or not isinstance(payload.get("markdown"), str):
+        return None
+    execution = dict(payload.get("execution") or {})
+    execution["cache_hit"] = True
+    execution["queue_wait_ms"] = timing.queue_wait_ms
+    execution["run_ms"] = timing.run_ms
+    return ConversionResponse(
+        model_id=model_id,
+        markdown=payload["markdown"],
+        execution=execution,
+        charts=payload.get("charts") or [],
+        chart_execution=payload.get("chart_execution"),
+    )
+
+
+async def _store_response(key: str | None, response: ConversionResponse) -> None:
+    # Fallback output is not cached: it would pin a transient runtime failure to the document.
+    if RESULT_CACHE is None or key is None or response.execution.get("fallback_used"):
+        return
+    payload = {
+        "markdown": response.markdown,
+        "execution": {k: v for k, v in response.execution.items() if k not in {"queue_wait_ms", "run_ms", "cache_hit"}},
+        "charts": response.charts,
+        "chart_execution": response.chart_execution,
+    }
+    await EXECUTOR.run("cache", None, RESULT_CACHE.put, key, payload)
+
+
+def _extract_document_charts(
+    chart_model_id: str | None,
+    markdown: str,
+    pdf_path: str,
+    options: dict[str, Any],
+    rasters: RasterCache | None,
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    # Runs on an executor worker thread, reusing page renders left by the conversion.
+    with raster_scope(rasters):
+        return extract_with_chart_model(chart_model_id, markdown, pdf_path, options)
+
+
+async def _extract_charts(
+    markdown: str,
+    pdf_path: str,
+    options: dict[str, Any],
+    rasters: RasterCache | None = None,
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    chart_model_id = options.get("chartModel") if isinstance(options.get("chartModel"), str) else None
+    charts: list[dict[str, Any]] = []
+    chart_execution: dict[str, Any]
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-            temp_path = temp_file.name
-            temp_file.write(await uploaded.read())
-
-        if hasattr(adapter, "convert_with_meta"):
-            markdown, execution_meta = adapter.convert_with_meta(temp_path, parsed_options)
-            execution = {
-                "requested_model": execution_meta.requested_model,
-                "engine_used": execution_meta.engine_used,
-                "provider_used": execution_meta.provider_used,
-                "fallback_used": execution_meta.fallback_used,
-                "note": execution_meta.note,
-            }
-        else:
-            markdown = adapter.convert(temp_path, parsed_options)
-            execution = {
-                "requested_model": model_id,
-                "engine_used": model_id,
-                "provider_used": adapter.info.provider,
-                "fallback_used": False,
-                "note": None,
-            }
-
-        chart_model_id = parsed_options.get("chartModel") if isinstance(parsed_options.get("chartModel"), str) else None
-        charts: list[dict[str, Any]] = []
-        chart_execution: dict[str, Any]
+        (charts, chart_execution), _ = await EXECUTOR.run(
+            "chart",
+            None,
+            _extract_document_charts,
+            chart_model_id,
+            markdown,
+            pdf_path,
+            options,
+            rasters,
+        )
+    except Exception as chart_exc:
+        chart_execution = {
+            "engine_used": chart_model_id or "heuristic-graph-v1",
+            "fallback_used": True,
+            "note": f"Chart extraction failed: {chart_exc}",
+        }
+    return charts, chart_execution
+
+
+async def _run_conversion(
+    model_id: str,
+    adapter: ModelAdapter,
+    pdf_path: str,
+    options: dict[str, Any],
+    progress: ProgressCallback | None = None,
+    content_hash: str | None = None,
+) -> ConversionResponse:
+    cache_key = _cache_key(model_id, adapter, content_hash, options)
+    cached = await _cached_response(model_id, cache_key)
+    if cached is not None:
+        return cached
+
+    # One raster cache per request, shared by the adapter, its OCR fallback and chart extraction.
+    rasters = RasterCache()
+    (markdown, execution), timing = await EXECUTOR.run(
+        model_id,
+        adapter.info.max_concurrency,
+        _convert_document,
+        adapter,
+        model_id,
+        pdf_path,
+        options,
+        progress,
+        rasters,
+    )
+    execution["queue_wait_ms"] = timing.queue_wait_ms
+    execution["run_ms"] = timing.run_ms
+    execution["cache_hit"] = False
+
+    charts, chart_execution = await _extract_charts(markdown, pdf_path, options, rasters)
+    if rasters.hits:
+        execution["rasters_reused"] = rasters.hits
+    response = ConversionResponse(
+        model_id=model_id,
+        markdown=markdown,
+        execution=execution,
+        charts=charts,
+        chart_execution=chart_execution,
+    )
+    await _store_response(cache_key, response)
+    return response
+
+
+_PAGE_HEADING = re.compile(r"^## Page (\d+)\s*$", re.MULTILINE)
+_STREAM_DONE = object()
+_STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+
+def _split_page_chunks(markdown: str) -> list[str]:
+    starts = [match.start() for match in _PAGE_HEADING.finditer(markdown)]
+    if not starts:
+        return [markdown.strip()] if markdown.strip() else []
+    chunks: list[str] = []
+    if markdown[: starts[0]].strip():
+        chunks.append(markdown[: starts[0]].strip())
+    for start, end in zip(starts, [*starts[1:], len(markdown)]):
+        chunks.append(markdown[start:end].strip())
+    return chunks
+
+
+def _stream_document(
+    adapter: ModelAdapter,
+    model_id: str,
+    pdf_path: str,
+    options: dict[str, Any],
+    emit: Callable[[str], None],
+    rasters: RasterCache | None = None,
+    cancelled: threading.Event | None = None,
+) -> tuple[str, dict[str, Any]]:
+    # Runs on an executor worker thread.
+    with details_scope() as details, run_scope(), raster_scope(rasters):
+        markdown, execution = _stream_pages(adapter, model_id, pdf_path, options, emit, cancelled)
+    execution.update(details)
+    return markdown, execution
+
+
+def _stream_pages(
+    adapter: ModelAdapter,
+    model_id: str,
+    pdf_path: str,
+    options: dict[str, Any],
+    emit: Callable[[str], None],
+    cancelled: threading.Event | None = None,
+) -> tuple[str, dict[str, Any]]:
+    # Adapters without a page iterator convert the whole document first and are then
+    # replayed page by page, so every model can be streamed.
+    if not getattr(adapter, "supports_page_stream", False):
+        markdown, execution = _convert_with_adapter(adapter, model_id, pdf_path, options)
+        for chunk in _split_page_chunks(markdown):
+            emit(chunk)
+        return markdown, execution
+
+    chunks: list[str] = []
+    pages = adapter.iter_pages(pdf_path, options)
+    try:
+        for chunk in pages:
+            chunks.append(chunk)
+            emit(apply_common_options(chunk.strip() + "\n", options).strip())
+            if cancelled is not None and cancelled.is_set():
+                # The client is gone: stop before the next page so the model's slot is freed.
+                break
+    finally:
+        close = getattr(pages, "close", None)
+        if close is not None:
+            close()
+    markdown = apply_common_options("\n\n".join(chunks).strip() + "\n", options)
+    return markdown, _execution_dict(adapter.last_execution())
+
+
+def _stream_event(fmt: str, event: str, payload: dict[str, Any]) -> str:
+    if fmt == "sse":
+        return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+    return json.dumps({"event": event, **payload}) + "\n"
+
+
+async def _stream_conversion(
+    model_id: str,
+    adapter: ModelAdapter,
+    pdf_path: str,
+    options: dict[str, Any],
+    fmt: str,
+    content_hash: str | None = None,
+    request: Request | None = None,
+) -> AsyncIterator[str]:
+    cache_key = _cache_key(model_id, adapter, content_hash, options)
+    try:
+        cached = await _cached_response(model_id, cache_key)
+    except BaseException:
+        _remove_file(pdf_path)
+        raise
+    if cached is not None:
+        _remove_file(pdf_path)
+        for chunk in _split_page_chunks(cached.markdown):
+            match = _PAGE_HEADING.search(chunk)
+            page = int(match.group(1)) if match else None
+            yield _stream_event(fmt, "page", {"page": page, "markdown": chunk})
+        cached.execution["time_to_first_page_ms"] = cached.execution["queue_wait_ms"] + cached.execution["run_ms"]
+        yield _stream_event(fmt, "result", cached.model_dump())
+        return
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[Any] = asyncio.Queue()
+    started = time.perf_counter()
+
+    rasters = RasterCache()
+    cancelled = threading.Event()
+
+    def emit(chunk: str) -> None:
+        loop.call_soon_threadsafe(queue.put_nowait, chunk)
+
+    task = asyncio.ensure_future(
+        EXECUTOR.run(
+            model_id,
+            adapter.info.max_concurrency,
+            _stream_document,
+            adapter,
+            model_id,
+            pdf_path,
+            options,
+            emit,
+            rasters,
+            cancelled,
+        )
+    )
+    # Chunks are queued with call_soon_threadsafe before the worker returns, so the
+    # sentinel always lands after the last page.
+    task.add_done_callback(lambda _: queue.put_nowait(_STREAM_DONE))
+
+    try:
+        first_page_ms: float | None = None
+        while True:
+            item = await queue.get()
+            if item is _STREAM_DONE:
+                break
+            if first_page_ms is None:
+                first_page_ms = round((time.perf_counter() - started) * 1000.0, 2)
+            match = _PAGE_HEADING.search(item)
+            page = int(match.group(1)) if match else None
+            yield _stream_event(fmt, "page", {"page": page, "markdown": item})
+            if request is not None and await request.is_disconnected():
+                return
+
         try:
-            charts, chart_execution = extract_with_chart_model(
-                chart_model_id,
-                markdown,
-                temp_path,
-                parsed_options,
-            )
-        except Exception as chart_exc:
-            chart_execution = {
-                "engine_used": chart_model_id or "heuristic-graph-v1",
-                "fallback_used": True,
-                "note": f"Chart extraction failed: {chart_exc}",
-            }
-
-        return ConversionResponse(
+            (markdown, execution), timing = task.result()
+        except Exception as exc:
+            yield _stream_event(fmt, "error", {"detail": str(exc)})
+            return
+
+        execution["queue_wait_ms"] = timing.queue_wait_ms
+        execution["run_ms"] = timing.run_ms
+        execution["time_to_first_page_ms"] = first_page_ms
+        execution["cache_hit"] = False
+        charts, chart_execution = await _extract_charts(markdown, pdf_path, options, rasters)
+        if rasters.hits:
+            execution["rasters_reused"] = rasters.hits
+        response = ConversionResponse(
             model_id=model_id,
             markdown=markdown,
             execution=execution,
             charts=charts,
             chart_execution=chart_execution,
         )
+        await _store_response(cache_key, response)
+        yield _stream_event(fmt, "result", response.model_dump())
+    finally:
+        if task.done():
+            _remove_file(pdf_path)
+        else:
+            # Client went away mid-conversion: stop converting after the current page and drop
+            # the upload once the worker lets go of it.
+            cancelled.set()
+            task.add_done_callback(lambda _: _remove_file(pdf_path))
+
+
+def _remove_file(path: str) -> None:
+    if os.path.exists(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+async def _coalesced_conversion(
+    model_id: str,
+    adapter: ModelAdapter,
+    pdf_path: str,
+    options: dict[str, Any],
+    content_hash: str,
+) -> ConversionResponse:
+    # Identical uploads (same bytes, model, options and version) that arrive while one is
+    # still converting wait for that conversion instead of repeating it. This function owns
+    # `pdf_path`: the leader's copy goes to the flight, a follower's copy is dropped here.
+    flight_key = make_cache_key(content_hash, model_id, options, adapter.info.version)
+    wait_started = time.perf_counter()
+    claimed: list[bool] = []
+
+    async def convert() -> ConversionResponse:
+        try:
+            return await _run_conversion(model_id, adapter, pdf_path, options, content_hash=content_hash)
+        finally:
+            _remove_file(pdf_path)
+
+    def start() -> Awaitable[ConversionResponse]:
+        claimed.append(True)
+        return convert()
+
+    try:
+        response, shared = await IN_FLIGHT.run(flight_key, start)
+    finally:
+        if not claimed:
+            _remove_file(pdf_path)
+    if not shared:
+        return response
+    execution = dict(response.execution)
+    execution["coalesced"] = True
+    execution["queue_wait_ms"] = round((time.perf_counter() - wait_started) * 1000.0, 2)
+    execution["run_ms"] = 0.0
+    return response.model_copy(update={"execution": execution})
+
+
+@app.post("/convert/{model_id}", response_model=ConversionResponse)
+async def convert_pdf(
+    model_id: str,
+    request: Request,
+    file: UploadFile | None = File(default=None),
+    pdf: UploadFile | None = File(default=None),
+    options: str = Form(default="{}"),
+    stream: Optional[str] = Query(default=None),
+) -> Any:
+    adapter = REGISTRY.get(model_id)
+    if adapter is None:
+        raise HTTPException(status_code=404, detail=f"Unknown model: {model_id}")
+
+    if stream is not None and stream not in _STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="`stream` must be `ndjson` or `sse`")
+
+    uploaded = _validated_upload(file, pdf)
+    parsed_options: dict[str, Any] = parse_options_json(options)
+
+    temp_path = None
+    try:
+        temp_path, content_hash = await _save_upload(uploaded)
+        if stream is not None:
+            body = _stream_conversion(model_id, adapter, temp_path, parsed_options, stream, content_hash, request)
+            # The stream owns the upload from here and removes it when it finishes.
+            temp_path = None
+            return StreamingResponse(body, media_type=_STREAM_MEDIA_TYPES[stream])
+        # The coalescer owns the upload from here as well.
+        path, temp_path = temp_path, None
+        return await _coalesced_conversion(model_id, adapter, path, parsed_options, content_hash)
     except HTTPException:
         raise
     except Exception as exc:
@@ -181,3 +649,98 @@ async def convert_pdf(
     finally:
         if temp_path and os.path.exists(temp_path):
             os.remove(temp_path)
+
+
+async def _run_job(job: Job) -> dict[str, Any]:
+    adapter = REGISTRY.get(job.model_id)
+    if adapter is None:
+        raise RuntimeError(f"Unknown model: {job.model_id}")
+    from .models.common import count_pdf_pages
+
+    # The converter's own page cap, when it has one; its progress events correct this further.
+    page_limit = getattr(adapter, "page_limit", None)
+    max_pages = page_limit(job.options) if callable(page_limit) else get_max_pages(job.options)
+    total, _ = await EXECUTOR.run("pages", None, count_pdf_pages, job.pdf_path, max_pages)
+    job.pages_total = total
+    response = await _run_conversion(
+        job.model_id,
+        adapter,
+        job.pdf_path,
+        job.options,
+        job.update_progress,
+        job.content_hash,
+    )
+    return response.model_dump()
+
+
+JOB_STORE = JobStore()
+JOB_QUEUE = JobQueue(JOB_STORE, _run_job)
+
+
+@app.on_event("startup")
+async def start_job_queue() -> None:
+    await JOB_QUEUE.start()
+
+
+@app.on_event("shutdown")
+async def stop_job_queue() -> None:
+    await JOB_QUEUE.stop()
+
+
+def _job_status(job: Job) -> JobStatus:
+    return JobStatus(
+        job_id=job.job_id,
+        model_id=job.model_id,
+        status=job.status,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        pages_done=job.pages_done,
+        pages_total=job.pages_total,
+        error=job.error,
+    )
+
+
+@app.post("/jobs/{model_id}", response_model=JobStatus, status_code=202)
+async def submit_job(
+    model_id: str,
+    file: UploadFile | None = File(default=None),
+    pdf: UploadFile | None = File(default=None),
+    options: str = Form(default="{}"),
+) -> JobStatus:
+    if REGISTRY.get(model_id) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown model: {model_id}")
+
+    uploaded = _validated_upload(file, pdf)
+    parsed_options: dict[str, Any] = parse_options_json(options)
+
+    temp_path, content_hash = await _save_upload(uploaded)
+    job = JOB_STORE.create(model_id, temp_path, parsed_options, content_hash)
+    try:
+        JOB_QUEUE.submit(job)
+    except Exception as exc:
+        JOB_STORE.discard(job.job_id)
+        os.remove(temp_path)
+        detail = "Job queue is full; retry later" if isinstance(exc, asyncio.QueueFull) else str(exc)
+        raise HTTPException(status_code=503, detail=detail) from exc
+    return _job_status(job)
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatus)
+def get_job(job_id: str) -> JobStatus:
+    job = JOB_STORE.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job: {job_id}")
+    return _job_status(job)
+
+
+@app.get("/jobs/{job_id}/result", response_model=ConversionResponse)
+def get_job_result(job_id: str) -> ConversionResponse:
+    job = JOB_STORE.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job: {job_id}")
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error or "Job failed")
+    if job.status != "succeeded" or job.result is None:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is still {job.status}")
+    return ConversionResponse(**job.result)
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+from .progress import bind_scopes, tally_detail
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_Entry = tuple[Any, Future, int, Callable[[list[Any]], list[Any]]]
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+class MicroBatcher(Generic[T, R]):
+    """Merges the pages of concurrent requests into micro-batches for one model.
+
+    `infer(items)` runs one forward pass over a list of inputs and returns one output per input,
+    in order. Callers hand their pages to `run()`; a dispatcher thread starts a batch with the
+    first queued page, keeps adding pages (from any request) until it holds
+    `MICROBATCH_MAX_SIZE` of them or `MICROBATCH_MAX_WAIT_MS` has passed, and runs it on one of
+    `concurrency` workers (e.g. one per engine instance). A new batch is only formed once a
+    worker is free, so pages that arrive while the model is busy ride together in the next
+    pass. The wait only applies while more than one caller is in `run()`; a lone request's
+    pages are dispatched at once. A caller's `limit` (its `batchSize`) also caps every batch its
+    pages join. If a batch fails, its pages are retried one by one, so a bad page only fails the
+    request it came from. With a max size of 1 `run()` calls `infer` directly.
+
+    `infer` runs under the progress and details scopes of the request whose page started the
+    batch (a page retried on its own runs under its own request's). It should not load the model
+    itself: callers hold a lease on the runtime for their whole conversion and pass what `infer`
+    needs along with each page, so the runtime cannot be evicted between two of their batches.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        infer: Callable[[list[T]], list[R]],
+        concurrency: int = 1,
+        max_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+    ):
+        self.name = name
+        self.infer = infer
+        self.concurrency = max(1, concurrency)
+        self.max_size = max_size if max_size is not None else max(1, _env_int("MICROBATCH_MAX_SIZE", 8))
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else _env_float("MICROBATCH_MAX_WAIT_MS", 5)) / 1000.0
+        # (page, its future, its request's limit, `infer` bound to its request's scopes)
+        self._queue: queue.Queue[_Entry] = queue.Queue()
+        # A page that would have pushed the current batch past its own request's limit.
+        self._carry: Optional[_Entry] = None
+        self._slots = threading.Semaphore(self.concurrency)
+        self._lock = threading.Lock()
+        self._callers = 0
+        self._dispatcher: Optional[threading.Thread] = None
+        self._workers: Optional[ThreadPoolExecutor] = None
+
+    def run(self, items: list[T], limit: Optional[int] = None) -> list[R]:
+        # `limit`: the most pages this caller allows in one forward pass (its `batchSize`).
+        if not items:
+            return []
+        limit = min(self.max_size, limit or self.max_size)
+        if limit <= 1:
+            return [self._checked([item])[0] for item in items]
+        self._start()
+        with self._lock:
+            self._callers += 1
+        try:
+            infer = bind_scopes(self._checked)
+            futures: list[Future] = []
+            for item in items:
+                future: Future = Future()
+                self._queue.put((item, future, limit, infer))
+                futures.append(future)
+            results = []
+            for future in futures:
+                result, batch_size = future.result()
+                # Shows how often this request's pages shared a forward pass, e.g. {"doctr-eu x8": 12}.
+                tally_detail("microbatch", f"{self.name} x{batch_size}")
+                results.append(result)
+            return results
+        finally:
+            with self._lock:
+                self._callers -= 1
+
+    def _checked(self, items: list[T]) -> list[R]:
+        outputs = list(self.infer(items))
+        if len(outputs) != len(items):
+            raise RuntimeError(f"{self.name} returned {len(outputs)} outputs for a batch of {len(items)}")
+        return outputs
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._dispatcher is None:
+                self._workers = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix=f"{self.name}-batch")
+                self._dispatcher = threading.Thread(target=self._dispatch, name=f"{self.name}-batcher", daemon=True)
+                self._dispatcher.start()
+
+    def _dispatch(self) -> None:
+        assert self._workers is not None
+        while True:
+            self._slots.acquire()
+            first, self._carry = self._carry or self._queue.get(), None
+            batch = [first]
+            limit = first[2]
+            # Waiting for more pages only pays off when another request can supply them.
+            deadline = time.monotonic() + (self.max_wait if self._callers > 1 else 0.0)
+            while len(batch) < limit:
+                remaining = deadline - time.monotonic()
+                try:
+                    entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if len(batch) >= entry[2]:
+                    self._carry = entry
+                    break
+                batch.append(entry)
+                limit = min(limit, entry[2])
+            self._workers.submit(self._run_batch, batch)
+
+    def _run_batch(self, batch: list[_Entry]) -> None:
+        try:
+            try:
+                outputs = batch[0][3]([item for item, _, _, _ in batch])
+            except Exception as exc:
+                if len(batch) == 1:
+                    batch[0][1].set_exception(exc)
+                    return
+                logger.warning("%s batch of %s pages failed, retrying pages one by one: %s", self.name, len(batch), exc)
+                for item, future, _, infer in batch:
+                    try:
+                        future.set_result((infer([item])[0], 1))
+                    except Exception as page_exc:
+                        future.set_exception(page_exc)
+                return
+            for (_, future, _, _), output in zip(batch, outputs):
+                future.set_result((output, len(batch)))
+        except BaseException as exc:
+            for _, future, _, _ in batch:
+                if not future.done():
+                    future.set_exception(exc)
+        finally:
+            self._slots.release()
@@ -1,31 +1,125 @@
 import importlib
+import json
 import pkgutil
-from typing import Dict
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
 
 from .models.base import ModelDefinition
 
+MANIFEST_PATH = Path(__file__).resolve().parent / "models" / "manifest.json"
+PACKAGE_NAME = "backend.app.models"
 
-def load_models() -> Dict[str, ModelDefinition]:
-    models: Dict[str, ModelDefinition] = {}
-    package_name = "backend.app.models"
+# Wall time spent importing each model module, in milliseconds, in import order.
+IMPORT_TIMES_MS: Dict[str, float] = {}
 
-    package = importlib.import_module(package_name)
+
+def _import_model(module_name: str) -> Optional[ModelDefinition]:
+    started = time.perf_counter()
+    module = importlib.import_module(f"{PACKAGE_NAME}.{module_name}")
+    IMPORT_TIMES_MS[module_name] = round((time.perf_counter() - started) * 1000.0, 1)
+
+    model = getattr(module, "model", None)
+    if model is not None and not isinstance(model, ModelDefinition):
+        raise TypeError(f"Model module '{module_name}' has invalid 'model' export")
+    return model
+
+
+class LazyModelDefinition:
+    """Manifest metadata for a model whose module is imported the first time it is used.
+
+    Listing models only needs id, description and capabilities, so the heavy imports a model
+    module pulls in (PyMuPDF, Tesseract bindings, numpy, ML runtimes) wait until a conversion
+    or availability check actually touches it.
+    """
+
+    def __init__(self, module_name: str, model_id: str, description: str, capabilities: list[str]):
+        self.module_name = module_name
+        self.model_id = model_id
+        self.description = description
+        self.capabilities = capabilities
+        self._model: Optional[ModelDefinition] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def load(self) -> ModelDefinition:
+        if self._model is not None:
+            return self._model
+        with self._lock:
+            if self._model is None:
+                model = _import_model(self.module_name)
+                if model is None or model.model_id != self.model_id:
+                    raise ValueError(
+                        f"Model manifest entry '{self.model_id}' does not match module '{self.module_name}'"
+                    )
+                self._model = model
+        return self._model
+
+    @property
+    def converter(self) -> Any:
+        return self.load().converter
+
+    @property
+    def supports_page_stream(self) -> bool:
+        return self.load().supports_page_stream
+
+    def is_available(self) -> tuple[bool, str | None]:
+        return self.load().is_available()
+
+
+LocalModel = Union[ModelDefinition, LazyModelDefinition]
+
+
+def _load_manifest() -> Dict[str, LazyModelDefinition]:
+    if not MANIFEST_PATH.exists():
+        return {}
+    data = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    entries: Dict[str, LazyModelDefinition] = {}
+    for entry in data.get("models", []):
+        model_id = entry.get("id")
+        module_name = entry.get("module")
+        if not isinstance(model_id, str) or not isinstance(module_name, str):
+            raise ValueError(f"Model manifest entry needs string `id` and `module`: {entry}")
+        if model_id in entries:
+            raise ValueError(f"Duplicate model_id '{model_id}'")
+        entries[model_id] = LazyModelDefinition(
+            module_name=module_name,
+            model_id=model_id,
+            description=str(entry.get("description") or ""),
+            capabilities=list(entry.get("capabilities") or []),
+        )
+    return entries
+
+
+def load_models() -> Dict[str, LocalModel]:
+    models: Dict[str, LocalModel] = dict(_load_manifest())
+    deferred_modules = {model.module_name for model in models.values()}
+
+    # Modules without a manifest entry are still discovered, but imported right away.
+    package = importlib.import_module(PACKAGE_NAME)
     for module_info in pkgutil.iter_modules(package.__path__):
         module_name = module_info.name
-        if module_name in {"base"} or module_name.startswith("_"):
+        if module_name in {"base", "common"} or module_name.startswith("_") or module_name in deferred_modules:
             continue
 
-        module = importlib.import_module(f"{package_name}.{module_name}")
-        model = getattr(module, "model", None)
+        model = _import_model(module_name)
         if model is None:
             continue
 
-        if not isinstance(model, ModelDefinition):
-            raise TypeError(f"Model module '{module_name}' has invalid 'model' export")
-
         if model.model_id in models:
             raise ValueError(f"Duplicate model_id '{model.model_id}'")
 
         models[model.model_id] = model
 
     return models
+
+
+def import_report(models: Dict[str, LocalModel]) -> dict[str, Any]:
+    deferred = sorted(
+        model_id for model_id, model in models.items() if isinstance(model, LazyModelDefinition) and not model.loaded
+    )
+    return {"imported_ms": dict(IMPORT_TIMES_MS), "deferred": deferred}
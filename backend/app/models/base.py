@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Protocol
+from typing import Any, Iterator, Protocol
+
+from ..progress import current_runs
 
 
 class ModelConverter(Protocol):
@@ -9,6 +11,37 @@ class ModelConverter(Protocol):
         ...
 
 
+class PageStreamingConverter(ModelConverter, Protocol):
+    # Yields one `## Page N` chunk per page as soon as it is ready. Chunks are raw:
+    # `convert` applies common options once to the joined document, streaming callers
+    # apply them per chunk.
+    def iter_pages(self, pdf_path: str, options: dict[str, Any] | None = None) -> Iterator[str]:
+        ...
+
+
+class LastRun:
+    """`last_run` execution metadata of a converter (engine used, fallback, note).
+
+    Converter objects are shared by every request, so inside a `run_scope()` the value is kept
+    per conversion; outside one (e.g. the default set in `__init__`) it lives on the converter.
+    """
+
+    def __get__(self, obj: Any, owner: Any = None) -> Any:
+        if obj is None:
+            return self
+        runs = current_runs()
+        if runs is not None and id(obj) in runs:
+            return runs[id(obj)]
+        return obj.__dict__.get("_last_run")
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        runs = current_runs()
+        if runs is None:
+            obj.__dict__["_last_run"] = value
+        else:
+            runs[id(obj)] = value
+
+
 @dataclass(frozen=True)
 class ModelDefinition:
     model_id: str
@@ -16,6 +49,10 @@ class ModelDefinition:
     converter: ModelConverter
     capabilities: list[str] = field(default_factory=list)
 
+    @property
+    def supports_page_stream(self) -> bool:
+        return callable(getattr(self.converter, "iter_pages", None))
+
     def is_available(self) -> tuple[bool, str | None]:
         checker = getattr(self.converter, "is_available", None)
         if checker is None:
@@ -1,13 +1,10 @@
 from __future__ import annotations
 
-import json
-import re
 from pathlib import Path
 import sys
 from typing import Any
 
 import fitz
-from PIL import Image
 
 REPO_ROOT = Path(__file__).resolve().parents[3]
 SCRIPTS_DIR = REPO_ROOT / "Scripts"
@@ -16,6 +13,8 @@ if str(SCRIPTS_DIR) not in sys.path:
 
 from pdf_converter import PDFConverter  # type: ignore  # noqa: E402
 
+from ..options import apply_common_options, get_batch_size, get_max_pages, parse_options_json  # noqa: E402,F401
+
 
 _native_converter: PDFConverter | None = None
 _ocr_converter: Any | None = None
@@ -37,30 +36,6 @@ def get_ocr_converter() -> Any:
     return _ocr_converter
 
 
-def apply_common_options(markdown: str, options: dict[str, Any] | None) -> str:
-    if not options:
-        return markdown
-
-    result = markdown
-
-    preserve_tables = options.get("preserveTables")
-    if preserve_tables is False:
-        # Remove simple markdown tables.
-        result = re.sub(r"(?:^\|.*\|\n)+", "", result, flags=re.MULTILINE)
-
-    preserve_equations = options.get("preserveEquations")
-    if preserve_equations is False:
-        result = re.sub(r"\$\$.*?\$\$", "[Equation removed]", result, flags=re.DOTALL)
-        result = re.sub(r"\$[^\$]+\$", "[Inline equation removed]", result)
-
-    quality = options.get("qualityLevel")
-    if isinstance(quality, (int, float)) and quality < 45:
-        # Simulate low quality mode requested by frontend.
-        result = re.sub(r"\b([A-Za-z]{8,})\b", lambda m: m.group(1)[:-1] + "?", result)
-
-    return result
-
-
 def apply_docling_options(markdown: str, options: dict[str, Any] | None) -> str:
     if not options:
         return markdown
@@ -90,41 +65,8 @@ def apply_docling_options(markdown: str, options: dict[str, Any] | None) -> str:
     return "\n".join(sections).strip() + "\n"
 
 
-def parse_options_json(raw: str | None) -> dict[str, Any]:
-    if not raw:
-        return {}
-    try:
-        parsed = json.loads(raw)
-    except Exception:
-        return {}
-    return parsed if isinstance(parsed, dict) else {}
-
-
-def get_max_pages(options: dict[str, Any] | None) -> int | None:
-    if not options:
-        return None
-    raw = options.get("maxPages")
-    if not isinstance(raw, int):
-        return None
-    if raw <= 0:
-        return None
-    return raw
-
-
-def render_pdf_images(pdf_path: str, max_pages: int | None = None, dpi: int = 200) -> list[Image.Image]:
-    # Poppler-free page rasterization for packaged desktop builds.
-    images: list[Image.Image] = []
-    zoom = max(dpi / 72.0, 1.0)
-    matrix = fitz.Matrix(zoom, zoom)
-
+def count_pdf_pages(pdf_path: str, max_pages: int | None = None) -> int:
     with fitz.open(pdf_path) as doc:
         total_pages = len(doc)
-        limit = min(total_pages, max_pages) if max_pages else total_pages
-        for idx in range(limit):
-            page = doc.load_page(idx)
-            pix = page.get_pixmap(matrix=matrix, alpha=False)
-            mode = "RGB" if pix.n >= 3 else "L"
-            image = Image.frombytes(mode, [pix.width, pix.height], pix.samples)
-            images.append(image)
-
-    return images
+    return min(total_pages, max_pages) if max_pages else total_pages
+
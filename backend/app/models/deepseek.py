@@ -2,18 +2,43 @@ from __future__ import annotations
 
 import importlib
 import importlib.util
+import io
 import logging
 import os
 import tempfile
-from typing import Any
-
-from .base import ModelDefinition
-from .common import apply_common_options, get_max_pages, get_ocr_converter, render_pdf_images
+import time
+from contextlib import closing, nullcontext
+from typing import Any, Iterator, Optional
+
+from ..microbatch import MicroBatcher
+from ..page_cache import page_memo
+from ..page_workers import batches, memo_jobs, pipelined
+from ..progress import report_progress
+from ..rasters import PageImages, dpi_tag, page_range
+from ..runtimes import RUNTIMES
+from .base import LastRun, ModelDefinition
+from .common import apply_common_options, get_batch_size, get_max_pages, get_ocr_converter
 
 logger = logging.getLogger(__name__)
 
 
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
 class DeepSeekConverter:
+    last_run = LastRun()
+
     def __init__(self):
         self.last_run: dict[str, Any] = {
             "engine_used": "deepseek",
@@ -24,10 +49,18 @@ class DeepSeekConverter:
         self._preferred_model_id = os.getenv("DEEPSEEK_LOCAL_MODEL_ID", "deepseek-ai/DeepSeek-OCR")
         self._backup_model_id = os.getenv("DEEPSEEK_LOCAL_BACKUP_MODEL_ID", "microsoft/trocr-base-printed")
         self._attn_impl = os.getenv("DEEPSEEK_ATTN_IMPL", "eager")
-        self._pipe = None
-        self._loaded_model_id: str | None = None
-        self._deepseek_model = None
-        self._deepseek_tokenizer = None
+        self._official = RUNTIMES.register(
+            "deepseek-official",
+            self._load_official_runtime,
+            owner="deepseek",
+            estimate_mb=7000,
+            on_unload=self._empty_cuda_cache,
+        )
+        self._backup = RUNTIMES.register("deepseek-backup", self._load_backup_pipeline, owner="deepseek", estimate_mb=1500)
+        # Pages of concurrent requests share backup pipeline calls.
+        self._backup_batcher = MicroBatcher("deepseek-backup", self._run_backup)
+        # Whether the official runtime's `infer` reads in-memory images; None until first tried.
+        self._official_in_memory: Optional[bool] = None
 
     def is_available(self) -> tuple[bool, str | None]:
         if importlib.util.find_spec("torch") is None or importlib.util.find_spec("transformers") is None:
@@ -53,10 +86,13 @@ class DeepSeekConverter:
         if not hasattr(ml, "LlamaFlashAttention2") and hasattr(ml, "LlamaAttention"):
             setattr(ml, "LlamaFlashAttention2", ml.LlamaAttention)
 
-    def _load_official_runtime(self) -> tuple[Any, Any]:
-        if self._deepseek_model is not None and self._deepseek_tokenizer is not None:
-            return self._deepseek_model, self._deepseek_tokenizer
+    def _empty_cuda_cache(self) -> None:
+        if self._cuda_available():
+            import torch
+
+            torch.cuda.empty_cache()
 
+    def _load_official_runtime(self) -> tuple[Any, Any]:
         if not self._cuda_available():
             raise RuntimeError("DeepSeek-OCR official runtime requires CUDA-enabled local GPU")
 
@@ -74,25 +110,18 @@ class DeepSeekConverter:
         import torch
 
         model = model.eval().cuda().to(torch.bfloat16)
-        self._deepseek_model = model
-        self._deepseek_tokenizer = tokenizer
         return model, tokenizer
 
     def _load_backup_pipeline(self):
-        if self._pipe is not None:
-            return self._pipe
-
         from transformers import pipeline
 
         local_only = os.getenv("DEEPSEEK_LOCAL_FILES_ONLY", "false").lower() in {"1", "true", "yes"}
-        self._pipe = pipeline(
+        return pipeline(
             "image-to-text",
             model=self._backup_model_id,
             trust_remote_code=True,
             model_kwargs={"local_files_only": local_only},
         )
-        self._loaded_model_id = self._backup_model_id
-        return self._pipe
 
     def _extract_text(self, output: Any) -> str:
         if isinstance(output, str):
@@ -114,13 +143,37 @@ class DeepSeekConverter:
             return "\n".join(parts)
         return ""
 
-    def _run_official_deepseek(self, image_path: str, output_dir: str) -> str:
-        model, tokenizer = self._load_official_runtime()
+    def _run_official_deepseek(self, runtime: tuple[Any, Any], image: Any, workdir: str) -> str:
+        # The model's remote code opens `image_file` with PIL, which also reads a file object, so
+        # the page is handed over in memory. Runtimes that insist on a path get it written to the
+        # request's work directory, which is reused for every page.
+        if self._official_in_memory is not False:
+            buffer = io.BytesIO()
+            image.save(buffer, format="PNG", compress_level=1)
+            buffer.seek(0)
+            try:
+                text = self._infer_official(runtime, buffer, workdir)
+            except (TypeError, AttributeError) as exc:
+                # What path handling (os.fspath, str methods) raises for a file object; any other
+                # failure is the page's or the runtime's and does not rule out in-memory input.
+                if self._official_in_memory:
+                    raise
+                logger.info("deepseek official runtime does not read in-memory images (%s); using files", exc)
+                self._official_in_memory = False
+            else:
+                self._official_in_memory = True
+                return text
+        page_path = os.path.join(workdir, "page.png")
+        image.save(page_path, compress_level=1)
+        return self._infer_official(runtime, page_path, workdir)
+
+    def _infer_official(self, runtime: tuple[Any, Any], image_file: Any, output_dir: str) -> str:
+        model, tokenizer = runtime
         prompt = "<image>\n<|grounding|>Convert the document to markdown. "
         result = model.infer(
             tokenizer,
             prompt=prompt,
-            image_file=image_path,
+            image_file=image_file,
             output_path=output_dir,
             base_size=1024,
             image_size=640,
@@ -131,12 +184,18 @@ class DeepSeekConverter:
         )
         return (result or "").strip()
 
-    def _run_backup(self, image_obj: Any) -> str:
-        pipe = self._load_backup_pipeline()
-        output = pipe(image_obj)
-        return self._extract_text(output).strip()
+    def _run_backup(self, pages: list[tuple[Any, Any]]) -> list[str]:
+        # (pipeline, image) pairs; the pipeline is leased by the requests the pages came from. It
+        # takes a list of pages and returns one output per page.
+        pipe = pages[0][0]
+        outputs = pipe([image for _, image in pages], batch_size=len(pages))
+        return [self._extract_text(output).strip() for output in outputs]
 
     def convert(self, pdf_path: str, options: dict[str, Any] | None = None) -> str:
+        markdown = "\n\n".join(self.iter_pages(pdf_path, options)).strip() + "\n"
+        return apply_common_options(markdown, options)
+
+    def iter_pages(self, pdf_path: str, options: dict[str, Any] | None = None) -> Iterator[str]:
         has_runtime = importlib.util.find_spec("torch") is not None and importlib.util.find_spec("transformers") is not None
         if not has_runtime:
             reason = "torch/transformers missing; using OCR fallback"
@@ -146,49 +205,111 @@ class DeepSeekConverter:
                 "fallback_used": True,
                 "note": reason,
             }
-            markdown = get_ocr_converter().convert(pdf_path, None)
-            return apply_common_options(markdown, options)
-
-        max_pages = get_max_pages(options) or 2
-        max_pages = max(1, min(8, int(max_pages)))
-
-        pages_output: list[str] = []
-        images = render_pdf_images(pdf_path, max_pages=max_pages, dpi=220)
-        deepseek_error: Exception | None = None
+            yield from get_ocr_converter().iter_pages(pdf_path, None)
+            return
+
+        max_pages = get_max_pages(options)
+        if isinstance(max_pages, int):
+            max_pages = max(1, max_pages)
+        # Pages are capped by time rather than count: once the budget is spent, no further page
+        # is sent to a model (cached pages are still emitted). The clock starts once a model is
+        # loaded, so a cold start does not eat the budget.
+        budget = _env_float("DEEPSEEK_TIME_BUDGET_SECONDS", 120)
+        deadline: list[float] = []
+
+        def start_clock() -> None:
+            if budget and not deadline:
+                deadline.append(time.monotonic() + budget)
+
+        def until() -> Optional[float]:
+            return deadline[0] if deadline else None
+
+        batch_size = get_batch_size(options, _env_int("DEEPSEEK_BATCH_SIZE", 4))
+        pages_emitted = 0
+        pages_done = 0
+        page_numbers, total_pages = page_range(pdf_path, max_pages)
         use_official = os.getenv("DEEPSEEK_OFFICIAL_ENABLED", "true").lower() in {"1", "true", "yes"}
 
-        for idx, image in enumerate(images, start=1):
-            text = ""
-            if use_official:
-                try:
-                    with tempfile.TemporaryDirectory(prefix="deepseek_local_") as tmp:
-                        page_path = os.path.join(tmp, f"page-{idx}.png")
-                        image.save(page_path)
-                        text = self._run_official_deepseek(page_path, tmp)
-                except Exception as exc:  # pragma: no cover - hardware/runtime dependent
-                    deepseek_error = exc
-                    if idx == 1:
+        # Cached pages are only reused for the runtime this machine would run them on.
+        official_ready = use_official and self._cuda_available()
+        if official_ready:
+            variant = f"official={self._preferred_model_id};{dpi_tag(220)}"
+        else:
+            variant = f"backup={self._backup_model_id};{dpi_tag(220)}"
+
+        # Both runtimes stay pinned for the whole document once loaded, so neither is evicted
+        # between two batches of this request.
+        official = self._official.lease()
+        backup = self._backup.lease()
+        errors: list[Exception] = []
+
+        def run(batch: list[tuple[int, str | None, Any]]) -> list[tuple[int, str, bool, bool]]:
+            # (page, text, produced by the official runtime, freshly produced); runs on the OCR stage thread.
+            misses = [(idx, image) for idx, _, image in batch if image is not None]
+            official_texts: dict[int, str] = {}
+            if use_official and workdir is not None and not errors:
+                for idx, image in misses:
+                    try:
+                        runtime = official.get()
+                        start_clock()
+                        text = self._run_official_deepseek(runtime, image, workdir)
+                    except Exception as exc:  # pragma: no cover - hardware/runtime dependent
+                        # Not retried for the rest of the request; its pages go to the backup.
+                        errors.append(exc)
                         logger.warning("deepseek official runtime failed: %s", exc)
-
-            if not text:
+                        break
+                    if text:
+                        official_texts[idx] = text
+            rest = [(idx, image) for idx, image in misses if idx not in official_texts]
+            backup_texts: dict[int, str] = {}
+            if rest:
                 try:
-                    text = self._run_backup(image)
+                    pipe = backup.get()
+                    start_clock()
+                    outputs = self._backup_batcher.run([(pipe, image) for _, image in rest], batch_size)
+                    backup_texts = {idx: text for (idx, _), text in zip(rest, outputs)}
                 except Exception as exc:  # pragma: no cover - model/hardware dependent
                     logger.warning("deepseek local backup failed: %s", exc)
-                    text = ""
-
-            if text:
-                pages_output.append(f"## Page {idx}\n\n{text}")
-
-        if not pages_output:
+            return [
+                (idx, cached or "", False, False)
+                if image is None
+                else (idx, official_texts.get(idx) or backup_texts.get(idx, ""), idx in official_texts, True)
+                for idx, cached, image in batch
+            ]
+
+        # One work directory per request for the official runtime's `output_path` (and page files).
+        workdir_scope = tempfile.TemporaryDirectory(prefix="deepseek_local_") if use_official else nullcontext()
+        with page_memo(pdf_path, "deepseek", variant) as memo, official, backup, workdir_scope as workdir:
+            with PageImages(pdf_path, memo.missing(page_numbers), dpi=220) as images:
+                jobs = batches(memo_jobs(page_numbers, memo, images, until=until), batch_size)
+                with closing(pipelined(run, jobs)) as results:
+                    for batch in results:
+                        for idx, text, produced_by_official, fresh in batch:
+                            if fresh and text and (produced_by_official or not official_ready):
+                                memo.store(idx, text)
+                            pages_done = idx
+                            report_progress(idx, len(page_numbers))
+                            if text:
+                                pages_emitted += 1
+                                yield f"## Page {idx}\n\n{text}"
+        if pages_emitted and page_numbers and pages_done < page_numbers[-1]:
+            yield (
+                f"> Stopped after page {pages_done} of {total_pages}: the "
+                f"{budget:g} s `DEEPSEEK_TIME_BUDGET_SECONDS` budget was spent. "
+                "Cached pages are reused, so converting again continues further."
+            )
+        deepseek_error = errors[-1] if errors else None
+
+        if not pages_emitted:
             self.last_run = {
                 "engine_used": "ocr-only",
                 "provider_used": "local",
                 "fallback_used": True,
                 "note": "DeepSeek and backup local runtimes returned no text; used OCR fallback",
             }
-            markdown = get_ocr_converter().convert(pdf_path, None)
-            return apply_common_options(markdown, options)
+            # Only the pages the models got to before the budget ran out (or the requested range).
+            yield from get_ocr_converter().iter_pages(pdf_path, {"maxPages": max(1, pages_done)})
+            return
 
         used_official = use_official and deepseek_error is None and self._cuda_available()
         if used_official:
@@ -209,9 +330,6 @@ class DeepSeekConverter:
                 "note": note,
             }
 
-        markdown = "\n\n".join(pages_output).strip() + "\n"
-        return apply_common_options(markdown, options)
-
 
 model = ModelDefinition(
     model_id="deepseek",
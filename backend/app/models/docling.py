@@ -7,11 +7,13 @@ from typing import Any
 
 import fitz
 
-from .base import ModelDefinition
+from .base import LastRun, ModelDefinition
 from .common import apply_common_options, apply_docling_options, get_max_pages, get_ocr_converter
 
 
 class DoclingConverter:
+    last_run = LastRun()
+
     def __init__(self):
         self.last_run: dict[str, Any] = {
             "engine_used": "docling",
@@ -2,17 +2,32 @@ from __future__ import annotations
 
 import importlib.util
 import logging
-from typing import Any
+import os
+from contextlib import closing
+from typing import Any, Iterator
 
-import numpy as np
-
-from .base import ModelDefinition
-from .common import apply_common_options, get_max_pages, get_ocr_converter, render_pdf_images
+from ..microbatch import MicroBatcher
+from ..page_cache import page_memo
+from ..page_workers import batches, memo_jobs, pipelined
+from ..progress import report_progress
+from ..rasters import PageImages, dpi_tag, page_range
+from ..runtimes import RUNTIMES
+from .base import LastRun, ModelDefinition
+from .common import apply_common_options, get_batch_size, get_max_pages, get_ocr_converter
 
 logger = logging.getLogger(__name__)
 
 
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
 class DoctrEuConverter:
+    last_run = LastRun()
+
     def __init__(self):
         self.last_run: dict[str, Any] = {
             "engine_used": "doctr-eu",
@@ -20,7 +35,9 @@ class DoctrEuConverter:
             "fallback_used": False,
             "note": None,
         }
-        self._predictor = None
+        self._runtime = RUNTIMES.register("doctr-eu", self._load_predictor, owner="doctr-eu", estimate_mb=600)
+        # Pages of concurrent requests share predictor calls.
+        self._batcher = MicroBatcher("doctr-eu", self._infer)
 
     def is_available(self) -> tuple[bool, str | None]:
         if importlib.util.find_spec("doctr") is None:
@@ -28,19 +45,42 @@ class DoctrEuConverter:
         return (True, "local docTR (Mindee) runtime")
 
     def _load_predictor(self):
-        if self._predictor is not None:
-            return self._predictor
         from doctr.models import ocr_predictor  # type: ignore
 
         # Lightweight architecture choices for local usage.
-        self._predictor = ocr_predictor(
+        return ocr_predictor(
             det_arch="db_resnet50",
             reco_arch="crnn_vgg16_bn",
             pretrained=True,
         )
-        return self._predictor
+
+    def _page_texts(self, predictor: Any, images: list[Any]) -> list[str]:
+        # One predictor call for the whole batch; docTR batches detection and recognition itself.
+        doc = predictor(images)
+        texts: list[str] = []
+        for page in getattr(doc, "pages", None) or []:
+            page_text: list[str] = []
+            for block in page.blocks:
+                for line in block.lines:
+                    words = [w.value for w in line.words if getattr(w, "value", "")]
+                    if words:
+                        page_text.append(" ".join(words))
+            texts.append("\n".join(page_text).strip() or "*No text detected on this page.*")
+        return texts
+
+    def _infer(self, pages: list[tuple[Any, Any]]) -> list[str]:
+        # (predictor, image) pairs; the predictor is leased by the requests the pages came from.
+        return self._page_texts(pages[0][0], [image for _, image in pages])
+
+    def page_limit(self, options: dict[str, Any] | None = None) -> int | None:
+        max_pages = get_max_pages(options)
+        return max(1, min(30, max_pages)) if isinstance(max_pages, int) else None
 
     def convert(self, pdf_path: str, options: dict[str, Any] | None = None) -> str:
+        markdown = "\n\n".join(self.iter_pages(pdf_path, options)).strip() + "\n"
+        return apply_common_options(markdown, options)
+
+    def iter_pages(self, pdf_path: str, options: dict[str, Any] | None = None) -> Iterator[str]:
         if importlib.util.find_spec("doctr") is None:
             self.last_run = {
                 "engine_used": "ocr-only",
@@ -48,29 +88,40 @@ class DoctrEuConverter:
                 "fallback_used": True,
                 "note": "python-doctr missing; using OCR fallback",
             }
-            markdown = get_ocr_converter().convert(pdf_path, None)
-            return apply_common_options(markdown, options)
+            yield from get_ocr_converter().iter_pages(pdf_path, None)
+            return
 
-        max_pages = get_max_pages(options)
-        if isinstance(max_pages, int):
-            max_pages = max(1, min(30, max_pages))
+        max_pages = self.page_limit(options)
 
+        batch_size = get_batch_size(options, _env_int("DOCTR_BATCH_SIZE", 4))
+        pages_done = 0
         try:
-            predictor = self._load_predictor()
-            pages_output: list[str] = []
-            images = render_pdf_images(pdf_path, max_pages=max_pages, dpi=230)
-            for idx, image in enumerate(images, start=1):
-                doc = predictor([np.array(image)])
-                page_text: list[str] = []
-                if doc and getattr(doc, "pages", None):
-                    page = doc.pages[0]
-                    for block in page.blocks:
-                        for line in block.lines:
-                            words = [w.value for w in line.words if getattr(w, "value", "")]
-                            if words:
-                                page_text.append(" ".join(words))
-                text = "\n".join(page_text).strip() or "*No text detected on this page.*"
-                pages_output.append(f"## Page {idx}\n\n{text}")
+            page_numbers, _ = page_range(pdf_path, max_pages)
+            variant = f"db_resnet50+crnn_vgg16_bn;{dpi_tag(230)}"
+            # Only pages that miss the page cache are rendered, and only they load the runtime. The
+            # lease pins it for the whole document, so it is not evicted between two batches.
+            with page_memo(pdf_path, "doctr-eu", variant) as memo, self._runtime.lease() as runtime:
+                with PageImages(pdf_path, memo.missing(page_numbers), dpi=230, layout="rgb") as images:
+
+                    def run(batch: list[tuple[int, str | None, Any]]) -> list[tuple[int, str, bool]]:
+                        misses = [(runtime.get(), image) for _, _, image in batch if image is not None]
+                        texts = iter(self._batcher.run(misses, batch_size))
+                        return [
+                            (idx, cached or "", False) if image is None else (idx, next(texts), True)
+                            for idx, cached, image in batch
+                        ]
+
+                    # The engine reads the next batch on a stage thread while this one is stored and
+                    # streamed; at most one batch of rasters is held besides the render prefetch.
+                    jobs = batches(memo_jobs(page_numbers, memo, images), batch_size)
+                    with closing(pipelined(run, jobs)) as results:
+                        for batch in results:
+                            for idx, text, fresh in batch:
+                                if fresh:
+                                    memo.store(idx, text)
+                                pages_done = idx
+                                report_progress(idx, len(page_numbers))
+                                yield f"## Page {idx}\n\n{text}"
 
             self.last_run = {
                 "engine_used": "doctr-eu",
@@ -78,8 +129,6 @@ class DoctrEuConverter:
                 "fallback_used": False,
                 "note": "local docTR (Mindee) runtime",
             }
-            markdown = "\n\n".join(pages_output).strip() + "\n"
-            return apply_common_options(markdown, options)
         except Exception as exc:
             logger.warning("doctr-eu local runtime failed (%s), using OCR fallback", exc)
             self.last_run = {
@@ -88,8 +137,8 @@ class DoctrEuConverter:
                 "fallback_used": True,
                 "note": f"docTR runtime failed: {exc}",
             }
-            markdown = get_ocr_converter().convert(pdf_path, None)
-            return apply_common_options(markdown, options)
+            # Keep pages already converted and let OCR pick up from the failed page.
+            yield from get_ocr_converter().iter_pages(pdf_path, None, first_page=pages_done + 1)
 
 
 model = ModelDefinition(
@@ -1,18 +1,23 @@
 from __future__ import annotations
 
 import importlib.util
-import tempfile
-from typing import Any
+from contextlib import closing
+from typing import Any, Iterator
 
-import fitz
-from pdf2image import convert_from_path
-import pytesseract
+from PIL import Image
 
-from .base import ModelDefinition
+from ..ocr_engine import image_to_text
+from ..page_cache import page_memo
+from ..page_workers import map_pages, memo_jobs, page_workers
+from ..progress import report_progress
+from ..rasters import PageImages, dpi_tag, page_range
+from .base import LastRun, ModelDefinition
 from .common import apply_common_options, get_max_pages
 
 
 class DonutConverter:
+    last_run = LastRun()
+
     def __init__(self):
         self.last_run: dict[str, Any] = {
             "engine_used": "donut",
@@ -27,6 +32,10 @@ class DonutConverter:
         return (True, None)
 
     def convert(self, pdf_path: str, options: dict[str, Any] | None = None) -> str:
+        markdown = "\n\n".join(self.iter_pages(pdf_path, options)).strip() + "\n"
+        return apply_common_options(markdown, options)
+
+    def iter_pages(self, pdf_path: str, options: dict[str, Any] | None = None) -> Iterator[str]:
         # Donut implementation fallback: OCR-centric pipeline.
         available = importlib.util.find_spec("donut") is not None
         self.last_run = {
@@ -36,36 +45,33 @@ class DonutConverter:
             "note": None if available else "donut-python missing; using OCR implementation",
         }
         max_pages = get_max_pages(options)
-        pages_output = []
-        with fitz.open(pdf_path) as doc:
-            total_pages = len(doc)
-            limit = min(total_pages, max_pages) if max_pages else total_pages
-            for page_num in range(1, limit + 1):
-                page_text = self._ocr_page(pdf_path, page_num)
-                page_text = page_text.strip() or "*No text detected on this page.*"
-                pages_output.append(f"## Page {page_num}\n\n{page_text}")
+        page_numbers, total_pages = page_range(pdf_path, max_pages)
+        limit = len(page_numbers)
+        workers = page_workers(options)
+        with page_memo(pdf_path, "donut", f"mupdf;{dpi_tag(260)};tesseract-default") as memo:
+            with PageImages(pdf_path, memo.missing(page_numbers), dpi=260) as images:
+
+                def run(job: tuple[int, str | None, Image.Image | None]) -> tuple[int, str, bool]:
+                    page_num, cached, image = job
+                    if image is None:
+                        return page_num, cached or "", False
+                    return page_num, self._ocr_page(image), True
+
+                with closing(map_pages(run, memo_jobs(page_numbers, memo, images), workers)) as results:
+                    for page_num, page_text, fresh in results:
+                        if fresh and page_text.strip():
+                            memo.store(page_num, page_text.strip())
+                        page_text = page_text.strip() or "*No text detected on this page.*"
+                        report_progress(page_num, limit)
+                        yield f"## Page {page_num}\n\n{page_text}"
             if limit < total_pages:
-                pages_output.append(
+                yield (
                     f"> Truncated to first {limit} pages out of {total_pages}. "
                     "Increase `maxPages` in options for a fuller Donut OCR pass."
                 )
 
-        markdown = "\n\n".join(pages_output).strip() + "\n"
-        return apply_common_options(markdown, options)
-
-    def _ocr_page(self, pdf_path: str, page_number: int) -> str:
-        with tempfile.TemporaryDirectory(prefix="pdf_donut_") as temp_dir:
-            images = convert_from_path(
-                pdf_path,
-                dpi=260,
-                first_page=page_number,
-                last_page=page_number,
-                output_folder=temp_dir,
-                fmt="png",
-            )
-            if not images:
-                return ""
-            return pytesseract.image_to_string(images[0])
+    def _ocr_page(self, image: Image.Image) -> str:
+        return image_to_text(image)
 
 
 model = ModelDefinition(
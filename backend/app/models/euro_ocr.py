@@ -3,19 +3,21 @@ from __future__ import annotations
 import importlib.util
 import logging
 import os
-import tempfile
-from typing import Any
+from typing import Any, Iterator
 
-import numpy as np
-from pdf2image import convert_from_path
-
-from .base import ModelDefinition
+from ..page_cache import page_memo
+from ..progress import report_progress
+from ..rasters import PageImages, dpi_tag, page_range
+from ..runtimes import RUNTIMES
+from .base import LastRun, ModelDefinition
 from .common import apply_common_options, get_ocr_converter
 
 logger = logging.getLogger(__name__)
 
 
 class EuroOcrConverter:
+    last_run = LastRun()
+
     def __init__(self):
         self.last_run: dict[str, Any] = {
             "engine_used": "euro-ocr",
@@ -23,7 +25,7 @@ class EuroOcrConverter:
             "fallback_used": False,
             "note": None,
         }
-        self._reader = None
+        self._runtime = RUNTIMES.register("euro-ocr", self._load_reader, owner="euro-ocr", estimate_mb=500)
 
     def is_available(self) -> tuple[bool, str | None]:
         if importlib.util.find_spec("easyocr") is None:
@@ -31,17 +33,22 @@ class EuroOcrConverter:
         return (True, "local easyocr runtime")
 
     def _load_reader(self):
-        if self._reader is not None:
-            return self._reader
-
         import easyocr
 
         langs = os.getenv("EURO_OCR_LANGS", "en,fr,de,es,it,pt,nl").split(",")
         langs = [l.strip() for l in langs if l.strip()]
-        self._reader = easyocr.Reader(langs, gpu=False)
-        return self._reader
+        return easyocr.Reader(langs, gpu=False)
+
+    def page_limit(self, options: dict[str, Any] | None = None) -> int:
+        if isinstance(options, dict) and isinstance(options.get("maxPages"), int):
+            return max(1, min(40, int(options["maxPages"])))
+        return 10
 
     def convert(self, pdf_path: str, options: dict[str, Any] | None = None) -> str:
+        markdown = "\n\n".join(self.iter_pages(pdf_path, options)).strip() + "\n"
+        return apply_common_options(markdown, options)
+
+    def iter_pages(self, pdf_path: str, options: dict[str, Any] | None = None) -> Iterator[str]:
         if importlib.util.find_spec("easyocr") is None:
             reason = "easyocr missing; using OCR fallback"
             self.last_run = {
@@ -50,23 +57,29 @@ class EuroOcrConverter:
                 "fallback_used": True,
                 "note": reason,
             }
-            markdown = get_ocr_converter().convert(pdf_path, None)
-            return apply_common_options(markdown, options)
+            yield from get_ocr_converter().iter_pages(pdf_path, None)
+            return
 
-        max_pages = 10
-        if isinstance(options, dict) and isinstance(options.get("maxPages"), int):
-            max_pages = max(1, min(40, int(options["maxPages"])))
+        max_pages = self.page_limit(options)
 
+        pages_done = 0
+        variant = f"langs={os.getenv('EURO_OCR_LANGS', 'en,fr,de,es,it,pt,nl')};mupdf;{dpi_tag(260)}"
         try:
-            reader = self._load_reader()
-            pages_output: list[str] = []
-            with tempfile.TemporaryDirectory(prefix="euro_ocr_") as tmp:
-                images = convert_from_path(pdf_path, dpi=260, output_folder=tmp, fmt="png")
-                for idx, image in enumerate(images[:max_pages], start=1):
-                    lines = reader.readtext(np.array(image), detail=0, paragraph=True)
-                    text = "\n".join(line for line in lines if isinstance(line, str) and line.strip()).strip()
-                    text = text or "*No text detected on this page.*"
-                    pages_output.append(f"## Page {idx}\n\n{text}")
+            page_numbers, _ = page_range(pdf_path, max_pages)
+            # Only pages that miss the page cache are rendered, and only they load the runtime.
+            with page_memo(pdf_path, "euro-ocr", variant) as memo, self._runtime.lease() as runtime:
+                with PageImages(pdf_path, memo.missing(page_numbers), dpi=260, layout="rgb") as images:
+                    for idx in page_numbers:
+                        text = memo.lookup(idx)
+                        if text is None:
+                            image = images.take(idx)
+                            lines = runtime.get().readtext(image, detail=0, paragraph=True)
+                            text = "\n".join(line for line in lines if isinstance(line, str) and line.strip()).strip()
+                            text = text or "*No text detected on this page.*"
+                            memo.store(idx, text)
+                        pages_done = idx
+                        report_progress(idx, len(page_numbers))
+                        yield f"## Page {idx}\n\n{text}"
 
             self.last_run = {
                 "engine_used": "euro-ocr",
@@ -74,8 +87,6 @@ class EuroOcrConverter:
                 "fallback_used": False,
                 "note": "local easyocr runtime",
             }
-            markdown = "\n\n".join(pages_output).strip() + "\n"
-            return apply_common_options(markdown, options)
         except Exception as exc:
             logger.warning("euro-ocr local runtime failed (%s), using OCR fallback", exc)
             self.last_run = {
@@ -84,8 +95,8 @@ class EuroOcrConverter:
                 "fallback_used": True,
                 "note": f"Euro OCR local runtime failed: {exc}",
             }
-            markdown = get_ocr_converter().convert(pdf_path, None)
-            return apply_common_options(markdown, options)
+            # Keep pages already converted and let OCR pick up from the failed page.
+            yield from get_ocr_converter().iter_pages(pdf_path, None, first_page=pages_done + 1)
 
 
 model = ModelDefinition(
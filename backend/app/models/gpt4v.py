@@ -5,17 +5,21 @@ import importlib.util
 import logging
 import os
 import tempfile
-from typing import Any
+from typing import Any, Iterator
 
-from pdf2image import convert_from_path
 
-from .base import ModelDefinition
+from ..page_cache import page_memo
+from ..progress import report_progress
+from ..rasters import PageImages, dpi_tag, page_range
+from .base import LastRun, ModelDefinition
 from .common import apply_common_options, get_ocr_converter
 
 logger = logging.getLogger(__name__)
 
 
 class GPT4VConverter:
+    last_run = LastRun()
+
     def __init__(self):
         self.last_run: dict[str, Any] = {
             "engine_used": "gpt4v",
@@ -31,7 +35,47 @@ class GPT4VConverter:
             return (False, "OPENAI_API_KEY missing")
         return (True, None)
 
+    def _page_markdown(self, client: Any, image_path: str) -> str:
+        with open(image_path, "rb") as f:
+            b64 = base64.b64encode(f.read()).decode("ascii")
+
+        response = client.chat.completions.create(
+            model="gpt-4.1",
+            messages=[
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": (
+                                "Convert this PDF page to markdown. Preserve headings, lists, tables, and equations. "
+                                "Return only markdown content."
+                            ),
+                        },
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": f"data:image/png;base64,{b64}",
+                                "detail": "high",
+                            },
+                        },
+                    ],
+                }
+            ],
+            max_tokens=4096,
+        )
+        return response.choices[0].message.content or ""
+
+    def page_limit(self, options: dict[str, Any] | None = None) -> int:
+        if isinstance(options, dict) and isinstance(options.get("maxPages"), int):
+            return max(1, min(8, int(options["maxPages"])))
+        return 2
+
     def convert(self, pdf_path: str, options: dict[str, Any] | None = None) -> str:
+        markdown = "\n\n".join(self.iter_pages(pdf_path, options)).strip() + "\n"
+        return apply_common_options(markdown, options)
+
+    def iter_pages(self, pdf_path: str, options: dict[str, Any] | None = None) -> Iterator[str]:
         has_openai = importlib.util.find_spec("openai") is not None
         has_key = bool(os.getenv("OPENAI_API_KEY"))
         if not has_openai or not has_key:
@@ -47,55 +91,32 @@ class GPT4VConverter:
                 "fallback_used": True,
                 "note": reason,
             }
-            markdown = get_ocr_converter().convert(pdf_path, None)
-            return apply_common_options(markdown, options)
+            yield from get_ocr_converter().iter_pages(pdf_path, None)
+            return
 
         from openai import OpenAI
 
         client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
 
-        max_pages = 2
-        if isinstance(options, dict) and isinstance(options.get("maxPages"), int):
-            max_pages = max(1, min(8, int(options["maxPages"])))
+        max_pages = self.page_limit(options)
 
-        pages: list[str] = []
+        pages_done = 0
         try:
-            with tempfile.TemporaryDirectory(prefix="gpt4v_") as temp_dir:
-                images = convert_from_path(pdf_path, dpi=200, output_folder=temp_dir, fmt="png")
-                for index, image in enumerate(images[:max_pages], start=1):
-                    tmp_img = os.path.join(temp_dir, f"page_{index}.png")
-                    image.save(tmp_img, format="PNG")
-                    with open(tmp_img, "rb") as f:
-                        b64 = base64.b64encode(f.read()).decode("ascii")
-
-                    response = client.chat.completions.create(
-                        model="gpt-4.1",
-                        messages=[
-                            {
-                                "role": "user",
-                                "content": [
-                                    {
-                                        "type": "text",
-                                        "text": (
-                                            "Convert this PDF page to markdown. Preserve headings, lists, tables, and equations. "
-                                            "Return only markdown content."
-                                        ),
-                                    },
-                                    {
-                                        "type": "image_url",
-                                        "image_url": {
-                                            "url": f"data:image/png;base64,{b64}",
-                                            "detail": "high",
-                                        },
-                                    },
-                                ],
-                            }
-                        ],
-                        max_tokens=4096,
-                    )
-
-                    page_markdown = response.choices[0].message.content or ""
-                    pages.append(f"## Page {index}\n\n{page_markdown.strip()}")
+            page_numbers, _ = page_range(pdf_path, max_pages)
+            with tempfile.TemporaryDirectory(prefix="gpt4v_") as temp_dir, page_memo(pdf_path, "gpt4v", f"gpt-4.1;mupdf;{dpi_tag(200)}") as memo:
+                # A cached page skips rendering and the paid API call entirely.
+                with PageImages(pdf_path, memo.missing(page_numbers), dpi=200) as images:
+                    for index in page_numbers:
+                        page_markdown = memo.lookup(index)
+                        if page_markdown is None:
+                            tmp_img = os.path.join(temp_dir, f"page_{index}.png")
+                            images.take(index).save(tmp_img, format="PNG")
+                            page_markdown = self._page_markdown(client, tmp_img)
+                            if page_markdown.strip():
+                                memo.store(index, page_markdown.strip())
+                        pages_done = index
+                        report_progress(index, len(page_numbers))
+                        yield f"## Page {index}\n\n{page_markdown.strip()}"
         except Exception as exc:
             logger.warning("gpt4v request failed (%s), using OCR fallback", exc)
             self.last_run = {
@@ -104,17 +125,16 @@ class GPT4VConverter:
                 "fallback_used": True,
                 "note": f"gpt4v request failed: {exc}",
             }
-            markdown = get_ocr_converter().convert(pdf_path, None)
-            return apply_common_options(markdown, options)
+            # Keep pages already converted and let OCR pick up from the failed page.
+            yield from get_ocr_converter().iter_pages(pdf_path, None, first_page=pages_done + 1)
+            return
 
-        markdown = "\n\n".join(pages).strip() + "\n"
         self.last_run = {
             "engine_used": "gpt4v",
             "provider_used": "local",
             "fallback_used": False,
             "note": None,
         }
-        return apply_common_options(markdown, options)
 
 
 model = ModelDefinition(
@@ -3,11 +3,14 @@ from __future__ import annotations
 import fitz
 from typing import Any
 
-from .base import ModelDefinition
+from ..progress import report_progress
+from .base import LastRun, ModelDefinition
 from .common import apply_common_options, get_ocr_converter
 
 
 class LayoutLMConverter:
+    last_run = LastRun()
+
     def __init__(self):
         self.last_run: dict[str, Any] = {
             "engine_used": "layoutlm",
@@ -19,6 +22,7 @@ class LayoutLMConverter:
     def convert(self, pdf_path: str, options: dict[str, Any] | None = None) -> str:
         pages = []
         with fitz.open(pdf_path) as doc:
+            total_pages = len(doc)
             for idx, page in enumerate(doc, start=1):
                 blocks = page.get_text("blocks")
                 blocks = sorted(blocks, key=lambda b: (b[1], b[0]))
@@ -36,6 +40,7 @@ class LayoutLMConverter:
 
                 page_markdown = "\n\n".join(content).strip() or "*No text detected on this page.*"
                 pages.append(f"## Page {idx}\n\n{page_markdown}")
+                report_progress(idx, total_pages)
 
         markdown = "\n\n".join(pages).strip() + "\n"
         if len(markdown.strip()) < 80:
@@ -8,13 +8,15 @@ from typing import Any
 
 import fitz
 
-from .base import ModelDefinition
+from .base import LastRun, ModelDefinition
 from .common import apply_common_options, get_max_pages, get_ocr_converter
 
 logger = logging.getLogger(__name__)
 
 
 class MarkItDownConverter:
+    last_run = LastRun()
+
     def __init__(self):
         self.last_run: dict[str, Any] = {
             "engine_used": "markitdown",
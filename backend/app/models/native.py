@@ -1,16 +1,34 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Iterator
 
+from ..ocr_engine import image_to_text
+from ..page_cache import page_memo
+from ..page_workers import map_pages, page_workers
+from ..progress import report_progress
+from ..rasters import dpi_tag, render_pdf_page
 from .base import ModelDefinition
 from .common import apply_common_options, get_native_converter
 
 
 class NativeConverter:
     def convert(self, pdf_path: str, options: dict[str, Any] | None = None) -> str:
-        markdown = get_native_converter().convert_to_markdown(pdf_path)
+        markdown = "\n\n".join(self.iter_pages(pdf_path, options)).strip() + "\n"
         return apply_common_options(markdown, options)
 
+    def iter_pages(self, pdf_path: str, options: dict[str, Any] | None = None) -> Iterator[str]:
+        # Only the OCR fallback for scanned pages is memoized; text extraction is cheap.
+        workers = page_workers(options)
+        with page_memo(pdf_path, "native-ocr", f"mupdf;{dpi_tag(250)};tesseract-default") as memo:
+            yield from get_native_converter().iter_markdown_pages(
+                pdf_path,
+                on_page=report_progress,
+                ocr_memo=memo,
+                render_page=lambda page_number: render_pdf_page(pdf_path, page_number, dpi=250),
+                ocr_image=image_to_text,
+                map_pages=lambda fn, pages: map_pages(fn, pages, workers),
+            )
+
 
 model = ModelDefinition(
     model_id="native",
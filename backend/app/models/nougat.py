@@ -7,13 +7,15 @@ import tempfile
 from pathlib import Path
 from typing import Any
 
-from .base import ModelDefinition
+from .base import LastRun, ModelDefinition
 from .common import apply_common_options, get_ocr_converter
 
 logger = logging.getLogger(__name__)
 
 
 class NougatConverter:
+    last_run = LastRun()
+
     def __init__(self):
         self.last_run: dict[str, Any] = {
             "engine_used": "nougat",
@@ -1,61 +1,106 @@
 from __future__ import annotations
 
-from typing import Any
+from contextlib import closing
+from typing import Any, Iterator
 
 import fitz
-import pytesseract
-from PIL import Image, ImageOps
+import numpy as np
 
+from ..ocr_engine import OcrPass, confidence_threshold, run_pass
+from ..page_cache import page_memo
+from ..page_workers import map_pages, memo_jobs, page_workers
+from ..preprocess import binarize
+from ..progress import count_detail, report_progress, tally_detail
+from ..rasters import PageImages, dpi_tag
 from .base import ModelDefinition
-from .common import apply_common_options, get_max_pages, render_pdf_images
+from .common import apply_common_options, get_max_pages
+
+# Identifies this OCR recipe in the page cache; change it whenever page output would change.
+PAGE_CACHE_VARIANT = "gray;binarize-185x2;tesseract-early-exit"
+
+# Tried in order until one reaches OCR_CONFIDENCE_THRESHOLD: the plain render before the 2x
+# binarized one (a quarter of the pixels), uniform-block psm 6 before sparse-text psm 11, and
+# the default engine before LSTM-only.
+OCR_PASSES = (
+    ("gray", "--oem 3 --psm 6"),
+    ("binarized", "--oem 3 --psm 6"),
+    ("gray", "--oem 3 --psm 11"),
+    ("binarized", "--oem 3 --psm 11"),
+    ("gray", "--oem 1 --psm 6"),
+    ("binarized", "--oem 1 --psm 6"),
+)
 
 
 class OcrOnlyConverter:
-    def _preprocess_for_ocr(self, image: Image.Image) -> Image.Image:
-        gray = image.convert("L")
-        enhanced = ImageOps.autocontrast(gray)
-        resampling = getattr(Image, "Resampling", Image)
-        upscaled = enhanced.resize((enhanced.width * 2, enhanced.height * 2), resampling.BICUBIC)
-        bw = upscaled.point(lambda p: 0 if p < 185 else 255, mode="1")
-        return bw.convert("L")
+    def _preprocess_for_ocr(self, image: np.ndarray) -> np.ndarray:
+        return binarize(image, threshold=185, factor=2)
 
     def convert(self, pdf_path: str, options: dict[str, Any] | None = None) -> str:
+        markdown = "\n\n".join(self.iter_pages(pdf_path, options)).strip() + "\n"
+        return apply_common_options(markdown, options)
+
+    def iter_pages(
+        self, pdf_path: str, options: dict[str, Any] | None = None, first_page: int = 1
+    ) -> Iterator[str]:
+        # `first_page` lets other converters resume here after failing part-way through.
         max_pages = get_max_pages(options)
-        pages_output = []
-        with fitz.open(pdf_path) as doc:
+        workers = page_workers(options)
+        variant = f"{dpi_tag(220)};{PAGE_CACHE_VARIANT};conf={confidence_threshold():g}"
+        with fitz.open(pdf_path) as doc, page_memo(pdf_path, "ocr-only", variant) as memo:
             total_pages = len(doc)
             limit = min(total_pages, max_pages) if max_pages else total_pages
-            images = render_pdf_images(pdf_path, max_pages=limit, dpi=220)
-            for page_num in range(1, limit + 1):
-                page_text = self._ocr_page(images, doc, page_num)
-                page_text = page_text.strip() or "*No text detected on this page.*"
-                pages_output.append(f"## Page {page_num}\n\n{page_text}")
+            page_numbers = range(max(1, first_page), limit + 1)
+            with PageImages(pdf_path, memo.missing(page_numbers), dpi=220, layout="gray") as images:
+
+                def run(job: tuple[int, str | None, np.ndarray | None]) -> tuple[int, str | None, bool]:
+                    page_num, cached, image = job
+                    if image is None:
+                        return page_num, cached, False
+                    return page_num, self._recognize(image), True
+
+                jobs = memo_jobs(page_numbers, memo, images)
+                with closing(map_pages(run, jobs, workers)) as results:
+                    for page_num, page_text, fresh in results:
+                        if fresh and page_text:
+                            # Only real OCR output is memoized; the text-layer fallback is not.
+                            memo.store(page_num, page_text)
+                        elif fresh:
+                            page_text = self._text_layer(doc, page_num)
+                        page_text = (page_text or "").strip() or "*No text detected on this page.*"
+                        report_progress(page_num, limit)
+                        yield f"## Page {page_num}\n\n{page_text}"
             if limit < total_pages:
-                pages_output.append(
+                yield (
                     f"> Truncated to first {limit} pages out of {total_pages}. "
                     "Increase `maxPages` in options for full-document OCR."
                 )
-        markdown = "\n\n".join(pages_output).strip() + "\n"
-        return apply_common_options(markdown, options)
-
-    def _ocr_page(self, images: list, doc: fitz.Document, page_number: int) -> str:
-        if not images or page_number > len(images):
-            return ""
 
-        image = images[page_number - 1]
+    def _recognize(self, image: np.ndarray) -> str | None:
+        # Runs on the page workers, so it must not touch the PyMuPDF document.
         try:
-            best_text = ""
-            candidates = [self._preprocess_for_ocr(image), image]
-            for candidate in candidates:
-                for config in ("--oem 3 --psm 6", "--oem 3 --psm 11", "--oem 1 --psm 6"):
-                    text = pytesseract.image_to_string(candidate, lang="eng", config=config)
-                    if len(text.strip()) > len(best_text.strip()):
-                        best_text = text
-            if best_text.strip():
-                return best_text
+            threshold = confidence_threshold()
+            candidates = {"gray": image}
+            best: OcrPass | None = None
+            best_label = ""
+            tried = 0
+            for variant, config in OCR_PASSES:
+                if variant not in candidates:
+                    candidates[variant] = self._preprocess_for_ocr(image)
+                result = run_pass(candidates[variant], config)
+                tried += 1
+                if best is None or result.score > best.score:
+                    best, best_label = result, f"{variant} {config}"
+                if result.words and result.mean_confidence >= threshold:
+                    break
+            count_detail("ocr_passes", tried)
+            if best is not None and best.text.strip():
+                tally_detail("ocr_config", best_label)
+                return best.text.strip()
         except Exception:
             pass
+        return None
 
+    def _text_layer(self, doc: fitz.Document, page_number: int) -> str:
         # Last-resort text extraction when Tesseract is unavailable.
         if 1 <= page_number <= len(doc):
             return doc.load_page(page_number - 1).get_text("text")
@@ -3,17 +3,31 @@ from __future__ import annotations
 import importlib.util
 import logging
 import os
-from typing import Any
+from contextlib import closing
+from typing import Any, Iterator
+
+from ..microbatch import MicroBatcher
+from ..page_cache import page_memo
+from ..page_workers import batches, cpu_slice, map_pages, memo_jobs, pinned, threads_per_worker
+from ..progress import report_progress
+from ..rasters import PageImages, dpi_tag, page_range
+from ..runtimes import RUNTIMES
+from .base import LastRun, ModelDefinition
+from .common import apply_common_options, get_batch_size, get_max_pages, get_ocr_converter
 
-import numpy as np
+logger = logging.getLogger(__name__)
 
-from .base import ModelDefinition
-from .common import apply_common_options, get_max_pages, get_ocr_converter, render_pdf_images
 
-logger = logging.getLogger(__name__)
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
 
 
 class PaddleOcrConverter:
+    last_run = LastRun()
+
     def __init__(self):
         self.last_run: dict[str, Any] = {
             "engine_used": "paddleocr",
@@ -21,31 +35,74 @@ class PaddleOcrConverter:
             "fallback_used": False,
             "note": None,
         }
-        self._ocr = None
+        self._instances = max(1, _env_int("PADDLEOCR_INSTANCES", 1))
+        self._pool = RUNTIMES.register_pool(
+            "paddleocr", self._load_ocr, size=self._instances, owner="paddleocr", estimate_mb=700
+        )
+        # Pages of concurrent requests share predict calls, one batch per free instance.
+        self._batcher = MicroBatcher("paddleocr", self._infer, concurrency=self._instances)
 
     def is_available(self) -> tuple[bool, str | None]:
         if importlib.util.find_spec("paddleocr") is None:
             return (False, "paddleocr missing")
         return (True, "local paddleocr runtime")
 
-    def _load_ocr(self):
-        if self._ocr is not None:
-            return self._ocr
-
+    def _load_ocr(self, index: int):
         from paddleocr import PaddleOCR  # type: ignore
 
         os.environ.setdefault("PADDLE_PDX_DISABLE_MODEL_SOURCE_CHECK", "True")
         lang = os.getenv("PADDLEOCR_LANG", "en")
-        self._ocr = PaddleOCR(
+        return PaddleOCR(
             lang=lang,
             device="cpu",
             use_doc_orientation_classify=False,
             use_doc_unwarping=False,
             use_textline_orientation=False,
+            # Instances split the cores; each runs pinned to its own slice (see `cpu_slice`).
+            cpu_threads=threads_per_worker(self._instances),
         )
-        return self._ocr
+
+    def _result_text(self, result: Any) -> str:
+        lines: list[str] = []
+        if result:
+            for page_result in result:
+                if not page_result:
+                    continue
+                if isinstance(page_result, dict):
+                    rec_texts = page_result.get("rec_texts", [])
+                    for text in rec_texts:
+                        if isinstance(text, str) and text.strip():
+                            lines.append(text.strip())
+                else:
+                    # Compatibility with older PaddleOCR outputs.
+                    for entry in page_result:
+                        try:
+                            text = entry[1][0]
+                        except Exception:
+                            text = ""
+                        if isinstance(text, str) and text.strip():
+                            lines.append(text.strip())
+        return "\n".join(lines).strip() or "*No text detected on this page.*"
+
+    def _page_texts(self, ocr: Any, images: list[Any]) -> list[str]:
+        if len(images) > 1 and hasattr(ocr, "predict"):
+            # PaddleOCR 3.x takes a list of pages and batches their text lines in recognition.
+            return [self._result_text([result]) for result in ocr.predict(images)]
+        return [self._result_text(ocr.ocr(image)) for image in images]
+
+    def _infer(self, images: list[Any]) -> list[str]:
+        with self._pool.checkout() as (index, runtime), pinned(cpu_slice(index, len(self._pool))):
+            return self._page_texts(runtime.get(), images)
+
+    def page_limit(self, options: dict[str, Any] | None = None) -> int | None:
+        max_pages = get_max_pages(options)
+        return max(1, min(40, max_pages)) if isinstance(max_pages, int) else None
 
     def convert(self, pdf_path: str, options: dict[str, Any] | None = None) -> str:
+        markdown = "\n\n".join(self.iter_pages(pdf_path, options)).strip() + "\n"
+        return apply_common_options(markdown, options)
+
+    def iter_pages(self, pdf_path: str, options: dict[str, Any] | None = None) -> Iterator[str]:
         if importlib.util.find_spec("paddleocr") is None:
             self.last_run = {
                 "engine_used": "ocr-only",
@@ -53,40 +110,39 @@ class PaddleOcrConverter:
                 "fallback_used": True,
                 "note": "paddleocr missing; using OCR fallback",
             }
-            markdown = get_ocr_converter().convert(pdf_path, None)
-            return apply_common_options(markdown, options)
+            yield from get_ocr_converter().iter_pages(pdf_path, None)
+            return
 
-        max_pages = get_max_pages(options)
-        if isinstance(max_pages, int):
-            max_pages = max(1, min(40, max_pages))
+        max_pages = self.page_limit(options)
 
+        batch_size = get_batch_size(options, _env_int("PADDLEOCR_BATCH_SIZE", 4))
+        pages_done = 0
+        variant = f"lang={os.getenv('PADDLEOCR_LANG', 'en')};{dpi_tag(120)}"
         try:
-            ocr = self._load_ocr()
-            pages_output: list[str] = []
-            images = render_pdf_images(pdf_path, max_pages=max_pages, dpi=120)
-            for idx, image in enumerate(images, start=1):
-                result = ocr.ocr(np.array(image))
-                lines: list[str] = []
-                if result:
-                    for page_result in result:
-                        if not page_result:
-                            continue
-                        if isinstance(page_result, dict):
-                            rec_texts = page_result.get("rec_texts", [])
-                            for text in rec_texts:
-                                if isinstance(text, str) and text.strip():
-                                    lines.append(text.strip())
-                        else:
-                            # Compatibility with older PaddleOCR outputs.
-                            for entry in page_result:
-                                try:
-                                    text = entry[1][0]
-                                except Exception:
-                                    text = ""
-                                if isinstance(text, str) and text.strip():
-                                    lines.append(text.strip())
-                text = "\n".join(lines).strip() or "*No text detected on this page.*"
-                pages_output.append(f"## Page {idx}\n\n{text}")
+            page_numbers, _ = page_range(pdf_path, max_pages)
+            # Only pages that miss the page cache are rendered, and only they load an instance.
+            with page_memo(pdf_path, "paddleocr", variant) as memo:
+                with PageImages(pdf_path, memo.missing(page_numbers), dpi=120, layout="rgb") as images:
+
+                    def run(batch: list[tuple[int, str | None, Any]]) -> list[tuple[int, str, bool]]:
+                        misses = [image for _, _, image in batch if image is not None]
+                        texts = iter(self._batcher.run(misses, batch_size))
+                        return [
+                            (idx, cached or "", False) if image is None else (idx, next(texts), True)
+                            for idx, cached, image in batch
+                        ]
+
+                    # Batches go to as many instances as the pool has, each on its own page worker,
+                    # while finished pages are stored and streamed in order on this thread.
+                    jobs = batches(memo_jobs(page_numbers, memo, images), batch_size)
+                    with closing(map_pages(run, jobs, self._instances)) as results:
+                        for batch in results:
+                            for idx, text, fresh in batch:
+                                if fresh:
+                                    memo.store(idx, text)
+                                pages_done = idx
+                                report_progress(idx, len(page_numbers))
+                                yield f"## Page {idx}\n\n{text}"
 
             self.last_run = {
                 "engine_used": "paddleocr",
@@ -94,8 +150,6 @@ class PaddleOcrConverter:
                 "fallback_used": False,
                 "note": "local paddleocr runtime",
             }
-            markdown = "\n\n".join(pages_output).strip() + "\n"
-            return apply_common_options(markdown, options)
         except Exception as exc:
             logger.warning("paddleocr local runtime failed (%s), using OCR fallback", exc)
             self.last_run = {
@@ -104,8 +158,8 @@ class PaddleOcrConverter:
                 "fallback_used": True,
                 "note": f"PaddleOCR local runtime failed: {exc}",
             }
-            markdown = get_ocr_converter().convert(pdf_path, None)
-            return apply_common_options(markdown, options)
+            # Keep pages already converted and let OCR pick up from the failed page.
+            yield from get_ocr_converter().iter_pages(pdf_path, None, first_page=pages_done + 1)
 
 
 model = ModelDefinition(
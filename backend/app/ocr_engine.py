@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import io
+import logging
+import os
+import re
+import shlex
+import subprocess
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+import pytesseract
+from PIL import Image
+
+from .page_workers import thread_budget
+
+try:
+    import tesserocr  # type: ignore
+except Exception:  # pragma: no cover
+    tesserocr = None
+
+logger = logging.getLogger(__name__)
+
+# Columns of Tesseract's TSV output, named as in `pytesseract.image_to_data(output_type=DICT)`.
+_TSV_COLUMNS = (
+    "level", "page_num", "block_num", "par_num", "line_num", "word_num",
+    "left", "top", "width", "height", "conf", "text",
+)
+_CONFIG_FLAG = re.compile(r"--(oem|psm)\s+(\d+)")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def confidence_threshold() -> float:
+    try:
+        return float(os.getenv("OCR_CONFIDENCE_THRESHOLD", "80"))
+    except ValueError:
+        return 80.0
+
+
+def _child_thread_limit() -> Optional[str]:
+    # `OMP_THREAD_LIMIT` for a `tesseract` process started by a page worker: its share of the
+    # cores, unless the limit is configured explicitly (or the caller is not a page worker).
+    threads = thread_budget()
+    if threads is None or "OMP_THREAD_LIMIT" in os.environ:
+        return None
+    return str(threads)
+
+
+def _tesseract_cli(image: Any, lang: str, config: str, threads: str, extension: str = "") -> str:
+    """One `tesseract` run with `OMP_THREAD_LIMIT` set in the child's own environment.
+
+    pytesseract passes its module-wide environment to every process it starts, so page workers
+    run the CLI themselves: the page goes in on stdin as PNG and the output comes back on stdout.
+    """
+    if not isinstance(image, Image.Image):
+        image = Image.fromarray(image)
+    page = io.BytesIO()
+    image.save(page, format="PNG")
+    args = [pytesseract.pytesseract.tesseract_cmd, "stdin", "stdout", "-l", lang]
+    args += shlex.split(config) + ([extension] if extension else [])
+    env = dict(os.environ, OMP_THREAD_LIMIT=threads)
+    try:
+        proc = subprocess.run(args, input=page.getvalue(), capture_output=True, env=env)
+    except FileNotFoundError:
+        raise pytesseract.TesseractNotFoundError() from None
+    if proc.returncode:
+        raise pytesseract.TesseractError(proc.returncode, proc.stderr.decode("utf-8", "replace").strip())
+    return proc.stdout.decode("utf-8", "replace")
+
+
+@lru_cache(maxsize=1)
+def _openmp() -> Any:
+    # The OpenMP runtime Tesseract is built against, or None (e.g. a build without OpenMP).
+    name = ctypes.util.find_library("gomp")
+    try:
+        return ctypes.CDLL(name) if name else None
+    except OSError:
+        return None
+
+
+def _limit_engine_threads() -> None:
+    # In-process engines start their OpenMP threads from the calling thread, whose own thread
+    # count (an OpenMP per-thread setting) is set to the page worker's share of the cores.
+    threads = thread_budget()
+    if threads is None:
+        return
+    openmp = _openmp()
+    if openmp is not None:
+        openmp.omp_set_num_threads(threads)
+
+
+def _parse_config(config: str) -> Optional[tuple[int, int]]:
+    # (oem, psm) for configs the engine pool can run; anything beyond those two flags goes
+    # through the tesseract CLI. The defaults match the CLI's.
+    if _CONFIG_FLAG.sub("", config).strip():
+        return None
+    flags = dict(_CONFIG_FLAG.findall(config))
+    return int(flags.get("oem", 3)), int(flags.get("psm", 3))
+
+
+def _set_image(api: Any, image: Any) -> None:
+    if hasattr(image, "shape"):
+        # NumPy pages (gray or RGB) are handed over as raw bytes, without a PIL round-trip.
+        height, width = image.shape[:2]
+        channels = image.shape[2] if len(image.shape) == 3 else 1
+        api.SetImageBytes(image.tobytes(), width, height, channels, width * channels)
+    else:
+        api.SetImage(image)
+
+
+def _parse_tsv(tsv: str) -> dict[str, list[Any]]:
+    data: dict[str, list[Any]] = {column: [] for column in _TSV_COLUMNS}
+    for row in tsv.splitlines():
+        fields = row.split("\t", len(_TSV_COLUMNS) - 1)
+        # Short rows, and the header row the CLI prints.
+        if len(fields) < len(_TSV_COLUMNS) - 1 or not fields[0].isdigit():
+            continue
+        fields += [""] * (len(_TSV_COLUMNS) - len(fields))
+        for column, value in zip(_TSV_COLUMNS[:-2], fields):
+            data[column].append(int(value))
+        data["conf"].append(float(fields[-2]))
+        data["text"].append(fields[-1])
+    return data
+
+
+class TesseractPool:
+    """Warm Tesseract engines shared by every Tesseract-based converter.
+
+    Each pytesseract call starts a `tesseract` process, writes the page to a temp file and loads
+    the traineddata again. With `tesserocr` installed, passes instead run on in-process engines
+    that are created once and reused, and pages are passed as in-memory buffers. Engines are
+    keyed by (lang, oem), which is fixed once the traineddata is loaded; the page segmentation
+    mode is set per call. At most `TESSERACT_POOL_SIZE` engines exist (default: CPU count):
+    callers wait while all of them are busy, and an idle engine of another key is closed to make
+    room. Without tesserocr, calls go through pytesseract, as do calls for a (lang, oem) whose
+    engine cannot be created (e.g. its traineddata is not installed).
+    """
+
+    def __init__(self, size: Optional[int] = None):
+        self.size = max(1, size if size is not None else _env_int("TESSERACT_POOL_SIZE", os.cpu_count() or 1))
+        self._idle: dict[tuple[str, int], list[Any]] = {}
+        self._engines = 0
+        self._cond = threading.Condition()
+        # Keys whose engine could not be created (e.g. traineddata that is not installed), and
+        # whether tesserocr cannot create engines at all.
+        self._failed: set[tuple[str, int]] = set()
+        self._broken = False
+
+    @property
+    def available(self) -> bool:
+        return tesserocr is not None and not self._broken
+
+    def _checkout(self, key: tuple[str, int]) -> Any:
+        victim = None
+        with self._cond:
+            while True:
+                if self._idle.get(key):
+                    return self._idle[key].pop()
+                if self._engines < self.size:
+                    self._engines += 1
+                    break
+                other = next((engines for engines in self._idle.values() if engines), None)
+                if other is not None:
+                    victim = other.pop()
+                    break
+                self._cond.wait()
+        if victim is not None:
+            victim.End()
+        try:
+            return tesserocr.PyTessBaseAPI(lang=key[0], oem=key[1])
+        except BaseException:
+            with self._cond:
+                self._engines -= 1
+                self._cond.notify()
+            raise
+
+    def _checkin(self, key: tuple[str, int], api: Any) -> None:
+        api.Clear()
+        with self._cond:
+            self._idle.setdefault(key, []).append(api)
+            self._cond.notify()
+
+    def _discard(self, api: Any) -> None:
+        try:
+            api.End()
+        finally:
+            with self._cond:
+                self._engines -= 1
+                self._cond.notify()
+
+    def _engine_failed(self, key: tuple[str, int], exc: Exception) -> None:
+        # A failing (lang, oem) only sends that key to the CLI (e.g. traineddata that is not
+        # installed); tesserocr as a whole is given up only when it cannot see any tessdata.
+        self._failed.add(key)
+        try:
+            _, installed = tesserocr.get_languages()
+        except Exception:
+            installed = []
+        if installed:
+            logger.warning("no tesserocr engine for lang=%s oem=%s, using the tesseract CLI: %s", *key, exc)
+            return
+        logger.warning("tesserocr engine unavailable, using the tesseract CLI from now on: %s", exc)
+        self._broken = True
+
+    def _run(self, image: Any, config: str, lang: str, read: Callable[[Any], Any]) -> Any:
+        # `read(api)` on an engine holding the recognised page, or None when the call has to
+        # go through pytesseract instead.
+        parsed = _parse_config(config) if self.available else None
+        if parsed is None:
+            return None
+        oem, psm = parsed
+        key = (lang, oem)
+        if key in self._failed:
+            return None
+        try:
+            api = self._checkout(key)
+        except Exception as exc:
+            self._engine_failed(key, exc)
+            return None
+        try:
+            _limit_engine_threads()
+            api.SetPageSegMode(psm)
+            _set_image(api, image)
+            api.Recognize()
+            result = read(api)
+        except BaseException:
+            # An engine that failed mid-recognition is not trusted with the next page.
+            self._discard(api)
+            raise
+        self._checkin(key, api)
+        return result
+
+    def image_to_data(self, image: Any, config: str = "", lang: str = "eng") -> dict[str, list[Any]]:
+        data = self._run(image, config, lang, lambda api: _parse_tsv(api.GetTSVText(0)))
+        if data is not None:
+            return data
+        threads = _child_thread_limit()
+        if threads is not None:
+            return _parse_tsv(_tesseract_cli(image, lang, config, threads, "tsv"))
+        return pytesseract.image_to_data(image, lang=lang, config=config, output_type=pytesseract.Output.DICT)
+
+    def image_to_string(self, image: Any, config: str = "", lang: str = "eng") -> str:
+        text = self._run(image, config, lang, lambda api: api.GetUTF8Text())
+        if text is not None:
+            return text
+        threads = _child_thread_limit()
+        if threads is not None:
+            return _tesseract_cli(image, lang, config, threads)
+        return pytesseract.image_to_string(image, lang=lang, config=config)
+
+    def close(self) -> None:
+        with self._cond:
+            engines = [api for idle in self._idle.values() for api in idle]
+            self._idle.clear()
+            self._engines -= len(engines)
+        for api in engines:
+            api.End()
+
+
+TESSERACT = TesseractPool()
+
+
+@dataclass
+class OcrPass:
+    text: str
+    words: int
+    mean_confidence: float
+    # Confidence-weighted character count; the best pass is the one with the highest score.
+    score: float
+
+
+def _text_from_data(data: dict[str, list[Any]]) -> tuple[str, list[tuple[str, float]]]:
+    # Rebuilds `image_to_string`-style text (lines within a paragraph, blank line between
+    # paragraphs) from `image_to_data` rows, and collects the recognised words with confidences.
+    paragraphs: dict[tuple[int, int], dict[int, list[str]]] = {}
+    words: list[tuple[str, float]] = []
+    for index, word in enumerate(data.get("text", [])):
+        word = (word or "").strip()
+        confidence = float(data["conf"][index])
+        if not word or confidence < 0:
+            continue
+        paragraph = (int(data["block_num"][index]), int(data["par_num"][index]))
+        paragraphs.setdefault(paragraph, {}).setdefault(int(data["line_num"][index]), []).append(word)
+        words.append((word, confidence))
+    text = "\n\n".join(
+        "\n".join(" ".join(line) for line in lines.values()) for lines in paragraphs.values()
+    )
+    return text, words
+
+
+def image_to_text(image: Any, config: str = "", lang: str = "eng") -> str:
+    return TESSERACT.image_to_string(image, config=config, lang=lang)
+
+
+def run_pass(image: Any, config: str, lang: str = "eng") -> OcrPass:
+    text, words = _text_from_data(TESSERACT.image_to_data(image, config=config, lang=lang))
+    if not words:
+        return OcrPass(text="", words=0, mean_confidence=0.0, score=0.0)
+    return OcrPass(
+        text=text,
+        words=len(words),
+        mean_confidence=sum(confidence for _, confidence in words) / len(words),
+        score=sum(len(word) * confidence for word, confidence in words) / 100.0,
+    )
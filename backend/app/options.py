@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from typing import Any
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def parse_options_json(raw: str | None) -> dict[str, Any]:
+    if not raw:
+        return {}
+    try:
+        parsed = json.loads(raw)
+    except Exception:
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+
+def get_max_pages(options: dict[str, Any] | None) -> int | None:
+    if not options:
+        return None
+    raw = options.get("maxPages")
+    if not isinstance(raw, int):
+        return None
+    if raw <= 0:
+        return None
+    return raw
+
+
+def max_batch_size() -> int:
+    return max(1, _env_int("MAX_BATCH_SIZE", 16))
+
+
+def get_batch_size(options: dict[str, Any] | None, default: int) -> int:
+    # `batchSize`: pages per engine call for converters that batch inference. Capped at
+    # MAX_BATCH_SIZE, since a batch's rasters and activations are all held at once.
+    raw = (options or {}).get("batchSize")
+    if isinstance(raw, int) and not isinstance(raw, bool) and raw > 0:
+        return min(raw, max_batch_size())
+    return min(max(1, default), max_batch_size())
+
+
+def apply_common_options(markdown: str, options: dict[str, Any] | None) -> str:
+    if not options:
+        return markdown
+
+    result = markdown
+
+    preserve_tables = options.get("preserveTables")
+    if preserve_tables is False:
+        # Remove simple markdown tables.
+        result = re.sub(r"(?:^\|.*\|\n)+", "", result, flags=re.MULTILINE)
+
+    preserve_equations = options.get("preserveEquations")
+    if preserve_equations is False:
+        result = re.sub(r"\$\$.*?\$\$", "[Equation removed]", result, flags=re.DOTALL)
+        result = re.sub(r"\$[^\$]+\$", "[Inline equation removed]", result)
+
+    quality = options.get("qualityLevel")
+    if isinstance(quality, (int, float)) and quality < 45:
+        # Simulate low quality mode requested by frontend.
+        result = re.sub(r"\b([A-Za-z]{8,})\b", lambda m: m.group(1)[:-1] + "?", result)
+
+    return result
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Optional
+
+import fitz
+
+from .progress import count_detail
+from .result_cache import ResultCache, build_result_cache
+
+# Bump when page fingerprinting changes so old entries stop matching.
+PAGE_FINGERPRINT_VERSION = "2"
+
+_REFERENCE = re.compile(r"(\d+)\s+\d+\s+R")
+
+_page_cache: Optional[ResultCache] = None
+_page_cache_built = False
+_page_cache_lock = threading.Lock()
+_bypass = threading.local()
+
+
+def get_page_cache() -> Optional[ResultCache]:
+    global _page_cache, _page_cache_built
+    with _page_cache_lock:
+        if not _page_cache_built:
+            _page_cache = build_result_cache(
+                backend_env="PAGE_CACHE_BACKEND",
+                path_env="PAGE_CACHE_PATH",
+                max_mb_env="PAGE_CACHE_MAX_MB",
+                name="pages",
+            )
+            _page_cache_built = True
+    return _page_cache
+
+
+@contextmanager
+def page_cache_bypassed() -> Iterator[None]:
+    # Conversions on this thread neither read nor write the page cache (e.g. warm-up pages,
+    # which would only leave junk entries behind).
+    previous = getattr(_bypass, "active", False)
+    _bypass.active = True
+    try:
+        yield
+    finally:
+        _bypass.active = previous
+
+
+def _stream_digest(doc: fitz.Document, xref: int, digests: dict[str, bytes], font: bool = False) -> bytes:
+    # Digest of an image/form/appearance stream, or of an embedded font program, memoized per
+    # document since many pages share the same fonts and forms.
+    key = f"{'font' if font else 'stream'}:{xref}"
+    if key not in digests:
+        try:
+            data = doc.extract_font(xref)[3] if font else doc.xref_stream_raw(xref)
+        except Exception:
+            data = b""
+        digests[key] = hashlib.sha256(data or b"").digest()
+    return digests[key]
+
+
+def page_fingerprint(doc: fitz.Document, page_index: int, digests: Optional[dict[str, bytes]] = None) -> str:
+    # Content stream plus the bytes of every image/form it draws, the programs of the fonts it
+    # uses and the appearance streams of its annotations (all of which are rendered and OCR'd).
+    # Xref numbers are left out on purpose: they shift when an editor rewrites the file even
+    # though the page itself is unchanged.
+    digests = {} if digests is None else digests
+    page = doc.load_page(page_index)
+    digest = hashlib.sha256(PAGE_FINGERPRINT_VERSION.encode("ascii"))
+    digest.update(f"{tuple(page.rect)}|{page.rotation}".encode("ascii"))
+    digest.update(page.read_contents() or b"")
+
+    xrefs = {int(item[0]) for item in page.get_images(full=True)}
+    xrefs.update(int(item[0]) for item in page.get_xobjects())
+    for xref in sorted(xrefs):
+        digest.update(_stream_digest(doc, xref, digests))
+    for font in page.get_fonts(full=True):
+        digest.update(repr(font[1:5]).encode("utf-8", "replace"))
+        digest.update(_stream_digest(doc, int(font[0]), digests, font=True))
+    for xref, annot_type, _ in page.annot_xrefs():
+        state = [doc.xref_get_key(xref, key)[1] for key in ("Rect", "F", "AS")]
+        digest.update(repr((annot_type, state)).encode("utf-8", "replace"))
+        # The normal appearance: one stream, or one per state (check boxes, radio buttons).
+        _, appearance = doc.xref_get_key(xref, "AP/N")
+        for ref in _REFERENCE.findall(appearance):
+            digest.update(_stream_digest(doc, int(ref), digests))
+    return digest.hexdigest()
+
+
+class PageMemo:
+    """Maps page fingerprints to the Markdown body an engine produced for that page.
+
+    `engine` and `variant` identify the converter and any setting that changes its output
+    (DPI, languages, model id), so a different engine never reuses another one's text.
+    """
+
+    def __init__(self, cache: Optional[ResultCache], pdf_path: str, engine: str, variant: str = ""):
+        self.cache = cache
+        self.pdf_path = pdf_path
+        self.namespace = f"{engine}|{variant}"
+        self.hits = 0
+        self._doc: Optional[fitz.Document] = None
+        self._keys: dict[int, str] = {}
+        self._digests: dict[str, bytes] = {}
+        self._found: dict[int, str] = {}
+        self._missed: set[int] = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.cache is not None
+
+    def _key(self, page_number: int) -> Optional[str]:
+        if self.cache is None:
+            return None
+        key = self._keys.get(page_number)
+        if key is not None:
+            return key
+        try:
+            if self._doc is None:
+                self._doc = fitz.open(self.pdf_path)
+            fingerprint = page_fingerprint(self._doc, page_number - 1, self._digests)
+        except Exception:
+            return None
+        key = hashlib.sha256(f"{self.namespace}|{fingerprint}".encode("utf-8")).hexdigest()
+        self._keys[page_number] = key
+        return key
+
+    def missing(self, page_numbers: Iterable[int]) -> list[int]:
+        # Looks every page up front so callers only render the pages that still need an engine.
+        # The answer is final: later `lookup` calls return the cached text for hits and None for
+        # misses, even if a concurrent request has stored the page since, because the missed
+        # pages are already queued for rendering and must be taken from the renderer.
+        misses: list[int] = []
+        for page_number in page_numbers:
+            text = self.lookup(page_number)
+            if text is None:
+                misses.append(page_number)
+                self._missed.add(page_number)
+            else:
+                self._found[page_number] = text
+        return misses
+
+    def lookup(self, page_number: int) -> Optional[str]:
+        if page_number in self._found:
+            return self._found[page_number]
+        if page_number in self._missed:
+            return None
+        key = self._key(page_number)
+        if key is None or self.cache is None:
+            return None
+        payload = self.cache.get(key)
+        text = payload.get("markdown") if payload else None
+        if not isinstance(text, str):
+            return None
+        self.hits += 1
+        count_detail("pages_from_cache")
+        return text
+
+    def store(self, page_number: int, text: str) -> None:
+        key = self._key(page_number)
+        if key is None or self.cache is None:
+            return
+        self.cache.put(key, {"markdown": text})
+
+    def close(self) -> None:
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+
+    def __enter__(self) -> "PageMemo":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def page_memo(pdf_path: str, engine: str, variant: str = "") -> PageMemo:
+    cache = None if getattr(_bypass, "active", False) else get_page_cache()
+    return PageMemo(cache, pdf_path, engine, variant)
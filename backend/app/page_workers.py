@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
+
+from .progress import bind_scopes, record_stage
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_budget = threading.local()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def default_page_workers() -> int:
+    return max(1, _env_int("OCR_PAGE_WORKERS", os.cpu_count() or 1))
+
+
+def page_workers(options: Optional[dict[str, Any]] = None) -> int:
+    # `ocrWorkers` in the request options can lower the server's OCR_PAGE_WORKERS, not raise it.
+    workers = default_page_workers()
+    raw = (options or {}).get("ocrWorkers")
+    if isinstance(raw, int) and not isinstance(raw, bool) and raw > 0:
+        workers = min(workers, raw)
+    return workers
+
+
+def threads_per_worker(workers: int) -> int:
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def thread_budget() -> Optional[int]:
+    # Threads the calling page worker's engine may start (its share of the cores), or None
+    # outside `map_pages` workers. Engines apply it per call, e.g. the Tesseract pool.
+    return getattr(_budget, "threads", None)
+
+
+def cpu_slice(index: int, count: int) -> Optional[set[int]]:
+    # The `index`-th of `count` disjoint slices of the CPUs this process may run on, or None
+    # when there are fewer CPUs than slices or the platform has no affinity API (non-Linux).
+    if count <= 1 or not hasattr(os, "sched_getaffinity"):
+        return None
+    cpus = sorted(os.sched_getaffinity(0))
+    if len(cpus) < count:
+        return None
+    per_slice = len(cpus) // count
+    end = len(cpus) if index == count - 1 else (index + 1) * per_slice
+    return set(cpus[index * per_slice : end])
+
+
+@contextmanager
+def pinned(cpus: Optional[set[int]]) -> Iterator[None]:
+    # Restricts the calling thread (and the OpenMP threads it starts) to `cpus` for the block.
+    if not cpus:
+        yield
+        return
+    try:
+        previous = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, cpus)
+    except OSError:
+        yield
+        return
+    try:
+        yield
+    finally:
+        os.sched_setaffinity(0, previous)
+
+
+def memo_jobs(
+    page_numbers: Iterable[int], memo: Any, images: Any, until: Optional[Callable[[], Optional[float]]] = None
+) -> Iterator[tuple[int, Optional[str], Any]]:
+    # (page, cached text, None) for page-cache hits and (page, None, raster) for the pages an
+    # engine still has to read, taking each raster from `images` (a `PageImages`) in order.
+    # With `until` (returning a `time.monotonic()` deadline, or None while the clock has not
+    # started) the jobs stop at the first page that still needs the engine once it has passed.
+    for page_number in page_numbers:
+        cached = memo.lookup(page_number)
+        deadline = until() if cached is None and until is not None else None
+        if deadline is not None and time.monotonic() >= deadline:
+            return
+        yield page_number, cached, images.take(page_number) if cached is None else None
+
+
+def batches(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    # Lazily groups `items` into lists of up to `size`, so only one batch is held at a time.
+    batch: list[T] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class _Failure:
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+_DONE = object()
+
+
+def default_pipeline_depth() -> int:
+    return _env_int("PAGE_PIPELINE_DEPTH", 2)
+
+
+def pipelined(fn: Callable[[T], R], items: Iterable[T], depth: Optional[int] = None) -> Iterator[R]:
+    """Yields `fn(item)` for every item, in order, computing them on a separate stage thread.
+
+    This is the OCR stage of a render -> OCR -> assemble pipeline: `items` (typically pulling
+    from a prefetching `PageImages`) and `fn` run on the stage thread, at most `depth` results
+    (default `PAGE_PIPELINE_DEPTH`) ahead of the caller, so the engine works on page N+1 while
+    the caller stores, formats and streams page N. `depth=0` runs everything inline. Exceptions
+    are re-raised at the page that failed. Busy/idle times of the OCR and assemble stages are
+    recorded with `record_stage`. Close the generator (e.g. with `contextlib.closing`) before
+    releasing anything `fn` uses.
+    """
+    depth = default_pipeline_depth() if depth is None else max(0, depth)
+    if depth == 0:
+        yield from map(fn, items)
+        return
+    results: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    ocr = [0.0, 0.0]  # busy, idle (waiting for a page or for room in the queue)
+
+    def put(entry: Any) -> bool:
+        while not stop.is_set():
+            try:
+                results.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def work() -> None:
+        source = iter(items)
+        try:
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    item = next(source)
+                except StopIteration:
+                    break
+                ready = time.perf_counter()
+                result = fn(item)
+                done = time.perf_counter()
+                ocr[0] += done - ready
+                if not put((result,)):
+                    return
+                ocr[1] += (ready - started) + (time.perf_counter() - done)
+            put(_DONE)
+        except BaseException as exc:
+            put(_Failure(exc))
+        finally:
+            close = getattr(source, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=bind_scopes(work), name="page-ocr", daemon=True)
+    thread.start()
+    busy = idle = 0.0
+    try:
+        while True:
+            started = time.perf_counter()
+            entry = results.get()
+            received = time.perf_counter()
+            idle += received - started
+            if entry is _DONE:
+                break
+            if isinstance(entry, _Failure):
+                raise entry.exc
+            yield entry[0]
+            busy += time.perf_counter() - received
+    finally:
+        stop.set()
+        thread.join()
+        record_stage("ocr", ocr[0], ocr[1])
+        record_stage("assemble", busy, idle)
+
+
+def map_pages(fn: Callable[[T], R], items: Iterable[T], workers: int) -> Iterator[R]:
+    """Yields `fn(item)` for every item, in order, running up to `workers` calls at once.
+
+    `items` is consumed on the calling thread, at most `2 x workers` ahead of the results
+    handed back, so page rasters and PyMuPDF calls stay on the converter's thread and memory
+    stays bounded; only `fn` runs on the worker threads, under the caller's progress and
+    details scopes and with a `thread_budget()` of cores / workers. With one worker this is
+    `pipelined`, where `items` and `fn` share a single OCR stage thread. Close the generator
+    before releasing anything `items` or `fn` use.
+    """
+    if workers <= 1:
+        yield from pipelined(fn, items)
+        return
+    lock = threading.Lock()
+    ocr_busy = [0.0]
+    threads = threads_per_worker(workers)
+
+    def timed(item: T) -> R:
+        started = time.perf_counter()
+        _budget.threads = threads
+        try:
+            return fn(item)
+        finally:
+            _budget.threads = None
+            with lock:
+                ocr_busy[0] += time.perf_counter() - started
+
+    bound = bind_scopes(timed)
+    pending: deque[Future] = deque()
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr-page")
+    started = time.perf_counter()
+    busy = idle = 0.0
+    try:
+        for item in items:
+            pending.append(pool.submit(bound, item))
+            if len(pending) >= workers * 2:
+                waited = time.perf_counter()
+                result = pending.popleft().result()
+                received = time.perf_counter()
+                idle += received - waited
+                yield result
+                busy += time.perf_counter() - received
+        while pending:
+            waited = time.perf_counter()
+            result = pending.popleft().result()
+            received = time.perf_counter()
+            idle += received - waited
+            yield result
+            busy += time.perf_counter() - received
+    finally:
+        # Reached early when the consumer stops reading (e.g. a cancelled stream).
+        pool.shutdown(wait=True, cancel_futures=True)
+        elapsed = time.perf_counter() - started
+        # Summed over the workers: idle is their combined capacity the pages did not use.
+        record_stage("ocr", ocr_busy[0], max(0.0, workers * elapsed - ocr_busy[0]))
+        record_stage("assemble", busy, idle)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    import cv2
+except Exception:  # pragma: no cover
+    cv2 = None
+
+
+def autocontrast_lut(gray: np.ndarray) -> np.ndarray:
+    # Same mapping as PIL's `ImageOps.autocontrast(cutoff=0)`: stretch [darkest, lightest] to [0, 255].
+    # With no cutoff that range is just min..max, so no histogram is needed.
+    if gray.size == 0:
+        return np.arange(256, dtype=np.uint8)
+    lo, hi = int(gray.min()), int(gray.max())
+    if hi <= lo:
+        return np.arange(256, dtype=np.uint8)
+    scale = 255.0 / (hi - lo)
+    return np.clip(np.trunc(np.arange(256) * scale - lo * scale), 0, 255).astype(np.uint8)
+
+
+def upscale(gray: np.ndarray, factor: int) -> np.ndarray:
+    # Always returns a new array, so callers may modify the result in place.
+    if factor == 1:
+        return gray.copy()
+    size = (gray.shape[1] * factor, gray.shape[0] * factor)
+    if cv2 is not None:
+        return cv2.resize(gray, size, interpolation=cv2.INTER_CUBIC)
+    from PIL import Image
+
+    resampling = getattr(Image, "Resampling", Image)
+    return np.array(Image.fromarray(gray).resize(size, resampling.BICUBIC))
+
+
+def binarize(gray: np.ndarray, threshold: int = 185, factor: int = 2) -> np.ndarray:
+    """Autocontrast, optional `factor`x bicubic upscale and a fixed threshold, for Tesseract.
+
+    Takes an (H, W) uint8 page and returns a new array of 0/255 values; the input is left
+    untouched, since page rasters are shared through the raster cache. Autocontrast is a
+    monotonic lookup table, so autocontrast-then-threshold is a single threshold on the source
+    levels: the page is upscaled once and thresholded in place, with no intermediate images.
+    """
+    lut = autocontrast_lut(gray)
+    level = int(np.searchsorted(lut, threshold))
+    out = upscale(gray, factor)
+    # 0/1 written through a bool view of the same buffer, then scaled to 0/255 in place.
+    np.greater_equal(out, level, out=out.view(np.bool_))
+    np.multiply(out, 255, out=out)
+    return out
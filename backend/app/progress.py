@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+_state = threading.local()
+# Page-parallel converters record details from several threads into the same dict.
+_details_lock = threading.Lock()
+
+
+@contextmanager
+def progress_scope(callback: Optional[ProgressCallback]) -> Iterator[None]:
+    # Conversions run start-to-finish on one worker thread, so a thread-local hook lets
+    # converters report page progress without threading a callback through every signature.
+    previous = getattr(_state, "callback", None)
+    _state.callback = callback
+    try:
+        yield
+    finally:
+        _state.callback = previous
+
+
+def report_progress(pages_done: int, pages_total: Optional[int] = None) -> None:
+    callback = getattr(_state, "callback", None)
+    if callback is None:
+        return
+    try:
+        callback(pages_done, pages_total)
+    except Exception:
+        pass
+
+
+@contextmanager
+def details_scope() -> Iterator[dict[str, Any]]:
+    # Collects extra execution metadata (cache hits, OCR passes, ...) recorded anywhere in the
+    # converter stack, including fallback converters, for the duration of one conversion.
+    previous = getattr(_state, "details", None)
+    details: dict[str, Any] = {}
+    _state.details = details
+    try:
+        yield details
+    finally:
+        _state.details = previous
+
+
+@contextmanager
+def run_scope() -> Iterator[dict[int, Any]]:
+    # Holds the converters' `last_run` metadata written during one conversion, keyed by
+    # converter, so concurrent conversions on the same converter each read back their own.
+    previous = getattr(_state, "runs", None)
+    runs: dict[int, Any] = {}
+    _state.runs = runs
+    try:
+        yield runs
+    finally:
+        _state.runs = previous
+
+
+def current_runs() -> Optional[dict[int, Any]]:
+    return getattr(_state, "runs", None)
+
+
+def record_detail(key: str, value: Any) -> None:
+    details = getattr(_state, "details", None)
+    if details is not None:
+        details[key] = value
+
+
+def count_detail(key: str, amount: int = 1) -> None:
+    details = getattr(_state, "details", None)
+    if details is not None:
+        with _details_lock:
+            details[key] = int(details.get(key, 0)) + amount
+
+
+def tally_detail(key: str, label: str, amount: int = 1) -> None:
+    # Per-label counts under one key, e.g. {"ocr_config": {"gray --oem 3 --psm 6": 12}}.
+    details = getattr(_state, "details", None)
+    if details is not None:
+        with _details_lock:
+            tally = details.setdefault(key, {})
+            tally[label] = int(tally.get(label, 0)) + amount
+
+
+def record_stage(stage: str, busy_s: float, idle_s: float) -> None:
+    # Busy/idle wall time of one pipeline stage (render, ocr, assemble), summed over the
+    # conversion: the stage with the most busy and least idle time limits throughput.
+    tally_detail("stage_ms", f"{stage}_busy", int(round(busy_s * 1000)))
+    tally_detail("stage_ms", f"{stage}_idle", int(round(idle_s * 1000)))
+
+
+def bind_scopes(fn: Callable[..., Any]) -> Callable[..., Any]:
+    # Wraps `fn` to run under the calling thread's progress hook, details dict and run
+    # metadata, for work a converter hands to its own worker threads.
+    scopes = (getattr(_state, "callback", None), getattr(_state, "details", None), getattr(_state, "runs", None))
+
+    def bound(*args: Any, **kwargs: Any) -> Any:
+        previous = (getattr(_state, "callback", None), getattr(_state, "details", None), getattr(_state, "runs", None))
+        _state.callback, _state.details, _state.runs = scopes
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _state.callback, _state.details, _state.runs = previous
+
+    return bound
@@ -4,12 +4,12 @@ from dataclasses import dataclass
 from typing import Any, Callable, Optional, Protocol
 
 from ..adapters.base import ModelAdapter
-from ..models.base import ModelDefinition
+from ..model_loader import LocalModel
 
 
 @dataclass
 class BuildContext:
-    local_models: dict[str, ModelDefinition]
+    local_models: dict[str, LocalModel]
     resolve_adapter: Callable[[str], Optional[ModelAdapter]]
 
 
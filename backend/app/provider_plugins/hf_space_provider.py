@@ -32,6 +32,26 @@ class HfSpaceProviderPlugin:
         ):
             raise ValueError(f"hf_space entry `{model_id}` has invalid `supports_options` (must be list[str])")
 
+        max_concurrency = entry.get("max_concurrency")
+        if max_concurrency is not None and (
+            not isinstance(max_concurrency, int) or isinstance(max_concurrency, bool) or max_concurrency < 1
+        ):
+            raise ValueError(f"hf_space entry `{model_id}` has invalid `max_concurrency` (must be positive int)")
+
+        health_ttl_seconds = entry.get("health_ttl_seconds")
+        if health_ttl_seconds is not None and (
+            not isinstance(health_ttl_seconds, int) or isinstance(health_ttl_seconds, bool) or health_ttl_seconds < 1
+        ):
+            raise ValueError(f"hf_space entry `{model_id}` has invalid `health_ttl_seconds` (must be positive int)")
+
+        warm = entry.get("warm")
+        if warm is not None and not isinstance(warm, bool):
+            raise ValueError(f"hf_space entry `{model_id}` has invalid `warm` (must be bool)")
+
+        version = entry.get("version")
+        if version is not None and not isinstance(version, (str, int)):
+            raise ValueError(f"hf_space entry `{model_id}` has invalid `version` (must be string or int)")
+
     def build(self, entry: dict[str, Any], context: BuildContext) -> Optional[HfSpaceAdapter]:
         fallback_id = entry.get("fallback_model")
         fallback_adapter = context.resolve_adapter(fallback_id) if isinstance(fallback_id, str) else None
@@ -53,6 +73,10 @@ class HfSpaceProviderPlugin:
         adapter.info.supports_options = list(entry.get("supports_options", []))
         adapter.info.latency_hint = entry.get("latency_hint")
         adapter.info.cost_hint = entry.get("cost_hint")
+        adapter.info.max_concurrency = entry.get("max_concurrency")
+        adapter.info.version = str(entry.get("version", adapter.info.version))
+        adapter.info.health_ttl_seconds = entry.get("health_ttl_seconds")
+        adapter.info.warm = bool(entry.get("warm", False))
         return adapter
 
 
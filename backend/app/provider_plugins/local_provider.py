@@ -24,6 +24,26 @@ class LocalProviderPlugin:
         ):
             raise ValueError("local provider field `supports_options` must be a list of strings")
 
+        max_concurrency = entry.get("max_concurrency")
+        if max_concurrency is not None and (
+            not isinstance(max_concurrency, int) or isinstance(max_concurrency, bool) or max_concurrency < 1
+        ):
+            raise ValueError("local provider field `max_concurrency` must be a positive integer")
+
+        health_ttl_seconds = entry.get("health_ttl_seconds")
+        if health_ttl_seconds is not None and (
+            not isinstance(health_ttl_seconds, int) or isinstance(health_ttl_seconds, bool) or health_ttl_seconds < 1
+        ):
+            raise ValueError("local provider field `health_ttl_seconds` must be a positive integer")
+
+        warm = entry.get("warm")
+        if warm is not None and not isinstance(warm, bool):
+            raise ValueError("local provider field `warm` must be a boolean")
+
+        version = entry.get("version")
+        if version is not None and not isinstance(version, (str, int)):
+            raise ValueError("local provider field `version` must be a string or integer")
+
     def build(self, entry: dict[str, Any], context: BuildContext) -> Optional[LocalModelAdapter]:
         model_key = entry.get("local_model") or entry.get("id")
         model = context.local_models.get(model_key)
@@ -34,6 +54,10 @@ class LocalProviderPlugin:
         adapter.info.supports_options = list(entry.get("supports_options", []))
         adapter.info.latency_hint = entry.get("latency_hint")
         adapter.info.cost_hint = entry.get("cost_hint")
+        adapter.info.max_concurrency = entry.get("max_concurrency")
+        adapter.info.version = str(entry.get("version", adapter.info.version))
+        adapter.info.health_ttl_seconds = entry.get("health_ttl_seconds")
+        adapter.info.warm = bool(entry.get("warm", False))
         return adapter
 
 
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+    from PIL import Image
+
+    Raster = Image.Image | np.ndarray
+
+_MB = 1024 * 1024
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def _image_bytes(image: Raster) -> int:
+    nbytes = getattr(image, "nbytes", None)
+    if nbytes is not None:
+        return int(nbytes)
+    return image.width * image.height * len(image.getbands())
+
+
+class RasterCache:
+    """Page rasters rendered during one request, keyed by (pdf, page, dpi, colorspace).
+
+    A `/convert` call can rasterize the same page in the adapter, in the OCR fallback and again in
+    chart extraction; sharing one cache across those steps renders each page once. A request for
+    a lower DPI than a cached render is served by downsampling that render. Cached images are
+    shared between callers and must not be modified in place. Least recently used renders are
+    dropped once `RASTER_CACHE_MAX_MB` is exceeded.
+    """
+
+    def __init__(self, max_mb: Optional[float] = None):
+        limit = _env_float("RASTER_CACHE_MAX_MB", 256) if max_mb is None else max_mb
+        self.max_bytes = int(limit * _MB)
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, int, int, str], Raster] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def has(self, pdf_path: str, page_number: int, dpi: int, colorspace: str = "rgb") -> bool:
+        # True when `get` could serve the page, either directly or by downsampling.
+        with self._lock:
+            return any(
+                path == pdf_path and page == page_number and cached_dpi >= dpi and space == colorspace
+                for path, page, cached_dpi, space in self._entries
+            )
+
+    def get(self, pdf_path: str, page_number: int, dpi: int, colorspace: str = "rgb") -> Optional[Raster]:
+        key = (pdf_path, page_number, dpi, colorspace)
+        with self._lock:
+            image = self._entries.get(key)
+            if image is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return image
+            sources = [
+                (cached_dpi, cached)
+                for (path, page, cached_dpi, space), cached in self._entries.items()
+                if path == pdf_path and page == page_number and cached_dpi > dpi and space == colorspace
+            ]
+            if not sources:
+                self.misses += 1
+                return None
+            self.hits += 1
+        from PIL import Image
+
+        source_dpi, source = min(sources, key=lambda item: item[0])
+        if not isinstance(source, Image.Image):
+            source = Image.fromarray(source)
+        scale = dpi / source_dpi
+        resampling = getattr(Image, "Resampling", Image)
+        image = source.resize(
+            (max(1, round(source.width * scale)), max(1, round(source.height * scale))), resampling.LANCZOS
+        )
+        self.put(pdf_path, page_number, dpi, image, colorspace)
+        return image
+
+    def put(self, pdf_path: str, page_number: int, dpi: int, image: Raster, colorspace: str = "rgb") -> None:
+        size = _image_bytes(image)
+        if size > self.max_bytes:
+            return
+        key = (pdf_path, page_number, dpi, colorspace)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= _image_bytes(previous)
+            self._entries[key] = image
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                # First pages go last: chart extraction reads page 1 after the conversion is done.
+                victim = next((k for k in self._entries if k[1] != 1), next(iter(self._entries)))
+                self._bytes -= _image_bytes(self._entries.pop(victim))
+
+
+_state = threading.local()
+
+
+@contextmanager
+def raster_scope(cache: Optional[RasterCache]) -> Iterator[None]:
+    # Like `progress_scope`: every `PageImages` created on this thread during the block shares `cache`.
+    previous = getattr(_state, "cache", None)
+    _state.cache = cache
+    try:
+        yield
+    finally:
+        _state.cache = previous
+
+
+def current_raster_cache() -> Optional[RasterCache]:
+    return getattr(_state, "cache", None)
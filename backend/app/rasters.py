@@ -0,0 +1,462 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Iterable, Iterator, Optional, Union
+
+import fitz
+import numpy as np
+from PIL import Image
+
+from .dpi_planner import PLANNER_VERSION, adaptive_dpi_enabled, plan_dpi
+from .progress import record_stage
+from .raster_cache import current_raster_cache
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def default_prefetch() -> int:
+    return _env_int("RASTER_PREFETCH", 2)
+
+
+def default_workers() -> int:
+    return _env_int("RASTER_WORKERS", min(4, os.cpu_count() or 1))
+
+
+def default_shard_pages() -> int:
+    return max(1, _env_int("RASTER_SHARD_PAGES", 2))
+
+
+def dpi_tag(dpi: int, adaptive: Optional[bool] = None) -> str:
+    # Page-cache variant fragment: with adaptive DPI the render also depends on the planner.
+    adaptive = adaptive_dpi_enabled() if adaptive is None else adaptive
+    return f"dpi=auto{PLANNER_VERSION}:{dpi}" if adaptive else f"dpi={dpi}"
+
+
+# What `PageImages` hands out: a PIL image ("pil"), or a uint8 NumPy array of shape (H, W, 3)
+# ("rgb") or (H, W) ("gray") for engines that take arrays.
+LAYOUTS = ("pil", "rgb", "gray")
+Raster = Union[Image.Image, np.ndarray]
+
+
+def _colorspace(layout: str) -> str:
+    if layout not in LAYOUTS:
+        raise ValueError(f"unknown raster layout '{layout}' (expected one of {', '.join(LAYOUTS)})")
+    return "gray" if layout == "gray" else "rgb"
+
+
+class _PixmapSamples:
+    # Exposes a pixmap's sample buffer through the array interface. Arrays built from it are plain
+    # `np.ndarray`s (engines such as easyocr reject subclasses) whose base is this object, so any
+    # view of them keeps the pixmap, and with it the buffer, alive.
+    def __init__(self, pix: fitz.Pixmap):
+        self.pixmap = pix
+        samples = np.frombuffer(pix.samples_mv, dtype=np.uint8)
+        self.__array_interface__ = dict(samples.__array_interface__, shape=(pix.height, pix.width, pix.n))
+
+
+def pixmap_array(pix: fitz.Pixmap) -> np.ndarray:
+    # Zero-copy: (H, W, n) for colour pixmaps, (H, W) for grayscale ones.
+    array = np.asarray(_PixmapSamples(pix))
+    return array[:, :, 0] if pix.n == 1 else array
+
+
+def _pixmap(doc: fitz.Document, page_number: int, dpi: int, colorspace: str = "rgb") -> fitz.Pixmap:
+    zoom = max(dpi / 72.0, 1.0)
+    return doc.load_page(page_number - 1).get_pixmap(
+        matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY if colorspace == "gray" else fitz.csRGB, alpha=False
+    )
+
+
+def render_page(doc: fitz.Document, page_number: int, dpi: int = 200, layout: str = "pil") -> Raster:
+    # Poppler-free page rasterization for packaged desktop builds.
+    pix = _pixmap(doc, page_number, dpi, _colorspace(layout))
+    if layout != "pil":
+        return pixmap_array(pix)
+    return Image.frombytes("RGB" if pix.n >= 3 else "L", [pix.width, pix.height], pix.samples)
+
+
+def as_layout(raster: Raster, layout: str) -> Raster:
+    # Converts a cached raster to the requested layout (a copy only when the layout differs).
+    if isinstance(raster, np.ndarray):
+        if layout == "pil":
+            return Image.fromarray(raster)
+        if layout == "gray" and raster.ndim == 3:
+            return np.asarray(Image.fromarray(raster).convert("L"))
+        if layout == "rgb" and raster.ndim == 2:
+            return np.stack([raster] * 3, axis=-1)
+        return raster
+    if layout == "pil":
+        return raster
+    return np.asarray(raster.convert("L" if layout == "gray" else "RGB"))
+
+
+# (page number, byte offset, width, height, channels) of one page inside a shard's shared-memory block.
+_ShardPage = tuple[int, int, int, int, int]
+
+
+def _render_shard(
+    pdf_path: str, pages: list[tuple[int, int]], colorspace: str
+) -> tuple[str, list[_ShardPage]]:
+    # Runs in a pool process with its own document handle, rendering (page number, dpi) pairs.
+    # The pixels come back through one shared-memory block per shard instead of being pickled;
+    # the parent unlinks it.
+    with fitz.open(pdf_path) as doc:
+        pixmaps = [(page_number, _pixmap(doc, page_number, dpi, colorspace)) for page_number, dpi in pages]
+    block = shared_memory.SharedMemory(create=True, size=max(1, sum(len(pix.samples_mv) for _, pix in pixmaps)))
+    try:
+        entries: list[_ShardPage] = []
+        offset = 0
+        for page_number, pix in pixmaps:
+            size = len(pix.samples_mv)
+            block.buf[offset : offset + size] = pix.samples_mv
+            entries.append((page_number, offset, pix.width, pix.height, pix.n))
+            offset += size
+    except BaseException:
+        block.close()
+        block.unlink()
+        raise
+    block.close()
+    return block.name, entries
+
+
+def _collect_shard(name: str, entries: list[_ShardPage], layout: str) -> dict[int, Raster]:
+    # One copy out of shared memory per page, straight into the requested layout.
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        rasters: dict[int, Raster] = {}
+        for page_number, offset, width, height, channels in entries:
+            samples = np.frombuffer(block.buf, dtype=np.uint8, count=width * height * channels, offset=offset)
+            if layout == "pil":
+                rasters[page_number] = Image.frombytes("RGB" if channels >= 3 else "L", (width, height), samples)
+            else:
+                shape = (height, width, channels) if channels > 1 else (height, width)
+                rasters[page_number] = samples.reshape(shape).copy()
+            del samples
+        return rasters
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _discard_shard(future: Future) -> None:
+    # Frees the shared memory of a shard nobody is going to read any more.
+    if future.cancelled() or future.exception() is not None:
+        return
+    name, _ = future.result()
+    try:
+        block = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    block.close()
+    block.unlink()
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_pool_broken = False
+
+
+def _render_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawned rather than forked: the server forks from a process full of live threads.
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _disable_render_pool(exc: BaseException) -> None:
+    # A pool whose workers die at start-up (e.g. a frozen build without freeze_support) would
+    # break again on every request, so render in-process for the rest of the process lifetime.
+    global _pool_broken
+    if not _pool_broken:
+        logger.warning("raster process pool failed, rendering in-process from now on: %s", exc)
+    _pool_broken = True
+    shutdown_render_pool()
+
+
+def shutdown_render_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+_DONE = object()
+
+
+class PageImages:
+    """Renders the given 1-based pages in order, one at a time, as the caller consumes them.
+
+    With `prefetch` > 0 a background thread renders up to that many pages ahead of the consumer
+    (so rasterization overlaps OCR) and then blocks; memory stays at O(prefetch) page images no
+    matter how long the document is. `prefetch=0` renders each page on demand in the caller's
+    thread. Pages found in the request's `RasterCache` (see `raster_scope`) are not rendered
+    again. Use as a context manager so an early exit stops the renderer.
+
+    When `RASTER_WORKERS` > 1 the prefetch thread shards the remaining pages into contiguous runs
+    of `RASTER_SHARD_PAGES` and renders them in a process pool, keeping at most one shard per
+    worker in flight; pages are still handed out in order.
+
+    `layout` picks what is handed out (see `LAYOUTS`). Array layouts are NumPy views over the
+    rendered pixmap, so engines that take arrays get the pixels without a PIL round trip. Treat
+    them as read-only: the same array may be shared through the raster cache.
+
+    With `adaptive` (default: `RASTER_ADAPTIVE_DPI`, on) `dpi` is the resolution the engine needs
+    for ordinary body text, and each page is rendered at the DPI `dpi_planner.plan_dpi` picks
+    from its measured text size; large-type pages render at a fraction of the pixels.
+    """
+
+    def __init__(
+        self,
+        pdf_path: str,
+        page_numbers: Iterable[int],
+        dpi: int = 200,
+        prefetch: Optional[int] = None,
+        layout: str = "pil",
+        adaptive: Optional[bool] = None,
+    ):
+        self.pdf_path = pdf_path
+        self.page_numbers = list(page_numbers)
+        self.dpi = dpi
+        self.adaptive = adaptive_dpi_enabled() if adaptive is None else adaptive
+        self._page_dpi: dict[int, int] = {}
+        self.layout = layout
+        self.colorspace = _colorspace(layout)
+        self.prefetch = default_prefetch() if prefetch is None else max(0, prefetch)
+        self._position = 0
+        self._doc: Optional[fitz.Document] = None
+        self._queue: Optional[queue.Queue] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Whoever finishes last of `close()` and the prefetch thread closes the document.
+        self._doc_lock = threading.Lock()
+        self._closed = False
+        self._producing = False
+        # Captured here because the prefetch thread does not see the caller's thread-local scope.
+        self._cache = current_raster_cache()
+        # Render stage timings, reported with `record_stage` on close.
+        self._busy = 0.0
+        self._idle = 0.0
+
+    def __len__(self) -> int:
+        return len(self.page_numbers)
+
+    def _start(self) -> None:
+        if self._thread is not None or self.prefetch == 0 or not self.page_numbers:
+            return
+        self._queue = queue.Queue(maxsize=self.prefetch)
+        self._producing = True
+        self._thread = threading.Thread(target=self._produce, name="page-prefetch", daemon=True)
+        self._thread.start()
+
+    def _put(self, item: Any) -> bool:
+        assert self._queue is not None
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _document(self) -> fitz.Document:
+        if self._doc is None:
+            self._doc = fitz.open(self.pdf_path)
+        return self._doc
+
+    def dpi_for(self, page_number: int) -> int:
+        if not self.adaptive:
+            return self.dpi
+        if page_number not in self._page_dpi:
+            try:
+                dpi = plan_dpi(self._document().load_page(page_number - 1), self.dpi)
+            except Exception as exc:
+                logger.warning("could not plan the DPI of page %s, using %s: %s", page_number, self.dpi, exc)
+                dpi = self.dpi
+            self._page_dpi[page_number] = dpi
+        return self._page_dpi[page_number]
+
+    def _render(self, page_number: int) -> Raster:
+        dpi = self.dpi_for(page_number)
+        if self._cache is not None:
+            cached = self._cache.get(self.pdf_path, page_number, dpi, self.colorspace)
+            if cached is not None:
+                return as_layout(cached, self.layout)
+        raster = render_page(self._document(), page_number, dpi, self.layout)
+        if self._cache is not None:
+            self._cache.put(self.pdf_path, page_number, dpi, raster, self.colorspace)
+        return raster
+
+    def _images(self) -> Iterator[Raster]:
+        workers = default_workers()
+        pending = [
+            page_number
+            for page_number in self.page_numbers
+            if self._cache is None
+            or not self._cache.has(self.pdf_path, page_number, self.dpi_for(page_number), self.colorspace)
+        ]
+        if workers < 2 or len(pending) < 2 or _pool_broken:
+            for page_number in self.page_numbers:
+                yield self._render(page_number)
+            return
+
+        size = default_shard_pages()
+        shards = deque(pending[start : start + size] for start in range(0, len(pending), size))
+        in_flight: deque[tuple[list[int], Optional[Future]]] = deque()
+        rendered: dict[int, Raster] = {}
+        pending_pages = set(pending)
+        try:
+            for page_number in self.page_numbers:
+                while shards and len(in_flight) < workers:
+                    shard = shards.popleft()
+                    try:
+                        future: Optional[Future] = _render_pool(workers).submit(
+                            _render_shard,
+                            self.pdf_path,
+                            [(page, self.dpi_for(page)) for page in shard],
+                            self.colorspace,
+                        )
+                    except RuntimeError:
+                        future = None
+                    in_flight.append((shard, future))
+                if page_number not in pending_pages:
+                    yield self._render(page_number)
+                    continue
+                while page_number not in rendered:
+                    shard, future = in_flight.popleft()
+                    rendered.update(self._shard_images(shard, future))
+                yield rendered.pop(page_number)
+        finally:
+            for _, future in in_flight:
+                if future is not None and not future.cancel():
+                    future.add_done_callback(_discard_shard)
+
+    def _shard_images(self, shard: list[int], future: Optional[Future]) -> dict[int, Raster]:
+        images: Optional[dict[int, Raster]] = None
+        if future is not None:
+            try:
+                images = _collect_shard(*future.result(), self.layout)
+            except BrokenProcessPool as exc:
+                _disable_render_pool(exc)
+            except Exception as exc:
+                logger.warning("parallel rendering of pages %s failed, rendering in-process: %s", shard, exc)
+        if images is None:
+            # Rendering locally also surfaces real document errors in the caller's thread.
+            return {page_number: self._render(page_number) for page_number in shard}
+        if self._cache is not None:
+            for page_number, image in images.items():
+                self._cache.put(self.pdf_path, page_number, self.dpi_for(page_number), image, self.colorspace)
+        return images
+
+    def _produce(self) -> None:
+        images = self._images()
+        try:
+            while True:
+                started = time.perf_counter()
+                image = next(images, _DONE)
+                rendered = time.perf_counter()
+                self._busy += rendered - started
+                if image is _DONE:
+                    break
+                if self._stop.is_set() or not self._put(image):
+                    return
+                # Time blocked on a full queue: the consumer is the slower stage.
+                self._idle += time.perf_counter() - rendered
+        except Exception as exc:
+            self._put(exc)
+            return
+        finally:
+            images.close()
+            with self._doc_lock:
+                self._producing = False
+                if self._closed:
+                    self._close_document()
+        self._put(_DONE)
+
+    def _next(self) -> Raster:
+        self._start()
+        page_number = self.page_numbers[self._position]
+        self._position += 1
+        if self._queue is None:
+            started = time.perf_counter()
+            try:
+                return self._render(page_number)
+            finally:
+                self._busy += time.perf_counter() - started
+        item = self._queue.get()
+        if isinstance(item, Exception):
+            raise item
+        if item is _DONE:
+            raise RuntimeError("page renderer stopped early")
+        return item
+
+    def take(self, page_number: int) -> Raster:
+        # Pages must be taken in the order they were requested.
+        expected = self.page_numbers[self._position] if self._position < len(self.page_numbers) else None
+        if page_number != expected:
+            raise ValueError(f"page {page_number} requested out of order (next is {expected})")
+        return self._next()
+
+    def __iter__(self) -> Iterator[tuple[int, Raster]]:
+        while self._position < len(self.page_numbers):
+            page_number = self.page_numbers[self._position]
+            yield page_number, self._next()
+
+    def _close_document(self) -> None:
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._busy or self._idle:
+            record_stage("render", self._busy, self._idle)
+            self._busy = self._idle = 0.0
+        with self._doc_lock:
+            self._closed = True
+            # A prefetch thread still rendering a large page closes the document when it exits.
+            if not self._producing:
+                self._close_document()
+
+    def __enter__(self) -> "PageImages":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def page_range(pdf_path: str, max_pages: Optional[int] = None, first_page: int = 1) -> tuple[list[int], int]:
+    # Returns the 1-based pages to process (honoring `max_pages`) and the document's page count.
+    with fitz.open(pdf_path) as doc:
+        total_pages = len(doc)
+    limit = min(total_pages, max_pages) if max_pages else total_pages
+    return list(range(max(1, first_page), limit + 1)), total_pages
+
+
+def render_pdf_page(
+    pdf_path: str, page_number: int, dpi: int = 200, layout: str = "pil", adaptive: Optional[bool] = None
+) -> Raster:
+    # Single-page convenience over `PageImages`, for callers that only need one page.
+    with PageImages(pdf_path, [page_number], dpi=dpi, prefetch=0, layout=layout, adaptive=adaptive) as images:
+        return images.take(page_number)
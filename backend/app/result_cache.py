@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached payload layout changes so old entries stop matching.
+CACHE_SCHEMA = "1"
+
+
+def default_cache_dir() -> Path:
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "pdftomarkdown"
+
+
+# Options that only change how a conversion runs (parallelism, batching), not its output.
+EXECUTION_ONLY_OPTIONS = frozenset({"ocrWorkers", "batchSize"})
+
+
+def normalize_options(options: dict[str, Any] | None) -> str:
+    output_options = {key: value for key, value in (options or {}).items() if key not in EXECUTION_ONLY_OPTIONS}
+    return json.dumps(output_options, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def make_cache_key(content_sha256: str, model_id: str, options: dict[str, Any] | None, adapter_version: str) -> str:
+    material = "\n".join([CACHE_SCHEMA, content_sha256, model_id, adapter_version, normalize_options(options)])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    def put(self, key: str, value: bytes) -> None:
+        ...
+
+
+class DirectoryCacheBackend:
+    """One file per entry under `root`; least recently read entries go first when over budget.
+
+    Recency is the file mtime (refreshed on every hit), so several server processes can
+    share the directory without any coordination beyond the filesystem.
+    """
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._approx_bytes = sum(size for _, size, _ in self._entries())
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.bin"
+
+    def _entries(self) -> list[tuple[Path, int, float]]:
+        entries: list[tuple[Path, int, float]] = []
+        for path in self.root.glob("*/*.bin"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path, None)
+            return data
+        except OSError:
+            return None
+
+    def put(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(value)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._approx_bytes += len(value)
+            if self._approx_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Rescan instead of trusting the running total: other processes may share the directory.
+        entries = sorted(self._entries(), key=lambda item: item[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                continue
+        self._approx_bytes = total
+
+
+class SqliteCacheBackend:
+    """Single-file store; WAL mode lets several server processes read and write it."""
+
+    def __init__(self, path: Path, max_bytes: int):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries(last_access)")
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            return bytes(row[0])
+
+    def put(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, sqlite3.Binary(value), len(value), time.time()),
+            )
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            while total > self.max_bytes:
+                row = self._conn.execute("SELECT key, size FROM entries ORDER BY last_access LIMIT 1").fetchone()
+                if row is None:
+                    break
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (row[0],))
+                total -= int(row[1])
+
+
+class ResultCache:
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        try:
+            raw = self.backend.get(key)
+        except Exception as exc:
+            logger.warning("result cache read failed: %s", exc)
+            return None
+        if raw is None:
+            return None
+        try:
+            payload = json.loads(raw.decode("utf-8"))
+        except Exception:
+            return None
+        return payload if isinstance(payload, dict) else None
+
+    def put(self, key: str, payload: dict[str, Any]) -> None:
+        try:
+            self.backend.put(key, json.dumps(payload).encode("utf-8"))
+        except Exception as exc:
+            logger.warning("result cache write failed: %s", exc)
+
+
+def build_result_cache(
+    backend_env: str = "RESULT_CACHE_BACKEND",
+    path_env: str = "RESULT_CACHE_PATH",
+    max_mb_env: str = "RESULT_CACHE_MAX_MB",
+    name: str = "results",
+) -> Optional[ResultCache]:
+    kind = os.getenv(backend_env, os.getenv("RESULT_CACHE_BACKEND", "directory")).strip().lower()
+    if kind in {"", "off", "none", "disabled"}:
+        return None
+
+    try:
+        max_bytes = int(float(os.getenv(max_mb_env, "512")) * 1024 * 1024)
+    except ValueError:
+        max_bytes = 512 * 1024 * 1024
+    location = os.getenv(path_env)
+
+    try:
+        if kind == "sqlite":
+            path = Path(location) if location else default_cache_dir() / f"{name}.sqlite3"
+            return ResultCache(SqliteCacheBackend(path, max_bytes))
+        if kind == "directory":
+            root = Path(location) if location else default_cache_dir() / name
+            return ResultCache(DirectoryCacheBackend(root, max_bytes))
+    except Exception as exc:
+        logger.warning("%s cache disabled (%s backend failed to open: %s)", name, kind, exc)
+        return None
+
+    raise ValueError(f"Unknown {backend_env} `{kind}` (expected directory, sqlite or off)")
@@ -0,0 +1,350 @@
+from __future__ import annotations
+
+import gc
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+_MB = 1024 * 1024
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def _rss_mb() -> Optional[float]:
+    try:
+        import psutil  # type: ignore
+
+        return psutil.Process().memory_info().rss / _MB
+    except Exception:
+        pass
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            resident_pages = int(handle.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / _MB
+    except Exception:
+        return None
+
+
+@dataclass
+class _Runtime:
+    name: str
+    owner: str
+    loader: Callable[[], Any]
+    estimate_mb: float
+    on_unload: Optional[Callable[[], None]] = None
+    value: Any = None
+    loaded: bool = False
+    in_use: int = 0
+    memory_mb: float = 0.0
+    peak_memory_mb: float = 0.0
+    loaded_at: Optional[float] = None
+    last_used: Optional[float] = None
+    evictions: int = 0
+    last_evicted_at: Optional[float] = None
+    last_eviction_reason: Optional[str] = None
+    load_lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class RuntimeLease:
+    """Pins a runtime for the duration of a `with` block; it is loaded on the first `get()`.
+
+    Converters open a lease around their page loop and only call `get()` when a page actually
+    needs the model, so fully cached documents never load it. A pinned runtime is never evicted.
+    """
+
+    def __init__(self, manager: "RuntimeManager", runtime: _Runtime):
+        self._manager = manager
+        self._runtime = runtime
+        self._value: Any = None
+        self._held = False
+
+    def get(self) -> Any:
+        if not self._held:
+            self._value = self._manager._acquire(self._runtime)
+            self._held = True
+        return self._value
+
+    def close(self) -> None:
+        if self._held:
+            self._held = False
+            self._value = None
+            self._manager._release(self._runtime)
+
+    def __enter__(self) -> "RuntimeLease":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class RuntimeHandle:
+    def __init__(self, manager: "RuntimeManager", runtime: _Runtime):
+        self._manager = manager
+        self._runtime = runtime
+
+    @property
+    def loaded(self) -> bool:
+        return self._runtime.loaded
+
+    def lease(self) -> RuntimeLease:
+        return RuntimeLease(self._manager, self._runtime)
+
+
+class RuntimePool:
+    """Interchangeable instances of one runtime (e.g. an OCR engine per slice of the CPUs).
+
+    Each instance is a separate runtime of the manager, so it is loaded on first use, counted
+    against the memory budget, evicted when idle and listed in `/models` on its own.
+    `checkout()` hands a free instance to one caller at a time, preferring loaded ones so the
+    pool only grows when callers actually overlap; callers wait while every instance is busy.
+    """
+
+    def __init__(self, handles: list[RuntimeHandle]):
+        self.handles = handles
+        self._free = list(range(len(handles)))
+        self._cond = threading.Condition()
+
+    def __len__(self) -> int:
+        return len(self.handles)
+
+    @contextmanager
+    def checkout(self) -> Iterator[tuple[int, RuntimeLease]]:
+        with self._cond:
+            while not self._free:
+                self._cond.wait()
+            index = next((i for i in self._free if self.handles[i].loaded), self._free[0])
+            self._free.remove(index)
+        try:
+            with self.handles[index].lease() as lease:
+                yield index, lease
+        finally:
+            with self._cond:
+                self._free.append(index)
+                self._cond.notify()
+
+
+class RuntimeManager:
+    """Tracks heavyweight model runtimes (OCR engines, transformers pipelines) that converters load.
+
+    Each runtime's memory is estimated from the process RSS growth while it loads (falling back
+    to the converter's hint). Runtimes idle for longer than `MODEL_IDLE_TIMEOUT_SECONDS` are
+    unloaded by `evict_idle()`, and loading one that pushes the total over
+    `MODEL_MEMORY_BUDGET_MB` unloads the least recently used idle runtimes first.
+    """
+
+    def __init__(self, idle_timeout: Optional[float] = None, budget_mb: Optional[float] = None):
+        self.idle_timeout = idle_timeout if idle_timeout is not None else _env_float("MODEL_IDLE_TIMEOUT_SECONDS", 600)
+        self.budget_mb = budget_mb if budget_mb is not None else _env_float("MODEL_MEMORY_BUDGET_MB", 4096)
+        self._runtimes: dict[str, _Runtime] = {}
+        self._lock = threading.Lock()
+        self._warm_owners: set[str] = set()
+        self._reaper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def register(
+        self,
+        name: str,
+        loader: Callable[[], Any],
+        owner: Optional[str] = None,
+        estimate_mb: float = 512.0,
+        on_unload: Optional[Callable[[], None]] = None,
+    ) -> RuntimeHandle:
+        with self._lock:
+            runtime = self._runtimes.get(name)
+            if runtime is None:
+                runtime = _Runtime(
+                    name=name,
+                    owner=owner or name,
+                    loader=loader,
+                    estimate_mb=estimate_mb,
+                    on_unload=on_unload,
+                )
+                self._runtimes[name] = runtime
+        return RuntimeHandle(self, runtime)
+
+    def register_pool(
+        self,
+        name: str,
+        loader: Callable[[int], Any],
+        size: int,
+        owner: Optional[str] = None,
+        estimate_mb: float = 512.0,
+        on_unload: Optional[Callable[[], None]] = None,
+    ) -> RuntimePool:
+        # `loader(index)` builds instance `index`; instances are registered as "<name>-<index>".
+        # Loads are serialized so each instance's RSS growth is measured on its own.
+        load_lock = threading.Lock()
+
+        def load(index: int) -> Any:
+            with load_lock:
+                return loader(index)
+
+        handles = [
+            self.register(
+                f"{name}-{index}",
+                lambda index=index: load(index),
+                owner=owner or name,
+                estimate_mb=estimate_mb,
+                on_unload=on_unload,
+            )
+            for index in range(max(1, size))
+        ]
+        return RuntimePool(handles)
+
+    def keep_warm(self, owner: str) -> None:
+        # Exempts the owner's runtimes from idle eviction (the memory budget still applies).
+        with self._lock:
+            self._warm_owners.add(owner)
+
+    def _acquire(self, runtime: _Runtime) -> Any:
+        with runtime.load_lock:
+            with self._lock:
+                if runtime.loaded:
+                    runtime.in_use += 1
+                    runtime.last_used = time.time()
+                    return runtime.value
+
+            before = _rss_mb()
+            started = time.perf_counter()
+            value = runtime.loader()
+            after = _rss_mb()
+            grown = (after - before) if before is not None and after is not None else 0.0
+            memory_mb = round(grown if grown > 1.0 else runtime.estimate_mb, 1)
+            logger.info(
+                "loaded runtime %s (~%.0f MB) in %.1f s", runtime.name, memory_mb, time.perf_counter() - started
+            )
+
+            with self._lock:
+                runtime.value = value
+                runtime.loaded = True
+                runtime.memory_mb = memory_mb
+                runtime.peak_memory_mb = max(runtime.peak_memory_mb, memory_mb)
+                runtime.loaded_at = runtime.last_used = time.time()
+                runtime.in_use += 1
+                victims = self._budget_victims()
+        self._unload(victims)
+        return value
+
+    def _release(self, runtime: _Runtime) -> None:
+        with self._lock:
+            runtime.in_use = max(0, runtime.in_use - 1)
+            runtime.last_used = time.time()
+
+    def _loaded_mb(self) -> float:
+        return sum(runtime.memory_mb for runtime in self._runtimes.values() if runtime.loaded)
+
+    def _take(self, runtime: _Runtime, reason: str) -> tuple[_Runtime, Any]:
+        # Caller holds `self._lock`; the actual teardown happens outside it in `_unload`.
+        value = runtime.value
+        runtime.value = None
+        runtime.loaded = False
+        runtime.memory_mb = 0.0
+        runtime.evictions += 1
+        runtime.last_evicted_at = time.time()
+        runtime.last_eviction_reason = reason
+        return runtime, value
+
+    def _budget_victims(self) -> list[tuple[_Runtime, Any]]:
+        if not self.budget_mb:
+            return []
+        victims: list[tuple[_Runtime, Any]] = []
+        idle = sorted(
+            (runtime for runtime in self._runtimes.values() if runtime.loaded and runtime.in_use == 0),
+            key=lambda runtime: runtime.last_used or 0.0,
+        )
+        for runtime in idle:
+            if self._loaded_mb() <= self.budget_mb:
+                break
+            victims.append(self._take(runtime, "memory budget"))
+        if self._loaded_mb() > self.budget_mb:
+            logger.warning(
+                "model runtimes in use need ~%.0f MB, over MODEL_MEMORY_BUDGET_MB=%.0f", self._loaded_mb(), self.budget_mb
+            )
+        return victims
+
+    def _unload(self, victims: list[tuple[_Runtime, Any]]) -> None:
+        if not victims:
+            return
+        runtimes = [runtime for runtime, _ in victims]
+        # Drop the last references before collecting so the model memory can actually be freed.
+        victims.clear()
+        gc.collect()
+        for runtime in runtimes:
+            if runtime.on_unload is not None:
+                try:
+                    runtime.on_unload()
+                except Exception as exc:
+                    logger.warning("runtime %s unload hook failed: %s", runtime.name, exc)
+            logger.info("unloaded runtime %s (%s)", runtime.name, runtime.last_eviction_reason)
+
+    def evict_idle(self, now: Optional[float] = None) -> list[str]:
+        if not self.idle_timeout:
+            return []
+        now = now or time.time()
+        with self._lock:
+            victims = [
+                self._take(runtime, "idle timeout")
+                for runtime in self._runtimes.values()
+                if runtime.loaded
+                and runtime.in_use == 0
+                and runtime.owner not in self._warm_owners
+                and now - (runtime.last_used or now) >= self.idle_timeout
+            ]
+        names = [runtime.name for runtime, _ in victims]
+        self._unload(victims)
+        return names
+
+    def start_reaper(self, interval: Optional[float] = None) -> None:
+        if self._reaper is not None or not self.idle_timeout:
+            return
+        interval = interval or max(5.0, min(60.0, self.idle_timeout / 4))
+        self._stop.clear()
+
+        def reap() -> None:
+            while not self._stop.wait(interval):
+                try:
+                    self.evict_idle()
+                except Exception as exc:
+                    logger.warning("runtime idle eviction failed: %s", exc)
+
+        self._reaper = threading.Thread(target=reap, name="runtime-reaper", daemon=True)
+        self._reaper.start()
+
+    def stop_reaper(self) -> None:
+        if self._reaper is None:
+            return
+        self._stop.set()
+        self._reaper.join(timeout=5)
+        self._reaper = None
+
+    def describe(self, owner: str) -> list[dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "name": runtime.name,
+                    "state": "loaded" if runtime.loaded else ("evicted" if runtime.evictions else "unloaded"),
+                    "in_use": runtime.in_use,
+                    "memory_mb": runtime.memory_mb if runtime.loaded else None,
+                    "peak_memory_mb": runtime.peak_memory_mb or None,
+                    "last_used": runtime.last_used,
+                    "evictions": runtime.evictions,
+                    "last_evicted_at": runtime.last_evicted_at,
+                    "last_eviction_reason": runtime.last_eviction_reason,
+                }
+                for runtime in self._runtimes.values()
+                if runtime.owner == owner
+            ]
+
+
+RUNTIMES = RuntimeManager()
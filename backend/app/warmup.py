@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from .adapters.base import ModelAdapter
+from .execution import ConversionExecutor
+from .page_cache import page_cache_bypassed
+from .runtimes import RUNTIMES
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WarmupState:
+    status: str = "pending"
+    duration_ms: Optional[float] = None
+    note: Optional[str] = None
+
+
+def _synthetic_pdf() -> str:
+    import fitz
+
+    handle = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf", prefix="warmup_")
+    handle.close()
+    with fitz.open() as doc:
+        page = doc.new_page(width=320, height=120)
+        page.insert_text((20, 50), "Warm-up page 0123456789", fontsize=18)
+        doc.save(handle.name)
+    return handle.name
+
+
+def _warm_blocking(adapter: ModelAdapter) -> Optional[str]:
+    health = adapter.health()
+    if not health.ok:
+        raise LookupError(health.note or "model unavailable")
+
+    pdf_path = _synthetic_pdf()
+    try:
+        options: dict[str, Any] = {"maxPages": 1}
+        # The page cache is skipped so the runtime really loads and no warm-up text is stored.
+        with page_cache_bypassed():
+            if hasattr(adapter, "convert_with_meta"):
+                _, execution = adapter.convert_with_meta(pdf_path, options)
+                if execution.fallback_used:
+                    return f"warmed fallback {execution.engine_used}: {execution.note}"
+                return None
+            adapter.convert(pdf_path, options)
+            return None
+    finally:
+        if os.path.exists(pdf_path):
+            os.remove(pdf_path)
+
+
+def _env_models(name: str) -> set[str]:
+    return {item.strip() for item in os.getenv(name, "").split(",") if item.strip()}
+
+
+class Warmup:
+    """Loads the runtimes of opted-in models in the background at startup.
+
+    Models opt in with `"warm": true` in the registry or by being listed in `WARM_MODELS`;
+    nothing is warmed by default, so an idle desktop install does not hold multi-GB runtimes.
+
+    Each model converts one tiny synthetic page so its runtime is constructed (and its first
+    inference paid for) before real traffic arrives. `/ready` reports when this is done.
+    """
+
+    def __init__(self, executor: ConversionExecutor):
+        self.executor = executor
+        self.enabled = os.getenv("MODEL_WARMUP", "on").strip().lower() not in {"0", "off", "false", "no"}
+        self.states: dict[str, WarmupState] = {}
+        self.finished = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.finished.is_set()
+
+    def start(self, adapters: dict[str, ModelAdapter]) -> None:
+        listed = _env_models("WARM_MODELS")
+        targets = {
+            model_id: adapter for model_id, adapter in adapters.items() if adapter.info.warm or model_id in listed
+        }
+        self.states = {model_id: WarmupState() for model_id in targets}
+        if not self.enabled or not targets:
+            for state in self.states.values():
+                state.status = "skipped"
+                state.note = "MODEL_WARMUP is off"
+            self.finished.set()
+            return
+        for adapter in targets.values():
+            # Warmed models stay resident; only the memory budget may still unload them.
+            if hasattr(adapter, "model"):
+                RUNTIMES.keep_warm(adapter.model.model_id)
+        self._task = asyncio.create_task(self._run(targets))
+
+    async def _run(self, targets: dict[str, ModelAdapter]) -> None:
+        # One model at a time so warm-up never competes with itself for CPU or memory.
+        try:
+            for model_id, adapter in targets.items():
+                state = self.states[model_id]
+                state.status = "running"
+                started = time.perf_counter()
+                try:
+                    note, _ = await self.executor.run(
+                        model_id, adapter.info.max_concurrency, _warm_blocking, adapter
+                    )
+                    state.status = "ready"
+                    state.note = note
+                except LookupError as exc:
+                    state.status = "skipped"
+                    state.note = str(exc)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    logger.warning("warm-up of %s failed: %s", model_id, exc)
+                    state.status = "failed"
+                    state.note = str(exc)
+                state.duration_ms = round((time.perf_counter() - started) * 1000.0, 1)
+        finally:
+            self.finished.set()
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
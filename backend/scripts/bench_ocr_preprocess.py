@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+VARIANTS = ("pil-rgb", "numpy-gray")
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _render(doc, page_number: int, dpi: int, variant: str):
+    from backend.app.rasters import render_page
+
+    # The old recipe OCR'd an RGB render; the new one renders straight to grayscale.
+    return render_page(doc, page_number, dpi, layout="pil" if variant == "pil-rgb" else "gray")
+
+
+def _preprocess(page, variant: str):
+    if variant == "numpy-gray":
+        from backend.app.preprocess import binarize
+
+        return binarize(page, threshold=185, factor=2)
+
+    # The OCR-only recipe before this change: five full-size PIL images per page.
+    from PIL import Image, ImageOps
+
+    gray = page.convert("L")
+    enhanced = ImageOps.autocontrast(gray)
+    resampling = getattr(Image, "Resampling", Image)
+    upscaled = enhanced.resize((enhanced.width * 2, enhanced.height * 2), resampling.BICUBIC)
+    bw = upscaled.point(lambda p: 0 if p < 185 else 255, mode="1")
+    return bw.convert("L")
+
+
+def _nbytes(page) -> int:
+    return page.nbytes if hasattr(page, "nbytes") else page.width * page.height * len(page.getbands())
+
+
+def _run(variant: str, pdf_path: str, pages: int, dpi: int) -> dict:
+    import fitz
+    from PIL import ImageOps  # noqa: F401
+
+    from backend.app import preprocess, rasters  # noqa: F401
+
+    with fitz.open(pdf_path) as doc:
+        page_numbers = range(1, min(pages, len(doc)) + 1)
+        started = time.perf_counter()
+        rendered = [_render(doc, page_number, dpi, variant) for page_number in page_numbers]
+        render_s = time.perf_counter() - started
+
+    # Pages are rendered and every module is imported before the baseline, so the peak below
+    # only counts the buffers preprocessing allocates.
+    baseline = _peak_rss_mb()
+    started = time.perf_counter()
+    for page in rendered:
+        _preprocess(page, variant)
+    preprocess_s = time.perf_counter() - started
+    count = max(1, len(rendered))
+    return {
+        "variant": variant,
+        "pages": len(rendered),
+        "render_ms": round(render_s * 1000.0 / count, 1),
+        "page_mb": round(sum(_nbytes(page) for page in rendered) / count / (1024 * 1024), 1),
+        "preprocess_ms": round(preprocess_s * 1000.0 / count, 1),
+        "preprocess_peak_mb": round(_peak_rss_mb() - baseline, 1),
+    }
+
+
+def _agreement(pdf_path: str, dpi: int) -> float:
+    import fitz
+    import numpy as np
+
+    with fitz.open(pdf_path) as doc:
+        before = np.asarray(_preprocess(_render(doc, 1, dpi, "pil-rgb"), "pil-rgb"))
+        after = _preprocess(_render(doc, 1, dpi, "numpy-gray"), "numpy-gray")
+    return float((before == after).mean())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare the old PIL and the NumPy OCR preprocessing of ocr-only.")
+    parser.add_argument("pdf")
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--dpi", type=int, default=220)
+    parser.add_argument("--variant", choices=VARIANTS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(_run(args.variant, args.pdf, args.pages, args.dpi)))
+        return 0
+
+    # Each variant runs in a fresh process so peak RSS is not shared between them.
+    for variant in VARIANTS:
+        output = subprocess.run(
+            [sys.executable, __file__, args.pdf, "--pages", str(args.pages), "--dpi", str(args.dpi), "--variant", variant],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"{result['variant']:>10}: render {result['render_ms']:7.1f} ms/page ({result['page_mb']:.1f} MB), "
+            f"preprocess {result['preprocess_ms']:7.1f} ms/page, peak RSS +{result['preprocess_peak_mb']:.1f} MB"
+        )
+    print(f"pixel agreement on page 1: {_agreement(args.pdf, args.dpi):.2%}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
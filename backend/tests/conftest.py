@@ -0,0 +1,11 @@
+import os
+import sys
+from pathlib import Path
+
+# The backend is imported as `backend.app`, the same way uvicorn loads it from the repo root.
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+# Tests that need a result or page cache build their own; keep the suite out of ~/.cache.
+os.environ.setdefault("RESULT_CACHE_BACKEND", "off")
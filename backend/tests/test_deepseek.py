@@ -0,0 +1,91 @@
+import importlib.machinery
+import sys
+import time
+import types
+from pathlib import Path
+
+import pytest
+
+from backend.app.runtimes import RUNTIMES
+
+SAMPLE_PDF = str(Path(__file__).resolve().parents[2] / "pdfs" / "xrayreports4.pdf")
+
+
+class _Backup:
+    # Stands in for the transformers image-to-text pipeline (loaded slowly, like a cold start).
+    load_seconds = 0.0
+    page_seconds = 0.0
+    text = "backup text"
+
+    def __init__(self, *args, **kwargs):
+        time.sleep(self.load_seconds)
+
+    def __call__(self, images, batch_size=1):
+        time.sleep(self.page_seconds * len(images))
+        return [{"generated_text": self.text} for _ in images]
+
+
+class _Fallback:
+    def __init__(self):
+        self.options = None
+
+    def iter_pages(self, pdf_path, options=None, first_page=1):
+        self.options = options
+        yield "## Page 1\n\nocr"
+
+
+def _module(name: str) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__spec__ = importlib.machinery.ModuleSpec(name, None)
+    return module
+
+
+@pytest.fixture
+def deepseek(monkeypatch: pytest.MonkeyPatch):
+    torch = _module("torch")
+    torch.cuda = types.SimpleNamespace(is_available=lambda: False, empty_cache=lambda: None)
+    transformers = _module("transformers")
+    transformers.pipeline = _Backup
+    monkeypatch.setitem(sys.modules, "torch", torch)
+    monkeypatch.setitem(sys.modules, "transformers", transformers)
+    monkeypatch.setenv("DEEPSEEK_OFFICIAL_ENABLED", "false")
+    from backend.app.models import deepseek as module
+
+    fallback = _Fallback()
+    monkeypatch.setattr(module, "get_ocr_converter", lambda: fallback)
+    yield module.DeepSeekConverter(), fallback
+    RUNTIMES.evict_idle(now=time.time() + 10**6)
+
+
+def test_model_load_does_not_count_against_the_budget(deepseek, monkeypatch: pytest.MonkeyPatch) -> None:
+    converter, _ = deepseek
+    monkeypatch.setattr(_Backup, "load_seconds", 0.5)
+    monkeypatch.setenv("DEEPSEEK_TIME_BUDGET_SECONDS", "0.3")
+
+    pages = list(converter.iter_pages(SAMPLE_PDF, {"maxPages": 4, "batchSize": 2}))
+
+    assert pages == [f"## Page {idx}\n\nbackup text" for idx in range(1, 5)]
+
+
+def test_budget_still_stops_inference(deepseek, monkeypatch: pytest.MonkeyPatch) -> None:
+    converter, _ = deepseek
+    monkeypatch.setattr(_Backup, "page_seconds", 0.2)
+    monkeypatch.setenv("DEEPSEEK_TIME_BUDGET_SECONDS", "0.1")
+
+    pages = list(converter.iter_pages(SAMPLE_PDF, {"batchSize": 1}))
+
+    assert 1 <= len(pages) - 1 < 11
+    assert pages[-1].startswith("> Stopped after page")
+
+
+def test_ocr_fallback_respects_the_spent_budget(deepseek, monkeypatch: pytest.MonkeyPatch) -> None:
+    converter, fallback = deepseek
+    monkeypatch.setattr(_Backup, "text", "")
+    monkeypatch.setattr(_Backup, "page_seconds", 0.2)
+    monkeypatch.setenv("DEEPSEEK_TIME_BUDGET_SECONDS", "0.1")
+
+    pages = list(converter.iter_pages(SAMPLE_PDF, {"batchSize": 1}))
+
+    assert pages == ["## Page 1\n\nocr"]
+    assert converter.last_run["engine_used"] == "ocr-only"
+    assert 1 <= fallback.options["maxPages"] < 11
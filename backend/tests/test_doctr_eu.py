@@ -0,0 +1,87 @@
+import importlib.machinery
+import sys
+import time
+import types
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from backend.app.models import doctr_eu
+from backend.app.runtimes import RUNTIMES
+
+SAMPLE_PDF = str(Path(__file__).resolve().parents[2] / "pdfs" / "xrayreports4.pdf")
+
+
+def _page(text: str) -> types.SimpleNamespace:
+    word = types.SimpleNamespace(value=text)
+    return types.SimpleNamespace(blocks=[types.SimpleNamespace(lines=[types.SimpleNamespace(words=[word])])])
+
+
+class _Predictor:
+    def __init__(self, fail_from_call: int | None = None):
+        self.calls: list[list[tuple[int, ...]]] = []
+        self.fail_from_call = fail_from_call
+        self.read = 0
+
+    def __call__(self, images: list[np.ndarray]) -> types.SimpleNamespace:
+        self.calls.append([image.shape for image in images])
+        if self.fail_from_call is not None and len(self.calls) >= self.fail_from_call:
+            raise RuntimeError("predictor crashed")
+        pages = []
+        for _ in images:
+            self.read += 1
+            pages.append(_page(f"text {self.read}"))
+        return types.SimpleNamespace(pages=pages)
+
+
+@pytest.fixture
+def predictor(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("RASTER_WORKERS", "1")
+    monkeypatch.delenv("DOCTR_BATCH_SIZE", raising=False)
+    holder: dict[str, _Predictor] = {"predictor": _Predictor()}
+
+    models = types.ModuleType("doctr.models")
+    models.ocr_predictor = lambda **kwargs: holder["predictor"]
+    doctr = types.ModuleType("doctr")
+    doctr.__spec__ = importlib.machinery.ModuleSpec("doctr", None)
+    doctr.models = models
+    monkeypatch.setitem(sys.modules, "doctr", doctr)
+    monkeypatch.setitem(sys.modules, "doctr.models", models)
+    yield holder
+    RUNTIMES.evict_idle(now=time.time() + 10**6)
+
+
+def test_pages_are_read_in_batches_of_batch_size(predictor) -> None:
+    converter = doctr_eu.DoctrEuConverter()
+    pages = list(converter.iter_pages(SAMPLE_PDF, {"maxPages": 7, "batchSize": 3}))
+
+    assert [len(call) for call in predictor["predictor"].calls] == [3, 3, 1]
+    assert all(len(shape) == 3 and shape[2] == 3 for call in predictor["predictor"].calls for shape in call)
+    assert pages == [f"## Page {page}\n\ntext {page}" for page in range(1, 8)]
+    assert converter.last_run["engine_used"] == "doctr-eu"
+
+
+def test_default_batch_size_comes_from_the_environment(predictor, monkeypatch) -> None:
+    monkeypatch.setenv("DOCTR_BATCH_SIZE", "2")
+    list(doctr_eu.DoctrEuConverter().iter_pages(SAMPLE_PDF, {"maxPages": 5}))
+    assert [len(call) for call in predictor["predictor"].calls] == [2, 2, 1]
+
+
+def test_a_failing_batch_hands_the_rest_of_the_document_to_ocr(predictor, monkeypatch) -> None:
+    predictor["predictor"] = _Predictor(fail_from_call=2)
+    resumed: list[int] = []
+
+    class _Fallback:
+        def iter_pages(self, pdf_path, options=None, first_page=1):
+            resumed.append(first_page)
+            yield from (f"## Page {page}\n\nocr" for page in range(first_page, 5))
+
+    monkeypatch.setattr(doctr_eu, "get_ocr_converter", lambda: _Fallback())
+    converter = doctr_eu.DoctrEuConverter()
+    pages = list(converter.iter_pages(SAMPLE_PDF, {"maxPages": 4, "batchSize": 2}))
+
+    # The second batch fails as a whole and again page by page; OCR resumes after page 2.
+    assert resumed == [3]
+    assert pages == ["## Page 1\n\ntext 1", "## Page 2\n\ntext 2", "## Page 3\n\nocr", "## Page 4\n\nocr"]
+    assert converter.last_run["fallback_used"] is True
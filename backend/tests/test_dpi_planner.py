@@ -0,0 +1,72 @@
+import fitz
+import pytest
+
+from backend.app.dpi_planner import PLANNER_VERSION, plan_dpi, scanned_text_size, text_layer_size
+from backend.app.rasters import PageImages, dpi_tag
+
+
+def _text_page(doc: fitz.Document, fontsize: float, lines: int = 12) -> fitz.Page:
+    page = doc.new_page(width=595, height=842)
+    for line in range(lines):
+        y = 60 + line * fontsize * 1.6
+        if y > 800:
+            break
+        page.insert_text((40, y), "The quick brown fox jumps over the lazy dog", fontsize=fontsize)
+    return page
+
+
+def _scanned_page(doc: fitz.Document, fontsize: float) -> fitz.Page:
+    # The same text, but only as an image: no text layer for the planner to read.
+    with fitz.open() as source:
+        text_page = _text_page(source, fontsize, lines=30)
+        pix = text_page.get_pixmap(dpi=150, colorspace=fitz.csGRAY)
+    page = doc.new_page(width=595, height=842)
+    page.insert_image(page.rect, pixmap=pix)
+    return page
+
+
+@pytest.mark.parametrize("fontsize, expected", [(11, 200), (22, 100), (8, 280), (40, 80), (4, 300)])
+def test_text_layer_pages_scale_with_their_body_text(fontsize: float, expected: int) -> None:
+    with fitz.open() as doc:
+        page = _text_page(doc, fontsize)
+        assert text_layer_size(page) == fontsize
+        # Clamped to [max(72, 200 / 3), 1.5 x 200] and rounded up to a multiple of 10.
+        assert plan_dpi(page, 200) == expected
+
+
+def test_unmeasurable_pages_keep_the_reference_dpi() -> None:
+    with fitz.open() as doc:
+        page = doc.new_page()
+        page.insert_text((40, 60), "Title", fontsize=30)
+        assert text_layer_size(page) is None
+        assert plan_dpi(page, 200) == 200
+
+
+def test_scanned_pages_are_never_planned_below_the_reference() -> None:
+    with fitz.open() as doc:
+        _scanned_page(doc, 24)
+        _scanned_page(doc, 7)
+        large, small = doc[0], doc[1]
+        assert text_layer_size(large) is None
+        assert scanned_text_size(large) > scanned_text_size(small)
+        assert plan_dpi(large, 200) == 200
+        assert plan_dpi(small, 200) > 200
+
+
+def test_page_images_render_each_page_at_its_planned_dpi(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("RASTER_WORKERS", "1")
+    path = str(tmp_path / "mixed.pdf")
+    with fitz.open() as doc:
+        _text_page(doc, 22)
+        _text_page(doc, 11)
+        doc.save(path)
+
+    with PageImages(path, [1, 2], dpi=200, prefetch=0, adaptive=True) as images:
+        widths = [image.width for _, image in images]
+        assert [images.dpi_for(1), images.dpi_for(2)] == [100, 200]
+    assert [abs(width - 595 * dpi / 72) <= 1 for width, dpi in zip(widths, (100, 200))] == [True, True]
+
+
+def test_planner_version_is_part_of_the_page_cache_variant() -> None:
+    assert dpi_tag(220, adaptive=True) == f"dpi=auto{PLANNER_VERSION}:220"
+    assert dpi_tag(220, adaptive=False) == "dpi=220"
@@ -0,0 +1,185 @@
+import asyncio
+import os
+import threading
+import time
+
+from backend.app.adapters.local import LocalModelAdapter
+from backend.app.execution import ConversionExecutor, SingleFlight
+from backend.app.models.base import LastRun, ModelDefinition
+
+
+def test_per_model_cap_limits_concurrent_calls() -> None:
+    executor = ConversionExecutor(max_workers=4)
+    lock = threading.Lock()
+    running = [0, 0]  # now, peak
+
+    def convert() -> None:
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+
+    async def scenario() -> None:
+        await asyncio.gather(*(executor.run("model", 2, convert) for _ in range(6)))
+
+    asyncio.run(scenario())
+    executor.shutdown()
+    assert running[1] == 2
+
+
+def test_blocking_calls_leave_the_event_loop_free() -> None:
+    executor = ConversionExecutor(max_workers=2)
+    ticks: list[float] = []
+
+    async def ticker() -> None:
+        for _ in range(5):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def scenario() -> tuple:
+        result, _ = await asyncio.gather(executor.run("model", None, time.sleep, 0.2), ticker())
+        return result
+
+    started = time.perf_counter()
+    (value, timing) = asyncio.run(scenario())
+    executor.shutdown()
+    assert value is None
+    assert len(ticks) == 5 and ticks[-1] - started < 0.15
+    assert timing.run_ms >= 150
+
+
+def test_queue_wait_is_reported_for_capped_calls() -> None:
+    executor = ConversionExecutor(max_workers=2)
+
+    async def scenario() -> list:
+        return await asyncio.gather(*(executor.run("model", 1, time.sleep, 0.1) for _ in range(2)))
+
+    timings = [timing for _, timing in asyncio.run(scenario())]
+    executor.shutdown()
+    assert max(timing.queue_wait_ms for timing in timings) >= 80
+
+
+class _Converter:
+    last_run = LastRun()
+
+    def __init__(self):
+        self.last_run = {"engine_used": "default", "fallback_used": False}
+
+    def convert(self, pdf_path: str, options=None) -> str:
+        engine = (options or {})["engine"]
+        self.last_run = {"engine_used": engine, "fallback_used": engine != "primary"}
+        time.sleep(0.05)
+        return engine
+
+
+def test_concurrent_conversions_read_back_their_own_run_metadata() -> None:
+    converter = _Converter()
+    adapter = LocalModelAdapter(ModelDefinition(model_id="shared", description="", converter=converter))
+    results: dict[str, tuple] = {}
+
+    def convert(engine: str) -> None:
+        markdown, execution = adapter.convert_with_meta("doc.pdf", {"engine": engine})
+        results[engine] = (markdown, execution.engine_used, execution.fallback_used)
+
+    threads = [threading.Thread(target=convert, args=(engine,)) for engine in ("primary", "ocr-only")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {"primary": ("primary", "primary", False), "ocr-only": ("ocr-only", "ocr-only", True)}
+    # Outside a conversion the converter keeps its own default.
+    assert converter.last_run["engine_used"] == "default"
+
+
+def test_single_flight_runs_identical_work_once() -> None:
+    flight = SingleFlight()
+    calls: list[str] = []
+
+    async def work() -> str:
+        calls.append("run")
+        await asyncio.sleep(0.05)
+        return "markdown"
+
+    async def scenario() -> list:
+        return await asyncio.gather(*(flight.run("key", work) for _ in range(3)))
+
+    results = asyncio.run(scenario())
+    assert calls == ["run"]
+    assert sorted(results, key=lambda result: result[1]) == [("markdown", False), ("markdown", True), ("markdown", True)]
+
+
+def test_single_flight_survives_the_leader_going_away() -> None:
+    flight = SingleFlight()
+
+    async def work() -> str:
+        await asyncio.sleep(0.05)
+        return "markdown"
+
+    async def scenario() -> tuple:
+        leader = asyncio.ensure_future(flight.run("key", work))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.run("key", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(scenario()) == ("markdown", True)
+
+
+def test_single_flight_shares_failures_and_forgets_the_key() -> None:
+    flight = SingleFlight()
+    attempts: list[int] = []
+
+    async def work() -> str:
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("conversion failed")
+
+    async def scenario() -> list:
+        first = await asyncio.gather(*(flight.run("key", work) for _ in range(2)), return_exceptions=True)
+        second = await asyncio.gather(flight.run("key", work), return_exceptions=True)
+        return first + second
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(attempts) == 2
+
+
+def test_identical_uploads_share_one_conversion(monkeypatch) -> None:
+    import httpx
+
+    from backend.app import main
+
+    converted: list[str] = []
+
+    class _Slow:
+        def convert(self, pdf_path: str, options=None) -> str:
+            converted.append(pdf_path)
+            time.sleep(0.2)
+            return "## Page 1\n\ntext\n"
+
+    async def no_charts(markdown, pdf_path, options, rasters=None):
+        return [], {"engine_used": "none"}
+
+    adapter = LocalModelAdapter(ModelDefinition(model_id="slow", description="", converter=_Slow()))
+    monkeypatch.setattr(main.REGISTRY, "get", lambda model_id: adapter)
+    monkeypatch.setattr(main, "_extract_charts", no_charts)
+
+    async def scenario() -> list:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            uploads = [b"%PDF same", b"%PDF same", b"%PDF other"]
+            return await asyncio.gather(
+                *(client.post("/convert/slow", files={"file": ("doc.pdf", body, "application/pdf")}) for body in uploads)
+            )
+
+    responses = asyncio.run(scenario())
+    executions = [response.json()["execution"] for response in responses]
+    assert len(converted) == 2
+    assert sorted(bool(execution.get("coalesced")) for execution in executions[:2]) == [False, True]
+    assert not executions[2].get("coalesced")
+    # Every copy of the upload, the followers' included, is removed.
+    assert not any(os.path.exists(path) for path in converted)
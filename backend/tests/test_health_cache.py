@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+
+from backend.app.adapters.base import AdapterHealth, AdapterInfo
+from backend.app.execution import ConversionExecutor
+from backend.app.health_cache import HealthCache
+
+
+class _Adapter:
+    def __init__(self, model_id: str, ttl: int | None = None, ok: bool = True, delay: float = 0.0):
+        self.info = AdapterInfo(model_id=model_id, description="", health_ttl_seconds=ttl)
+        self.ok = ok
+        self.delay = delay
+        self.probes = 0
+        self._lock = threading.Lock()
+
+    def health(self) -> AdapterHealth:
+        with self._lock:
+            self.probes += 1
+        time.sleep(self.delay)
+        if self.ok is None:
+            raise RuntimeError("probe crashed")
+        return AdapterHealth(ok=self.ok, note=f"probe {self.probes}")
+
+
+def _cache(default_ttl: float = 300) -> HealthCache:
+    return HealthCache(ConversionExecutor(max_workers=2), default_ttl=default_ttl)
+
+
+def test_statuses_probe_once_then_serve_from_cache() -> None:
+    cache = _cache()
+    adapters = {"a": _Adapter("a"), "b": _Adapter("b", ok=False)}
+
+    async def scenario() -> tuple:
+        first = await cache.statuses(adapters)
+        second = await cache.statuses(adapters)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first["a"].ok and not first["b"].ok
+    assert second == first
+    assert [adapter.probes for adapter in adapters.values()] == [1, 1]
+
+
+def test_concurrent_callers_share_one_probe() -> None:
+    cache = _cache()
+    adapter = _Adapter("slow", delay=0.1)
+
+    async def scenario() -> list:
+        return await asyncio.gather(*(cache.probe("slow", adapter) for _ in range(4)))
+
+    statuses = asyncio.run(scenario())
+    assert adapter.probes == 1
+    assert len({id(status) for status in statuses}) == 1
+
+
+def test_only_expired_entries_are_refreshed() -> None:
+    cache = _cache(default_ttl=300)
+    fresh, stale = _Adapter("fresh"), _Adapter("stale", ttl=1)
+    adapters = {"fresh": fresh, "stale": stale}
+
+    async def scenario() -> None:
+        await cache.statuses(adapters)
+        cache.peek("stale").last_checked -= 5
+        await cache.refresh_expired(adapters)
+
+    asyncio.run(scenario())
+    assert (fresh.probes, stale.probes) == (1, 2)
+    assert cache.peek("stale").note == "probe 2"
+
+
+def test_refresh_probes_everything_and_failures_are_reported() -> None:
+    cache = _cache()
+    adapter = _Adapter("broken", ok=None)
+
+    async def scenario():
+        await cache.statuses({"broken": adapter})
+        return await cache.statuses({"broken": adapter}, refresh=True)
+
+    statuses = asyncio.run(scenario())
+    assert adapter.probes == 2
+    assert not statuses["broken"].ok and "probe crashed" in statuses["broken"].note
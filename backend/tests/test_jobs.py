@@ -0,0 +1,113 @@
+import asyncio
+import shutil
+import time
+import types
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from backend.app import main
+from backend.app.adapters.local import LocalModelAdapter
+from backend.app.jobs import Job, JobQueue, JobStore
+from backend.app.models.base import ModelDefinition
+from backend.app.progress import progress_scope, report_progress
+
+SAMPLE_PDF = Path(__file__).resolve().parents[2] / "pdfs" / "xrayreports4.pdf"
+
+
+class _CappedConverter:
+    # Converts at most three pages whatever `maxPages` asks for, like docTR's 30-page cap.
+    def page_limit(self, options: dict[str, Any] | None = None) -> int:
+        return 3
+
+    def convert(self, pdf_path: str, options: dict[str, Any] | None = None) -> str:
+        for page in range(1, 4):
+            report_progress(page, 3)
+        return "## Page 1\n\ntext\n"
+
+
+def _job(tmp_path: Path, model_id: str = "capped", options: dict[str, Any] | None = None) -> Job:
+    pdf_path = tmp_path / "upload.pdf"
+    shutil.copy(SAMPLE_PDF, pdf_path)
+    return Job(job_id="job", model_id=model_id, pdf_path=str(pdf_path), options=options or {})
+
+
+def test_job_total_follows_the_converters_page_cap(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    adapter = LocalModelAdapter(ModelDefinition(model_id="capped", description="", converter=_CappedConverter()))
+    monkeypatch.setattr(main.REGISTRY, "get", lambda model_id: adapter)
+    job = _job(tmp_path, options={"maxPages": 120})
+    totals: list[Any] = []
+
+    async def run_conversion(model_id, adapter, pdf_path, options, progress, content_hash):
+        # What the job reports before the converter's first progress event.
+        totals.append(job.pages_total)
+        adapter.convert(pdf_path, options)
+        return types.SimpleNamespace(model_dump=lambda: {})
+
+    monkeypatch.setattr(main, "_run_conversion", run_conversion)
+    with progress_scope(job.update_progress):
+        asyncio.run(main._run_job(job))
+
+    assert totals == [3]
+    assert (job.pages_done, job.pages_total) == (3, 3)
+
+
+def test_doctr_adapter_reports_its_page_cap() -> None:
+    from backend.app.models.doctr_eu import model
+
+    adapter = LocalModelAdapter(model)
+    assert adapter.page_limit({"maxPages": 120}) == 30
+    assert adapter.page_limit({"maxPages": 5}) == 5
+
+
+def test_queue_finishes_progress_and_removes_the_upload(tmp_path: Path) -> None:
+    async def runner(job: Job) -> dict[str, Any]:
+        job.update_progress(2, 5)
+        return {"markdown": "done"}
+
+    async def scenario() -> Job:
+        store = JobStore(ttl_seconds=60)
+        queue = JobQueue(store, runner, workers=1)
+        await queue.start()
+        job = store.create("capped", _job(tmp_path).pdf_path, {})
+        queue.submit(job)
+        while not job.finished:
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        return job
+
+    job = asyncio.run(scenario())
+    assert job.status == "succeeded" and job.result == {"markdown": "done"}
+    assert (job.pages_done, job.pages_total) == (5, 5)
+    assert not Path(job.pdf_path).exists()
+
+
+def test_failed_job_keeps_its_error(tmp_path: Path) -> None:
+    async def runner(job: Job) -> dict[str, Any]:
+        raise RuntimeError("engine exploded")
+
+    async def scenario() -> Job:
+        store = JobStore(ttl_seconds=60)
+        queue = JobQueue(store, runner, workers=1)
+        await queue.start()
+        job = store.create("capped", _job(tmp_path).pdf_path, {})
+        queue.submit(job)
+        while not job.finished:
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        return job
+
+    job = asyncio.run(scenario())
+    assert job.status == "failed" and job.error == "engine exploded"
+
+
+def test_finished_jobs_expire_after_the_ttl() -> None:
+    store = JobStore(ttl_seconds=60)
+    finished = store.create("capped", "a.pdf", {})
+    running = store.create("capped", "b.pdf", {})
+    finished.status, finished.finished_at = "succeeded", time.time() - 120
+    running.status = "running"
+
+    assert store.get(finished.job_id) is None
+    assert store.get(running.job_id) is running
@@ -0,0 +1,136 @@
+import importlib.machinery
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+
+import pytest
+
+from backend.app.microbatch import MicroBatcher
+from backend.app.progress import count_detail, details_scope
+from backend.app.runtimes import RUNTIMES
+
+SAMPLE_PDF = str(Path(__file__).resolve().parents[2] / "pdfs" / "xrayreports4.pdf")
+
+
+class _Recorder:
+    def __init__(self, fail_on=None, delay: float = 0.0):
+        self.batches: list[list[int]] = []
+        self.fail_on = fail_on
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self, items: list[int]) -> list[int]:
+        with self._lock:
+            self.batches.append(list(items))
+        count_detail("inferred", len(items))
+        time.sleep(self.delay)
+        if self.fail_on in items and len(items) > 1:
+            raise RuntimeError("batch failed")
+        if self.fail_on in items:
+            raise ValueError(f"page {self.fail_on} failed")
+        return [item * 10 for item in items]
+
+
+def test_lone_caller_is_not_held_back_by_the_batch_wait() -> None:
+    infer = _Recorder()
+    batcher = MicroBatcher("test", infer, max_size=8, max_wait_ms=5000)
+    started = time.monotonic()
+    assert batcher.run([1, 2, 3]) == [10, 20, 30]
+    assert time.monotonic() - started < 2
+
+
+def test_batches_respect_the_callers_limit() -> None:
+    infer = _Recorder()
+    batcher = MicroBatcher("test", infer, max_size=8, max_wait_ms=0)
+    assert batcher.run(list(range(1, 6)), limit=2) == [10, 20, 30, 40, 50]
+    assert all(len(batch) <= 2 for batch in infer.batches)
+
+
+def test_limit_of_one_calls_infer_per_page() -> None:
+    infer = _Recorder()
+    batcher = MicroBatcher("test", infer, max_size=8)
+    assert batcher.run([1, 2], limit=1) == [10, 20]
+    assert infer.batches == [[1], [2]]
+
+
+def test_concurrent_callers_share_batches() -> None:
+    # The first request's batch keeps the only worker busy while two more queue their pages.
+    infer = _Recorder(delay=0.2)
+    batcher = MicroBatcher("test", infer, max_size=8, max_wait_ms=50)
+    results: dict[str, list[int]] = {}
+
+    def caller(name: str, items: list[int]) -> None:
+        results[name] = batcher.run(items)
+
+    first = threading.Thread(target=caller, args=("a", [1, 2]))
+    first.start()
+    time.sleep(0.05)
+    others = [threading.Thread(target=caller, args=(name, items)) for name, items in (("b", [3, 4]), ("c", [5, 6]))]
+    for thread in others:
+        thread.start()
+    for thread in [first, *others]:
+        thread.join()
+
+    assert results == {"a": [10, 20], "b": [30, 40], "c": [50, 60]}
+    assert infer.batches[0] == [1, 2]
+    assert sorted(infer.batches[1]) == [3, 4, 5, 6]
+
+
+def test_failed_batch_only_fails_the_bad_page() -> None:
+    infer = _Recorder(fail_on=2)
+    batcher = MicroBatcher("test", infer, max_size=8, max_wait_ms=0)
+    with pytest.raises(ValueError, match="page 2"):
+        batcher.run([1, 2, 3])
+    assert batcher.run([1, 3]) == [10, 30]
+
+
+def test_inference_runs_under_the_callers_details_scope() -> None:
+    batcher = MicroBatcher("test", _Recorder(), max_size=8, max_wait_ms=0)
+    with details_scope() as details:
+        batcher.run([1, 2, 3])
+    assert details["inferred"] == 3
+    assert sum(details["microbatch"].values()) == 3
+
+
+class _Page:
+    def __init__(self):
+        word = types.SimpleNamespace(value="text")
+        self.blocks = [types.SimpleNamespace(lines=[types.SimpleNamespace(words=[word])])]
+
+
+@pytest.fixture
+def fake_doctr(monkeypatch: pytest.MonkeyPatch):
+    loads: list[int] = []
+
+    def ocr_predictor(**kwargs):
+        loads.append(1)
+        return lambda images: types.SimpleNamespace(pages=[_Page() for _ in images])
+
+    doctr = types.ModuleType("doctr")
+    doctr.__spec__ = importlib.machinery.ModuleSpec("doctr", None)
+    models = types.ModuleType("doctr.models")
+    models.ocr_predictor = ocr_predictor
+    doctr.models = models
+    monkeypatch.setitem(sys.modules, "doctr", doctr)
+    monkeypatch.setitem(sys.modules, "doctr.models", models)
+    return loads
+
+
+def test_doctr_runtime_stays_pinned_between_batches(fake_doctr) -> None:
+    from backend.app.models.doctr_eu import DoctrEuConverter
+
+    converter = DoctrEuConverter()
+    evicted: list[str] = []
+    pages = []
+    for page in converter.iter_pages(SAMPLE_PDF, {"maxPages": 4, "batchSize": 1}):
+        pages.append(page)
+        # What the idle reaper would do between two of this request's batches.
+        evicted += RUNTIMES.evict_idle(now=time.time() + 10**6)
+
+    assert len(pages) == 4 and converter.last_run["fallback_used"] is False
+    assert "doctr-eu" not in evicted
+    assert len(fake_doctr) == 1
+    assert RUNTIMES.describe("doctr-eu")[0]["in_use"] == 0
+    RUNTIMES.evict_idle(now=time.time() + 10**6)
@@ -0,0 +1,50 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from backend.app.model_loader import MANIFEST_PATH, LazyModelDefinition
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+_PROBE = """
+import json, sys
+from backend.app.model_loader import import_report, load_models
+
+models = load_models()
+listed = {model_id: (model.description, model.capabilities) for model_id, model in models.items()}
+before = sorted(name for name in sys.modules if name.startswith("backend.app.models."))
+models["ocr-only"].converter
+after = sorted(name for name in sys.modules if name.startswith("backend.app.models."))
+print(json.dumps({"listed": listed, "before": before, "after": after, "report": import_report(models)}))
+"""
+
+
+def test_manifest_models_are_listed_without_importing_them() -> None:
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    manifest = {entry["id"]: entry for entry in json.loads(MANIFEST_PATH.read_text())["models"]}
+
+    assert set(manifest) <= set(probe["listed"])
+    assert probe["listed"]["doctr-eu"][0] == manifest["doctr-eu"]["description"]
+    manifest_modules = {f"backend.app.models.{entry['module']}" for entry in manifest.values()}
+    assert not manifest_modules & set(probe["before"])
+    assert "backend.app.models.ocr_only" in probe["after"]
+    assert "ocr-only" not in probe["report"]["deferred"] and "doctr-eu" in probe["report"]["deferred"]
+
+
+def test_manifest_entries_match_their_modules() -> None:
+    for entry in json.loads(MANIFEST_PATH.read_text())["models"]:
+        model = LazyModelDefinition(entry["module"], entry["id"], entry["description"], entry["capabilities"])
+        assert model.load().model_id == entry["id"]
+        assert model.description == model.load().description
+
+
+def test_mismatched_manifest_entry_is_rejected() -> None:
+    model = LazyModelDefinition("doctr_eu", "not-doctr", "", [])
+    with pytest.raises(ValueError, match="does not match"):
+        model.load()
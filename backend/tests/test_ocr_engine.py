@@ -0,0 +1,90 @@
+import os
+import types
+from pathlib import Path
+
+import numpy as np
+import pytest
+import pytesseract
+
+from backend.app import ocr_engine
+from backend.app.ocr_engine import TesseractPool
+from backend.app.page_workers import map_pages
+
+
+class _Engine:
+    def __init__(self, lang: str = "eng", oem: int = 3):
+        if lang not in _Engine.installed:
+            raise RuntimeError("Failed to init API, possibly an invalid tessdata path")
+
+    def SetPageSegMode(self, psm):
+        pass
+
+    def SetImageBytes(self, *args):
+        pass
+
+    def Recognize(self):
+        pass
+
+    def GetUTF8Text(self):
+        return "engine"
+
+    def Clear(self):
+        pass
+
+    def End(self):
+        pass
+
+
+@pytest.fixture
+def fake_tesserocr(monkeypatch: pytest.MonkeyPatch):
+    module = types.SimpleNamespace(
+        PyTessBaseAPI=_Engine, get_languages=lambda: ("/tessdata", list(_Engine.installed))
+    )
+    monkeypatch.setattr(ocr_engine, "tesserocr", module)
+    monkeypatch.setattr(ocr_engine.pytesseract, "image_to_string", lambda image, lang, config: "cli")
+    return module
+
+
+PAGE = np.zeros((8, 8), dtype=np.uint8)
+
+
+def test_missing_language_only_sends_that_language_to_the_cli(fake_tesserocr) -> None:
+    _Engine.installed = {"eng"}
+    pool = TesseractPool(size=2)
+    assert pool.image_to_string(PAGE, lang="fra") == "cli"
+    assert pool.available
+    assert pool.image_to_string(PAGE, lang="eng") == "engine"
+    assert pool.image_to_string(PAGE, lang="fra") == "cli"
+
+
+def test_tesserocr_without_tessdata_is_given_up(fake_tesserocr) -> None:
+    _Engine.installed = set()
+    pool = TesseractPool(size=2)
+    assert pool.image_to_string(PAGE, lang="eng") == "cli"
+    assert not pool.available
+
+
+@pytest.mark.skipif(os.name != "posix", reason="uses a shell script as the tesseract command")
+def test_page_workers_limit_tesseract_threads_in_the_child_only(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    script = tmp_path / "tesseract"
+    # Reports the thread limit it was started with, on stdout or in pytesseract's output file.
+    script.write_text(
+        '#!/bin/sh\n[ "$1" = stdin ] && cat > /dev/null\n'
+        'limit="${OMP_THREAD_LIMIT:-unset}"\n'
+        'if [ "$2" = stdout ]; then printf "%s" "$limit"; else printf "%s" "$limit" > "$2.txt"; fi\n'
+    )
+    script.chmod(0o755)
+    monkeypatch.setattr(pytesseract.pytesseract, "tesseract_cmd", str(script))
+    monkeypatch.delenv("OMP_THREAD_LIMIT", raising=False)
+    monkeypatch.setattr(ocr_engine, "tesserocr", None)
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    environ = pytesseract.pytesseract.environ
+
+    limits = list(map_pages(lambda page: ocr_engine.image_to_text(page), [PAGE, PAGE], workers=2))
+
+    assert limits == ["2", "2"]
+    assert ocr_engine.image_to_text(PAGE) == "unset"
+    assert pytesseract.pytesseract.environ is environ
+    assert "OMP_THREAD_LIMIT" not in os.environ
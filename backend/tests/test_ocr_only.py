@@ -0,0 +1,98 @@
+from pathlib import Path
+
+import fitz
+import numpy as np
+import pytest
+
+from backend.app.models import ocr_only
+from backend.app.models.ocr_only import OCR_PASSES, OcrOnlyConverter
+from backend.app.ocr_engine import OcrPass
+from backend.app.progress import details_scope
+
+SAMPLE_PDF = str(Path(__file__).resolve().parents[2] / "pdfs" / "xrayreports4.pdf")
+
+
+class _Engine:
+    # Stands in for `run_pass`: replies with the confidence configured for each pass config.
+    def __init__(self, confidences: dict[tuple[str, str], float] | None = None):
+        self.confidences = confidences or {}
+        self.calls: list[tuple[str, str, tuple[int, ...]]] = []
+
+    def __call__(self, image: np.ndarray, config: str, lang: str = "eng") -> OcrPass:
+        variant = "binarized" if set(np.unique(image)) <= {0, 255} else "gray"
+        self.calls.append((variant, config, image.shape))
+        confidence = self.confidences.get((variant, config), 50.0)
+        return OcrPass(text=f"{variant} {config}", words=3, mean_confidence=confidence, score=confidence)
+
+
+@pytest.fixture
+def engine(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("OCR_PAGE_WORKERS", "1")
+    monkeypatch.setenv("RASTER_ADAPTIVE_DPI", "off")
+    monkeypatch.delenv("OCR_CONFIDENCE_THRESHOLD", raising=False)
+
+    def install(confidences: dict[tuple[str, str], float] | None = None) -> _Engine:
+        fake = _Engine(confidences)
+        monkeypatch.setattr(ocr_only, "run_pass", fake)
+        return fake
+
+    return install
+
+
+def test_pages_reach_the_engine_as_grayscale_arrays(engine) -> None:
+    fake = engine({("gray", "--oem 3 --psm 6"): 95.0})
+    pages = list(OcrOnlyConverter().iter_pages(SAMPLE_PDF, {"maxPages": 2}))
+
+    assert [call[:2] for call in fake.calls] == [("gray", "--oem 3 --psm 6")] * 2
+    assert all(len(shape) == 2 for _, _, shape in fake.calls)
+    assert pages[0] == "## Page 1\n\ngray --oem 3 --psm 6"
+
+
+def test_binarized_page_is_built_once_and_upscaled(engine) -> None:
+    fake = engine({("binarized", "--oem 3 --psm 11"): 90.0})
+    converter = OcrOnlyConverter()
+    built: list[tuple[int, ...]] = []
+    preprocess = converter._preprocess_for_ocr
+    converter._preprocess_for_ocr = lambda image: built.append(image.shape) or preprocess(image)
+    list(converter.iter_pages(SAMPLE_PDF, {"maxPages": 1}))
+
+    gray_shape = fake.calls[0][2]
+    binarized = [shape for variant, _, shape in fake.calls if variant == "binarized"]
+    assert len(built) == 1 and len(binarized) == 2
+    assert all(shape == (gray_shape[0] * 2, gray_shape[1] * 2) for shape in binarized)
+
+
+def test_ocr_stops_at_the_first_confident_pass(engine) -> None:
+    fake = engine({("binarized", "--oem 3 --psm 6"): 85.0, ("gray", "--oem 3 --psm 11"): 99.0})
+    with details_scope() as details:
+        page, _ = OcrOnlyConverter().iter_pages(SAMPLE_PDF, {"maxPages": 1})  # page 1, truncation note
+
+    assert [call[:2] for call in fake.calls] == [("gray", "--oem 3 --psm 6"), ("binarized", "--oem 3 --psm 6")]
+    assert page.endswith("binarized --oem 3 --psm 6")
+    assert details["ocr_passes"] == 2 and details["ocr_config"] == {"binarized --oem 3 --psm 6": 1}
+
+
+def test_without_a_confident_pass_the_best_scoring_one_wins(engine) -> None:
+    fake = engine({("gray", "--oem 3 --psm 11"): 70.0, ("binarized", "--oem 1 --psm 6"): 60.0})
+    page, _ = OcrOnlyConverter().iter_pages(SAMPLE_PDF, {"maxPages": 1})  # page 1, truncation note
+
+    assert [call[:2] for call in fake.calls] == list(OCR_PASSES)
+    assert page.endswith("gray --oem 3 --psm 11")
+
+
+def test_confidence_threshold_is_configurable(engine, monkeypatch) -> None:
+    monkeypatch.setenv("OCR_CONFIDENCE_THRESHOLD", "40")
+    fake = engine()
+    list(OcrOnlyConverter().iter_pages(SAMPLE_PDF, {"maxPages": 1}))
+    assert len(fake.calls) == 1
+
+
+def test_pages_without_ocr_text_use_the_text_layer(engine, monkeypatch) -> None:
+    def failing(image, config, lang="eng"):
+        raise RuntimeError("tesseract is not installed")
+
+    monkeypatch.setattr(ocr_only, "run_pass", failing)
+    page, _ = OcrOnlyConverter().iter_pages(SAMPLE_PDF, {"maxPages": 1})  # page 1, truncation note
+    with fitz.open(SAMPLE_PDF) as doc:
+        text_layer = doc.load_page(0).get_text("text").strip()
+    assert page == f"## Page 1\n\n{text_layer or '*No text detected on this page.*'}"
@@ -0,0 +1,23 @@
+import pytest
+
+from backend.app.options import get_batch_size
+
+
+def test_batch_size_uses_request_value() -> None:
+    assert get_batch_size({"batchSize": 3}, 4) == 3
+
+
+@pytest.mark.parametrize("raw", [None, 0, -2, "8", True])
+def test_batch_size_ignores_invalid_values(raw: object) -> None:
+    assert get_batch_size({"batchSize": raw}, 4) == 4
+
+
+def test_batch_size_is_clamped_to_server_maximum(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("MAX_BATCH_SIZE", "8")
+    assert get_batch_size({"batchSize": 10000}, 4) == 8
+    assert get_batch_size(None, 32) == 8
+
+
+def test_batch_size_maximum_defaults_to_16(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("MAX_BATCH_SIZE", raising=False)
+    assert get_batch_size({"batchSize": 10000}, 4) == 16
@@ -0,0 +1,85 @@
+import importlib.machinery
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+
+import pytest
+
+from backend.app.models import paddleocr
+from backend.app.runtimes import RuntimeManager
+
+SAMPLE_PDF = str(Path(__file__).resolve().parents[2] / "pdfs" / "xrayreports4.pdf")
+
+
+class _PaddleOCR:
+    # PaddleOCR 3.x: `predict` takes a list of pages, `ocr` one page in the older result format.
+    instances: list["_PaddleOCR"] = []
+    lock = threading.Lock()
+    read = 0
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.predicted: list[int] = []
+        self.single = 0
+        with self.lock:
+            self.instances.append(self)
+
+    def _next(self) -> str:
+        with self.lock:
+            _PaddleOCR.read += 1
+            return f"text {_PaddleOCR.read}"
+
+    def predict(self, images):
+        self.predicted.append(len(images))
+        time.sleep(0.05)
+        return [{"rec_texts": [self._next(), "  "]} for _ in images]
+
+    def ocr(self, image):
+        self.single += 1
+        return [[[None, (self._next(), 0.9)]]]
+
+
+@pytest.fixture
+def paddle(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("RASTER_WORKERS", "1")
+    monkeypatch.delenv("PADDLEOCR_BATCH_SIZE", raising=False)
+    module = types.ModuleType("paddleocr")
+    module.__spec__ = importlib.machinery.ModuleSpec("paddleocr", None)
+    module.PaddleOCR = _PaddleOCR
+    monkeypatch.setitem(sys.modules, "paddleocr", module)
+    # A manager of its own, so each converter registers its pool afresh.
+    monkeypatch.setattr(paddleocr, "RUNTIMES", RuntimeManager(idle_timeout=0, budget_mb=0))
+    _PaddleOCR.instances = []
+    _PaddleOCR.read = 0
+    return _PaddleOCR
+
+
+def test_pages_are_predicted_in_batches(paddle, monkeypatch) -> None:
+    monkeypatch.setenv("PADDLEOCR_INSTANCES", "1")
+    converter = paddleocr.PaddleOcrConverter()
+    pages = list(converter.iter_pages(SAMPLE_PDF, {"maxPages": 5, "batchSize": 2}))
+
+    [instance] = paddle.instances
+    # The last batch holds a single page and goes through `ocr`.
+    assert instance.predicted == [2, 2] and instance.single == 1
+    assert pages == [f"## Page {page}\n\ntext {page}" for page in range(1, 6)]
+    assert converter.last_run["engine_used"] == "paddleocr"
+
+
+def test_batches_spread_over_instances_that_split_the_cores(paddle, monkeypatch) -> None:
+    monkeypatch.setenv("PADDLEOCR_INSTANCES", "2")
+    monkeypatch.setattr(paddleocr.os, "cpu_count", lambda: 4)
+    converter = paddleocr.PaddleOcrConverter()
+    pages = list(converter.iter_pages(SAMPLE_PDF, {"maxPages": 8, "batchSize": 2}))
+
+    assert [page.split("\n")[0] for page in pages] == [f"## Page {page}" for page in range(1, 9)]
+    assert len(paddle.instances) == 2
+    assert sum(sum(instance.predicted) for instance in paddle.instances) == 8
+    assert [instance.kwargs["cpu_threads"] for instance in paddle.instances] == [2, 2]
+    runtimes = paddleocr.RUNTIMES.describe("paddleocr")
+    assert [(runtime["name"], runtime["state"]) for runtime in runtimes] == [
+        ("paddleocr-0", "loaded"),
+        ("paddleocr-1", "loaded"),
+    ]
@@ -0,0 +1,115 @@
+from pathlib import Path
+
+import fitz
+
+from backend.app.page_cache import PageMemo, page_fingerprint
+from backend.app.page_workers import memo_jobs
+from backend.app.rasters import PageImages
+from backend.app.result_cache import DirectoryCacheBackend, ResultCache
+
+SAMPLE_PDF = str(Path(__file__).resolve().parents[2] / "pdfs" / "xrayreports4.pdf")
+
+
+def _cache(tmp_path: Path) -> ResultCache:
+    return ResultCache(DirectoryCacheBackend(tmp_path / "pages", 16 * 1024 * 1024))
+
+
+def test_missed_page_stays_missed_when_stored_concurrently(tmp_path: Path) -> None:
+    cache = _cache(tmp_path)
+    with PageMemo(cache, SAMPLE_PDF, "test") as memo:
+        misses = memo.missing([1, 2, 3])
+        assert misses == [1, 2, 3]
+
+        # Another request finishes page 2 after this one has queued it for rendering.
+        with PageMemo(cache, SAMPLE_PDF, "test") as other:
+            other.store(2, "from another request")
+        assert memo.lookup(2) is None
+
+        with PageImages(SAMPLE_PDF, misses, dpi=40, adaptive=False) as images:
+            jobs = list(memo_jobs([1, 2, 3], memo, images))
+
+    assert [page for page, _, _ in jobs] == [1, 2, 3]
+    assert all(cached is None and image is not None for _, cached, image in jobs)
+
+
+def test_hits_are_served_without_rendering(tmp_path: Path) -> None:
+    cache = _cache(tmp_path)
+    with PageMemo(cache, SAMPLE_PDF, "test") as memo:
+        memo.store(1, "cached page")
+    with PageMemo(cache, SAMPLE_PDF, "test") as memo:
+        misses = memo.missing([1, 2])
+        assert misses == [2]
+        with PageImages(SAMPLE_PDF, misses, dpi=40, adaptive=False) as images:
+            jobs = list(memo_jobs([1, 2], memo, images))
+
+    assert jobs[0] == (1, "cached page", None)
+    assert jobs[1][1] is None and jobs[1][2] is not None
+
+
+def _annotated_pdf() -> bytes:
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_font(fontname="F1", fontbuffer=fitz.Font("cjk").buffer)
+    page.insert_text((50, 50), "Hello", fontname="F1")
+    page.add_freetext_annot(fitz.Rect(50, 100, 300, 150), "first note")
+    return doc.tobytes()
+
+
+def _fingerprint(data: bytes) -> str:
+    with fitz.open("pdf", data) as doc:
+        return page_fingerprint(doc, 0)
+
+
+def test_fingerprint_is_stable() -> None:
+    data = _annotated_pdf()
+    assert _fingerprint(data) == _fingerprint(data)
+
+
+def test_fingerprint_covers_annotation_appearance() -> None:
+    data = _annotated_pdf()
+    with fitz.open("pdf", data) as doc:
+        page = doc[0]
+        annot = page.first_annot
+        annot.set_info(content="second note")
+        annot.update()
+        edited = doc.tobytes()
+    assert _fingerprint(edited) != _fingerprint(data)
+
+
+def test_fingerprint_covers_font_programs() -> None:
+    data = _annotated_pdf()
+    with fitz.open("pdf", data) as doc:
+        # Swap the embedded font program and keep every name.
+        descriptor = next(
+            xref for xref in range(1, doc.xref_length()) if doc.xref_get_key(xref, "FontFile2")[0] == "xref"
+        )
+        program = int(doc.xref_get_key(descriptor, "FontFile2")[1].split()[0])
+        doc.update_stream(program, doc.xref_stream(program) + b"\0")
+        edited = doc.tobytes()
+    with fitz.open("pdf", edited) as doc:
+        assert [font[1:5] for font in doc[0].get_fonts(full=True)] == [
+            font[1:5] for font in fitz.open("pdf", data)[0].get_fonts(full=True)
+        ]
+    assert _fingerprint(edited) != _fingerprint(data)
+
+
+def test_edited_document_only_misses_the_changed_page(tmp_path: Path) -> None:
+    original = tmp_path / "original.pdf"
+    edited = tmp_path / "edited.pdf"
+    doc = fitz.open()
+    for text in ("first page", "second page", "third page"):
+        doc.new_page().insert_text((72, 72), text)
+    doc.save(original)
+    doc[1].insert_text((72, 144), "an added line")
+    doc.save(edited)
+    doc.close()
+
+    cache = _cache(tmp_path)
+    with PageMemo(cache, str(original), "test") as memo:
+        for page in memo.missing([1, 2, 3]):
+            memo.store(page, f"page {page}")
+    with PageMemo(cache, str(edited), "test") as memo:
+        assert memo.missing([1, 2, 3]) == [2]
+        assert memo.lookup(1) == "page 1" and memo.hits == 2
+    with PageMemo(cache, str(edited), "other engine") as memo:
+        assert memo.missing([1, 2, 3]) == [1, 2, 3]
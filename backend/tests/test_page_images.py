@@ -0,0 +1,75 @@
+import threading
+import time
+from pathlib import Path
+
+import fitz
+import pytest
+
+from backend.app import rasters
+from backend.app.rasters import PageImages, page_range, render_pdf_page
+
+SAMPLE_PDF = str(Path(__file__).resolve().parents[2] / "pdfs" / "xrayreports4.pdf")
+
+
+@pytest.fixture
+def renders(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    monkeypatch.setenv("RASTER_WORKERS", "1")
+    rendered: list[int] = []
+    render_page = rasters.render_page
+
+    def counting(doc, page_number, dpi=200, layout="pil"):
+        rendered.append(page_number)
+        return render_page(doc, page_number, dpi, layout)
+
+    monkeypatch.setattr(rasters, "render_page", counting)
+    return rendered
+
+
+def test_prefetch_stays_a_bounded_distance_ahead(renders) -> None:
+    pages, _ = page_range(SAMPLE_PDF)
+    ahead: list[int] = []
+    with PageImages(SAMPLE_PDF, pages, dpi=50, prefetch=2, adaptive=False) as images:
+        for consumed, (page_number, _) in enumerate(images, start=1):
+            time.sleep(0.05)  # a slow OCR stage
+            ahead.append(len(renders) - consumed)
+    assert renders == pages
+    # Two pages queued plus the one the renderer holds while it waits for room.
+    assert max(ahead) <= 3
+
+
+def test_closing_early_stops_the_renderer(renders) -> None:
+    with PageImages(SAMPLE_PDF, list(range(1, 12)), dpi=50, prefetch=1, adaptive=False) as images:
+        assert images.take(1) is not None
+    time.sleep(0.2)
+    assert len(renders) <= 3
+    assert not any(thread.name == "page-prefetch" for thread in threading.enumerate())
+
+
+def test_pages_must_be_taken_in_order(renders) -> None:
+    with PageImages(SAMPLE_PDF, [1, 2, 3], dpi=50, prefetch=0, adaptive=False) as images:
+        with pytest.raises(ValueError, match="out of order"):
+            images.take(2)
+        images.take(1)
+        images.take(2)
+    assert renders == [1, 2]
+
+
+def test_render_errors_reach_the_consumer(monkeypatch) -> None:
+    monkeypatch.setenv("RASTER_WORKERS", "1")
+
+    def failing(doc, page_number, dpi=200, layout="pil"):
+        raise RuntimeError(f"cannot render page {page_number}")
+
+    monkeypatch.setattr(rasters, "render_page", failing)
+    with PageImages(SAMPLE_PDF, [1, 2], dpi=50, prefetch=2, adaptive=False) as images:
+        with pytest.raises(RuntimeError, match="cannot render page 1"):
+            images.take(1)
+
+
+def test_single_page_render_scales_with_dpi() -> None:
+    with fitz.open(SAMPLE_PDF) as doc:
+        rect = doc.load_page(0).rect
+    image = render_pdf_page(SAMPLE_PDF, 1, dpi=144, adaptive=False)
+    assert abs(image.width - rect.width * 2) <= 1 and abs(image.height - rect.height * 2) <= 1
+    assert page_range(SAMPLE_PDF, max_pages=3) == ([1, 2, 3], 11)
+    assert page_range(SAMPLE_PDF, first_page=10) == ([10, 11], 11)
@@ -0,0 +1,190 @@
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from backend.app import rasters
+from backend.app.page_workers import (
+    cpu_slice,
+    map_pages,
+    page_workers,
+    pipelined,
+    thread_budget,
+    threads_per_worker,
+)
+from backend.app.progress import count_detail, details_scope
+from backend.app.rasters import PageImages
+
+SAMPLE_PDF = str(Path(__file__).resolve().parents[2] / "pdfs" / "xrayreports4.pdf")
+
+
+def test_map_pages_keeps_order_and_runs_pages_concurrently() -> None:
+    running = [0]
+    peak = [0]
+    lock = threading.Lock()
+
+    def ocr(page: int) -> int:
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        # Later pages finish first.
+        time.sleep(0.01 * (10 - page))
+        with lock:
+            running[0] -= 1
+        return page * 10
+
+    assert list(map_pages(ocr, range(10), 4)) == [page * 10 for page in range(10)]
+    assert 1 < peak[0] <= 4
+
+
+def test_map_pages_reads_items_a_bounded_distance_ahead() -> None:
+    pulled: list[int] = []
+
+    def items():
+        for page in range(20):
+            pulled.append(page)
+            yield page
+
+    results = map_pages(lambda page: page, items(), 2)
+    assert next(results) == 0
+    # Up to 2 x workers submitted before the first result is handed back.
+    assert len(pulled) <= 5
+    results.close()
+
+
+def test_workers_get_their_share_of_the_cores_and_the_callers_scope() -> None:
+    budgets: list = []
+
+    def ocr(page: int) -> int:
+        budgets.append(thread_budget())
+        count_detail("pages")
+        return page
+
+    with details_scope() as details:
+        list(map_pages(ocr, range(6), 3))
+    assert budgets == [threads_per_worker(3)] * 6
+    assert details["pages"] == 6 and "ocr_busy" in details["stage_ms"]
+    assert thread_budget() is None
+
+
+def test_errors_surface_at_the_page_that_failed() -> None:
+    def ocr(page: int) -> int:
+        if page == 3:
+            raise RuntimeError("page 3 failed")
+        return page
+
+    results = map_pages(ocr, range(6), 2)
+    assert [next(results) for _ in range(3)] == [0, 1, 2]
+    with pytest.raises(RuntimeError, match="page 3 failed"):
+        next(results)
+
+
+def test_request_options_can_only_lower_the_page_workers(monkeypatch) -> None:
+    monkeypatch.setenv("OCR_PAGE_WORKERS", "4")
+    assert page_workers() == 4
+    assert page_workers({"ocrWorkers": 2}) == 2
+    assert page_workers({"ocrWorkers": 16}) == 4
+    for ignored in (0, -1, True, "2", 1.5):
+        assert page_workers({"ocrWorkers": ignored}) == 4
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_getaffinity"), reason="no CPU affinity API")
+def test_cpu_slices_are_disjoint_and_cover_the_cpus() -> None:
+    cpus = os.sched_getaffinity(0)
+    assert cpu_slice(0, 1) is None
+    assert cpu_slice(0, len(cpus) + 1) is None
+    if len(cpus) >= 2:
+        slices = [cpu_slice(index, 2) for index in range(2)]
+        assert slices[0] and slices[1] and not slices[0] & slices[1]
+        assert slices[0] | slices[1] == cpus
+
+
+def test_pipelined_overlaps_the_ocr_stage_with_the_consumer() -> None:
+    started: list[int] = []
+
+    def ocr(page: int) -> int:
+        started.append(page)
+        time.sleep(0.02)
+        return page
+
+    seen: list[int] = []
+    for page in pipelined(ocr, range(4), depth=1):
+        # While page N is assembled the stage thread is already working on page N+1.
+        time.sleep(0.05)
+        seen.append(page)
+        assert started[-1] >= min(page + 1, 3)
+    assert seen == [0, 1, 2, 3]
+
+
+def test_pipelined_stays_within_its_depth() -> None:
+    done: list[int] = []
+    results = pipelined(lambda page: done.append(page) or page, range(20), depth=2)
+    assert next(results) == 0
+    time.sleep(0.2)
+    # One handed out, two queued and one waiting for room in the queue.
+    assert len(done) <= 4
+    results.close()
+    assert not any(thread.name == "page-ocr" for thread in threading.enumerate())
+
+
+def test_pipelined_reraises_the_failure_and_closes_its_source() -> None:
+    closed: list[bool] = []
+
+    def items():
+        try:
+            yield from range(5)
+        finally:
+            closed.append(True)
+
+    def ocr(page: int) -> int:
+        if page == 2:
+            raise ValueError("page 2 failed")
+        return page
+
+    results = pipelined(ocr, items(), depth=2)
+    assert [next(results), next(results)] == [0, 1]
+    with pytest.raises(ValueError, match="page 2 failed"):
+        next(results)
+    assert closed == [True]
+
+
+def test_pipelined_records_stage_times_and_runs_inline_at_depth_zero() -> None:
+    threads: list[str] = []
+    with details_scope() as details:
+        assert list(pipelined(lambda page: threads.append(threading.current_thread().name) or page, range(3))) == [
+            0,
+            1,
+            2,
+        ]
+    assert set(threads) == {"page-ocr"}
+    assert {"ocr_busy", "ocr_idle", "assemble_busy", "assemble_idle"} <= set(details["stage_ms"])
+
+    threads.clear()
+    list(pipelined(lambda page: threads.append(threading.current_thread().name) or page, range(3), depth=0))
+    assert set(threads) == {threading.current_thread().name}
+
+
+def test_closing_page_images_mid_render_closes_the_document_after_the_renderer(monkeypatch) -> None:
+    monkeypatch.setenv("RASTER_WORKERS", "1")
+    rendering = threading.Event()
+    failures: list[Exception] = []
+    render_page = rasters.render_page
+
+    def slow(doc, page_number, dpi=200, layout="pil"):
+        rendering.set()
+        time.sleep(0.2)
+        # The document must still be open while the prefetch thread uses it.
+        try:
+            return render_page(doc, page_number, dpi, layout)
+        except Exception as exc:
+            failures.append(exc)
+            raise
+
+    monkeypatch.setattr(rasters, "render_page", slow)
+    images = PageImages(SAMPLE_PDF, [1, 2, 3], dpi=50, prefetch=2, adaptive=False)
+    images._start()
+    assert rendering.wait(5)
+    images.close()
+    assert failures == [] and images._doc is None and images._thread is None
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageOps
+
+from backend.app.preprocess import autocontrast_lut, binarize
+
+
+def _page(seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.integers(30, 220, size=(40, 60), dtype=np.uint8)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_autocontrast_lut_matches_pil(seed: int) -> None:
+    gray = _page(seed)
+    expected = np.asarray(ImageOps.autocontrast(Image.fromarray(gray), cutoff=0))
+    assert np.array_equal(autocontrast_lut(gray)[gray], expected)
+
+
+def test_flat_pages_keep_their_levels() -> None:
+    flat = np.full((4, 4), 128, dtype=np.uint8)
+    assert np.array_equal(autocontrast_lut(flat), np.arange(256, dtype=np.uint8))
+    assert np.array_equal(autocontrast_lut(flat[:0]), np.arange(256, dtype=np.uint8))
+
+
+@pytest.mark.parametrize("threshold", [100, 185, 250])
+def test_binarize_equals_autocontrast_then_threshold(threshold: int) -> None:
+    gray = _page()
+    original = gray.copy()
+    stretched = np.asarray(ImageOps.autocontrast(Image.fromarray(gray), cutoff=0))
+
+    out = binarize(gray, threshold=threshold, factor=1)
+
+    assert np.array_equal(out, np.where(stretched >= threshold, 255, 0).astype(np.uint8))
+    assert np.array_equal(gray, original) and out is not gray
+
+
+def test_binarize_upscales_to_a_two_level_page() -> None:
+    out = binarize(_page(), factor=2)
+    assert out.shape == (80, 120) and out.dtype == np.uint8
+    assert set(np.unique(out)) <= {0, 255}
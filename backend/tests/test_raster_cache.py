@@ -0,0 +1,84 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from backend.app import rasters
+from backend.app.raster_cache import RasterCache, current_raster_cache, raster_scope
+from backend.app.rasters import PageImages
+
+SAMPLE_PDF = str(Path(__file__).resolve().parents[2] / "pdfs" / "xrayreports4.pdf")
+
+
+@pytest.fixture
+def renders(monkeypatch: pytest.MonkeyPatch) -> list[tuple[int, int]]:
+    monkeypatch.setenv("RASTER_WORKERS", "1")
+    calls: list[tuple[int, int]] = []
+    render_page = rasters.render_page
+
+    def counting(doc, page_number, dpi=200, layout="pil"):
+        calls.append((page_number, dpi))
+        return render_page(doc, page_number, dpi, layout)
+
+    monkeypatch.setattr(rasters, "render_page", counting)
+    return calls
+
+
+def _pages(page_numbers: list[int], dpi: int, layout: str = "pil", prefetch: int = 0) -> list:
+    with PageImages(SAMPLE_PDF, page_numbers, dpi=dpi, prefetch=prefetch, layout=layout, adaptive=False) as images:
+        return [image for _, image in images]
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_pages_render_once_per_request_scope(renders, prefetch: int) -> None:
+    cache = RasterCache(max_mb=64)
+    with raster_scope(cache):
+        first = _pages([1, 2], dpi=72, prefetch=prefetch)
+        second = _pages([1, 2], dpi=72, prefetch=prefetch)
+
+    assert renders == [(1, 72), (2, 72)]
+    assert cache.hits == 2 and [image.size for image in second] == [image.size for image in first]
+    assert current_raster_cache() is None
+
+    # Outside the scope every pass renders again.
+    _pages([1], dpi=72)
+    assert renders[-1] == (1, 72) and len(renders) == 3
+
+
+def test_lower_dpi_is_downsampled_from_a_cached_render(renders) -> None:
+    cache = RasterCache(max_mb=64)
+    with raster_scope(cache):
+        [large] = _pages([1], dpi=100)
+        [small] = _pages([1], dpi=50)
+        [again] = _pages([1], dpi=50)
+
+    assert renders == [(1, 100)]
+    assert small.size == (round(large.width / 2), round(large.height / 2))
+    assert again is small
+
+
+def test_colorspaces_are_cached_separately(renders) -> None:
+    cache = RasterCache(max_mb=64)
+    with raster_scope(cache):
+        [rgb] = _pages([1], dpi=50, layout="rgb")
+        [gray] = _pages([1], dpi=50, layout="gray")
+        [pil] = _pages([1], dpi=50, layout="pil")
+
+    assert renders == [(1, 50), (1, 50)]
+    assert rgb.ndim == 3 and gray.ndim == 2
+    assert isinstance(pil, Image.Image) and pil.size == (rgb.shape[1], rgb.shape[0])
+
+
+def test_budget_drops_least_recently_used_pages_but_keeps_page_one() -> None:
+    page = np.zeros((512, 1024), dtype=np.uint8)  # 0.5 MB
+    cache = RasterCache(max_mb=1.2)
+    for page_number in (1, 2, 3):
+        cache.put("doc.pdf", page_number, 100, page, "gray")
+
+    assert cache.has("doc.pdf", 1, 100, "gray")
+    assert not cache.has("doc.pdf", 2, 100, "gray")
+    assert cache.has("doc.pdf", 3, 100, "gray")
+
+    cache.put("big.pdf", 1, 100, np.zeros((2048, 1024), dtype=np.uint8))
+    assert not cache.has("big.pdf", 1, 100)
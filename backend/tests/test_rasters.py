@@ -0,0 +1,76 @@
+import importlib.machinery
+import sys
+import types
+from pathlib import Path
+
+import fitz
+import numpy as np
+import pytest
+
+from backend.app.raster_cache import RasterCache, raster_scope
+from backend.app.rasters import PageImages, render_page
+
+SAMPLE_PDF = str(Path(__file__).resolve().parents[2] / "pdfs" / "xrayreports4.pdf")
+
+
+class _Reader:
+    # Mirrors easyocr's `reformat_input`, which only accepts an exact `np.ndarray`.
+    seen: list = []
+
+    def __init__(self, langs, gpu=False):
+        pass
+
+    def readtext(self, image, detail=0, paragraph=True):
+        if type(image) != np.ndarray:
+            raise ValueError("Invalid input type")
+        self.seen.append(image.shape)
+        return ["page text"]
+
+
+@pytest.fixture
+def fake_easyocr(monkeypatch: pytest.MonkeyPatch):
+    module = types.ModuleType("easyocr")
+    module.__spec__ = importlib.machinery.ModuleSpec("easyocr", None)
+    module.Reader = _Reader
+    monkeypatch.setitem(sys.modules, "easyocr", module)
+    _Reader.seen = []
+    return _Reader
+
+
+@pytest.mark.parametrize("layout", ["rgb", "gray"])
+def test_array_layouts_are_plain_ndarrays(layout: str) -> None:
+    with fitz.open(SAMPLE_PDF) as doc:
+        image = render_page(doc, 1, 40, layout)
+    assert type(image) is np.ndarray
+    assert image.ndim == (3 if layout == "rgb" else 2)
+
+
+def test_array_view_outlives_the_pixmap() -> None:
+    with fitz.open(SAMPLE_PDF) as doc:
+        image = render_page(doc, 1, 40, "rgb")
+    expected = image.copy()
+    band = image[5:15]
+    del image
+    assert np.array_equal(band, expected[5:15])
+
+
+@pytest.mark.parametrize("workers", ["1", "4"])
+def test_page_images_rgb_pages_feed_euro_ocr(
+    fake_easyocr, monkeypatch: pytest.MonkeyPatch, workers: str
+) -> None:
+    from backend.app.models.euro_ocr import EuroOcrConverter
+
+    monkeypatch.setenv("RASTER_WORKERS", workers)
+    converter = EuroOcrConverter()
+    # A second pass over the same pages is served from the request's raster cache.
+    with raster_scope(RasterCache()):
+        for _ in range(2):
+            pages = list(converter.iter_pages(SAMPLE_PDF, {"maxPages": 2}))
+            assert converter.last_run["fallback_used"] is False
+            assert pages == ["## Page 1\n\npage text", "## Page 2\n\npage text"]
+    assert len(fake_easyocr.seen) == 4
+
+
+def test_page_images_rgb_layout_hands_out_plain_arrays() -> None:
+    with PageImages(SAMPLE_PDF, [1, 2], dpi=40, layout="rgb", adaptive=False) as images:
+        assert all(type(image) is np.ndarray for _, image in images)
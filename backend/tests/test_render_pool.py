@@ -0,0 +1,72 @@
+import os
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from backend.app import rasters
+from backend.app.rasters import PageImages, shutdown_render_pool
+
+SAMPLE_PDF = str(Path(__file__).resolve().parents[2] / "pdfs" / "xrayreports4.pdf")
+PAGES = [1, 2, 3, 4, 5]
+
+
+def _render(workers: int, layout: str, monkeypatch: pytest.MonkeyPatch) -> list[np.ndarray]:
+    monkeypatch.setenv("RASTER_WORKERS", str(workers))
+    monkeypatch.setenv("RASTER_SHARD_PAGES", "2")
+    with PageImages(SAMPLE_PDF, PAGES, dpi=60, prefetch=2, layout=layout, adaptive=False) as images:
+        return [np.asarray(image) for _, image in images]
+
+
+def _shared_blocks() -> set[str]:
+    # `SharedMemory` blocks (multiprocessing's own semaphores live next to them).
+    names = os.listdir("/dev/shm") if os.path.isdir("/dev/shm") else []
+    return {name for name in names if name.startswith("psm_")}
+
+
+@pytest.mark.parametrize("layout", ["pil", "rgb", "gray"])
+def test_sharded_rendering_matches_in_process_rendering(monkeypatch, layout: str) -> None:
+    monkeypatch.setattr(rasters, "_pool_broken", False)
+    collected: list[list[int]] = []
+    collect_shard = rasters._collect_shard
+
+    def collect(name, entries, layout):
+        collected.append([entry[0] for entry in entries])
+        return collect_shard(name, entries, layout)
+
+    monkeypatch.setattr(rasters, "_collect_shard", collect)
+    before = _shared_blocks()
+    try:
+        local = _render(1, layout, monkeypatch)
+        sharded = _render(2, layout, monkeypatch)
+    finally:
+        shutdown_render_pool()
+
+    assert collected == [[1, 2], [3, 4], [5]]
+    for expected, actual in zip(local, sharded):
+        assert actual.shape == expected.shape and np.array_equal(actual, expected)
+    # Every shard's shared-memory block is unlinked once its pages are copied out.
+    assert _shared_blocks() <= before
+
+
+class _BrokenPool:
+    def submit(self, *args, **kwargs) -> Future:
+        future: Future = Future()
+        future.set_exception(BrokenProcessPool("worker died at start-up"))
+        return future
+
+
+def test_broken_pool_falls_back_to_in_process_rendering(monkeypatch) -> None:
+    monkeypatch.setattr(rasters, "_pool_broken", False)
+    monkeypatch.setattr(rasters, "_render_pool", lambda workers: _BrokenPool())
+    local = _render(1, "gray", monkeypatch)
+
+    fallback = _render(2, "gray", monkeypatch)
+
+    assert all(np.array_equal(a, b) for a, b in zip(local, fallback)) and len(fallback) == len(PAGES)
+    # Later requests skip the pool entirely.
+    assert rasters._pool_broken
+    monkeypatch.setattr(rasters, "_render_pool", lambda workers: pytest.fail("pool used after it broke"))
+    assert len(_render(2, "gray", monkeypatch)) == len(PAGES)
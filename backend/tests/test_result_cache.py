@@ -0,0 +1,38 @@
+import time
+from pathlib import Path
+
+from backend.app.result_cache import DirectoryCacheBackend, ResultCache, make_cache_key
+
+
+def test_execution_only_options_do_not_change_the_key() -> None:
+    base = make_cache_key("sha", "ocr-only", {"maxPages": 3}, "1")
+    assert make_cache_key("sha", "ocr-only", {"maxPages": 3, "ocrWorkers": 2}, "1") == base
+    assert make_cache_key("sha", "ocr-only", {"batchSize": 8, "maxPages": 3}, "1") == base
+
+
+def test_output_options_change_the_key() -> None:
+    base = make_cache_key("sha", "ocr-only", {"maxPages": 3}, "1")
+    assert make_cache_key("sha", "ocr-only", {"maxPages": 4}, "1") != base
+    assert make_cache_key("sha", "doctr-eu", {"maxPages": 3}, "1") != base
+    assert make_cache_key("sha", "ocr-only", {"maxPages": 3}, "2") != base
+    assert make_cache_key("other", "ocr-only", {"maxPages": 3}, "1") != base
+
+
+def test_key_ignores_option_order() -> None:
+    assert make_cache_key("sha", "m", {"a": 1, "b": 2}, "1") == make_cache_key("sha", "m", {"b": 2, "a": 1}, "1")
+
+
+def test_directory_backend_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = ResultCache(DirectoryCacheBackend(tmp_path, max_bytes=200))
+    # Recency is the files' mtime; the pauses keep it apart on coarse-grained filesystems.
+    cache.put("a", {"markdown": "x" * 60})
+    time.sleep(0.05)
+    cache.put("b", {"markdown": "y" * 60})
+    time.sleep(0.05)
+    assert cache.get("a") is not None
+    time.sleep(0.05)
+    cache.put("c", {"markdown": "z" * 60})
+
+    assert cache.get("a") == {"markdown": "x" * 60}
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
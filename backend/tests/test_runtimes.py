@@ -0,0 +1,105 @@
+import time
+
+from backend.app.runtimes import RuntimeManager
+
+
+class _Loader:
+    def __init__(self, name: str):
+        self.name = name
+        self.loads = 0
+
+    def __call__(self) -> str:
+        self.loads += 1
+        return f"{self.name} #{self.loads}"
+
+
+def _state(manager: RuntimeManager, owner: str) -> str:
+    return manager.describe(owner)[0]["state"]
+
+
+def test_runtime_loads_on_first_get_only() -> None:
+    manager = RuntimeManager(idle_timeout=60, budget_mb=0)
+    loader = _Loader("ocr")
+    handle = manager.register("ocr", loader, estimate_mb=100)
+
+    with handle.lease():
+        pass
+    assert loader.loads == 0 and _state(manager, "ocr") == "unloaded"
+    with handle.lease() as lease:
+        assert lease.get() == "ocr #1"
+        assert lease.get() == "ocr #1"
+    with handle.lease() as lease:
+        assert lease.get() == "ocr #1"
+    assert loader.loads == 1
+
+
+def test_idle_runtimes_are_evicted_but_leased_ones_are_not() -> None:
+    manager = RuntimeManager(idle_timeout=60, budget_mb=0)
+    busy = manager.register("busy", _Loader("busy"), estimate_mb=100)
+    idle = manager.register("idle", _Loader("idle"), estimate_mb=100)
+    with idle.lease() as lease:
+        lease.get()
+
+    with busy.lease() as lease:
+        lease.get()
+        assert manager.evict_idle(now=time.time() + 120) == ["idle"]
+        assert _state(manager, "busy") == "loaded"
+    assert manager.evict_idle(now=time.time() + 120) == ["busy"]
+    assert manager.describe("idle")[0]["last_eviction_reason"] == "idle timeout"
+    assert _state(manager, "idle") == "evicted"
+
+
+def test_warm_owners_are_exempt_from_idle_eviction() -> None:
+    manager = RuntimeManager(idle_timeout=60, budget_mb=0)
+    handle = manager.register("warm", _Loader("warm"), owner="warm-model", estimate_mb=100)
+    manager.keep_warm("warm-model")
+    with handle.lease() as lease:
+        lease.get()
+    assert manager.evict_idle(now=time.time() + 10**6) == []
+
+
+def test_memory_budget_unloads_least_recently_used_idle_runtimes() -> None:
+    manager = RuntimeManager(idle_timeout=0, budget_mb=250)
+    handles = {name: manager.register(name, _Loader(name), estimate_mb=100) for name in ("a", "b", "c")}
+    for name in ("a", "b", "a"):
+        with handles[name].lease() as lease:
+            lease.get()
+        time.sleep(0.01)
+
+    # Loading "c" goes over the budget; "b" is the least recently used idle runtime.
+    with handles["c"].lease() as lease:
+        lease.get()
+        states = {name: _state(manager, name) for name in handles}
+    assert states == {"a": "loaded", "b": "evicted", "c": "loaded"}
+    assert manager.describe("b")[0]["last_eviction_reason"] == "memory budget"
+
+
+def test_budget_never_unloads_a_runtime_in_use() -> None:
+    manager = RuntimeManager(idle_timeout=0, budget_mb=150)
+    first = manager.register("first", _Loader("first"), estimate_mb=100)
+    second = manager.register("second", _Loader("second"), estimate_mb=100)
+    with first.lease() as held:
+        held.get()
+        with second.lease() as lease:
+            lease.get()
+        assert _state(manager, "first") == "loaded"
+        assert _state(manager, "second") == "loaded"
+
+
+def test_pool_checkout_prefers_loaded_instances() -> None:
+    manager = RuntimeManager(idle_timeout=0, budget_mb=0)
+    loads: list[int] = []
+    pool = manager.register_pool("paddle", lambda index: loads.append(index) or index, size=3, estimate_mb=10)
+
+    for _ in range(3):
+        with pool.checkout() as (index, lease):
+            assert lease.get() == index
+    assert loads == [0]
+
+    # Only overlapping callers grow the pool.
+    with pool.checkout() as (first, lease):
+        lease.get()
+        with pool.checkout() as (second, other):
+            other.get()
+    assert (first, second) == (0, 1) and loads == [0, 1]
+    assert [runtime["name"] for runtime in manager.describe("paddle")] == ["paddle-0", "paddle-1", "paddle-2"]
@@ -0,0 +1,120 @@
+import json
+import threading
+from typing import Any, Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app import main
+from backend.app.adapters.local import LocalModelAdapter
+from backend.app.models.base import LastRun, ModelDefinition
+
+
+class _PagedConverter:
+    last_run = LastRun()
+
+    def __init__(self, pages: int = 3, fail_at: int | None = None):
+        self.pages = pages
+        self.fail_at = fail_at
+        self.closed = False
+        self.last_run = {"engine_used": "paged", "provider_used": "local", "fallback_used": False, "note": None}
+
+    def convert(self, pdf_path: str, options: dict[str, Any] | None = None) -> str:
+        return "\n\n".join(self.iter_pages(pdf_path, options)) + "\n"
+
+    def iter_pages(self, pdf_path: str, options: dict[str, Any] | None = None) -> Iterator[str]:
+        try:
+            for page in range(1, self.pages + 1):
+                if page == self.fail_at:
+                    raise RuntimeError(f"page {page} failed")
+                yield f"## Page {page}\n\ntext {page}"
+        finally:
+            self.closed = True
+
+
+class _WholeDocumentConverter:
+    def convert(self, pdf_path: str, options: dict[str, Any] | None = None) -> str:
+        return "## Page 1\n\nfirst\n\n## Page 2\n\nsecond\n"
+
+
+def _adapter(converter: Any) -> LocalModelAdapter:
+    return LocalModelAdapter(ModelDefinition(model_id="paged", description="", converter=converter))
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch):
+    async def no_charts(markdown, pdf_path, options, rasters=None):
+        return [], {"engine_used": "none"}
+
+    monkeypatch.setattr(main, "_extract_charts", no_charts)
+    return TestClient(main.app)
+
+
+def _post(client: TestClient, monkeypatch: pytest.MonkeyPatch, converter: Any, stream: str):
+    monkeypatch.setattr(main.REGISTRY, "get", lambda model_id: _adapter(converter))
+    return client.post(
+        f"/convert/paged?stream={stream}",
+        files={"file": ("doc.pdf", b"%PDF-1.4 not really", "application/pdf")},
+    )
+
+
+def test_ndjson_streams_each_page_then_the_result(client, monkeypatch: pytest.MonkeyPatch) -> None:
+    response = _post(client, monkeypatch, _PagedConverter(), "ndjson")
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [(event["event"], event.get("page")) for event in events] == [
+        ("page", 1),
+        ("page", 2),
+        ("page", 3),
+        ("result", None),
+    ]
+    assert events[0]["markdown"] == "## Page 1\n\ntext 1"
+    result = events[-1]
+    assert "## Page 3" in result["markdown"]
+    assert result["execution"]["engine_used"] == "paged"
+    assert result["execution"]["time_to_first_page_ms"] is not None
+
+
+def test_sse_uses_named_events(client, monkeypatch: pytest.MonkeyPatch) -> None:
+    response = _post(client, monkeypatch, _PagedConverter(pages=1), "sse")
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    blocks = [block for block in response.text.split("\n\n") if block]
+    assert [block.splitlines()[0] for block in blocks] == ["event: page", "event: result"]
+    assert json.loads(blocks[0].splitlines()[1].removeprefix("data: "))["page"] == 1
+
+
+def test_whole_document_converters_are_replayed_per_page(client, monkeypatch: pytest.MonkeyPatch) -> None:
+    response = _post(client, monkeypatch, _WholeDocumentConverter(), "ndjson")
+
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event.get("page") for event in events if event["event"] == "page"] == [1, 2]
+
+
+def test_failure_ends_the_stream_with_an_error_event(client, monkeypatch: pytest.MonkeyPatch) -> None:
+    response = _post(client, monkeypatch, _PagedConverter(fail_at=2), "ndjson")
+
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["event"] for event in events] == ["page", "error"]
+    assert "page 2 failed" in events[-1]["detail"]
+
+
+def test_unknown_stream_format_is_rejected(client, monkeypatch: pytest.MonkeyPatch) -> None:
+    assert _post(client, monkeypatch, _PagedConverter(), "xml").status_code == 400
+
+
+def test_cancelled_stream_stops_after_the_page_in_progress() -> None:
+    converter = _PagedConverter(pages=5)
+    cancelled = threading.Event()
+    emitted: list[str] = []
+
+    def emit(chunk: str) -> None:
+        emitted.append(chunk)
+        cancelled.set()
+
+    markdown, _ = main._stream_document(_adapter(converter), "paged", "doc.pdf", {}, emit, cancelled=cancelled)
+
+    assert emitted == ["## Page 1\n\ntext 1"]
+    assert markdown.strip() == "## Page 1\n\ntext 1"
+    assert converter.closed
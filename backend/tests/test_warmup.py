@@ -0,0 +1,117 @@
+import asyncio
+import os
+from typing import Any
+
+from fastapi import Response
+
+from backend.app import main, page_cache
+from backend.app.adapters.local import LocalModelAdapter
+from backend.app.execution import ConversionExecutor
+from backend.app.models.base import ModelDefinition
+from backend.app.runtimes import RUNTIMES
+from backend.app.warmup import Warmup
+
+
+class _Converter:
+    def __init__(self, available: bool = True, error: Exception | None = None):
+        self.available = available
+        self.error = error
+        self.calls: list[dict[str, Any]] = []
+
+    def is_available(self) -> tuple[bool, str | None]:
+        return (True, None) if self.available else (False, "runtime missing")
+
+    def convert(self, pdf_path: str, options: dict[str, Any] | None = None) -> str:
+        self.calls.append(
+            {
+                "exists": os.path.exists(pdf_path),
+                "path": pdf_path,
+                "options": options,
+                "bypassed": page_cache.page_memo(pdf_path, "warm").cache is None,
+            }
+        )
+        if self.error is not None:
+            raise self.error
+        return "## Page 1\n\nWarm-up page"
+
+
+def _adapter(model_id: str, converter: _Converter, warm: bool = False) -> LocalModelAdapter:
+    adapter = LocalModelAdapter(ModelDefinition(model_id=model_id, description="", converter=converter))
+    adapter.info.warm = warm
+    return adapter
+
+
+async def _warm(adapters: dict[str, LocalModelAdapter]) -> Warmup:
+    warmup = Warmup(ConversionExecutor(max_workers=2))
+    warmup.start(adapters)
+    await asyncio.wait_for(warmup.finished.wait(), timeout=30)
+    return warmup
+
+
+def test_nothing_is_warmed_by_default(monkeypatch) -> None:
+    monkeypatch.delenv("WARM_MODELS", raising=False)
+    converter = _Converter()
+    warmup = asyncio.run(_warm({"lazy": _adapter("lazy", converter)}))
+    assert warmup.ready and warmup.states == {} and converter.calls == []
+
+
+def test_opted_in_models_convert_one_synthetic_page(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("WARM_MODELS", "listed")
+    monkeypatch.setenv("PAGE_CACHE_BACKEND", "directory")
+    monkeypatch.setenv("PAGE_CACHE_PATH", str(tmp_path))
+    monkeypatch.setattr(page_cache, "_page_cache", None)
+    monkeypatch.setattr(page_cache, "_page_cache_built", False)
+    assert page_cache.page_memo("unused.pdf", "warm").enabled
+    monkeypatch.setattr(RUNTIMES, "_warm_owners", set())
+    flagged, listed, other = _Converter(), _Converter(), _Converter()
+    adapters = {
+        "flagged": _adapter("flagged", flagged, warm=True),
+        "listed": _adapter("listed", listed),
+        "other": _adapter("other", other),
+    }
+
+    warmup = asyncio.run(_warm(adapters))
+
+    assert {model_id: state.status for model_id, state in warmup.states.items()} == {
+        "flagged": "ready",
+        "listed": "ready",
+    }
+    assert other.calls == []
+    for converter in (flagged, listed):
+        [call] = converter.calls
+        assert call["exists"] and call["options"] == {"maxPages": 1}
+        # The page cache is skipped during warm-up, and the synthetic PDF is removed after.
+        assert call["bypassed"] and not os.path.exists(call["path"])
+    assert RUNTIMES._warm_owners == {"flagged", "listed"}
+
+
+def test_warmup_can_be_switched_off(monkeypatch) -> None:
+    monkeypatch.setenv("MODEL_WARMUP", "off")
+    converter = _Converter()
+    warmup = asyncio.run(_warm({"flagged": _adapter("flagged", converter, warm=True)}))
+    assert warmup.ready and warmup.states["flagged"].status == "skipped"
+    assert converter.calls == []
+
+
+def test_unavailable_and_failing_models_do_not_block_readiness(monkeypatch) -> None:
+    monkeypatch.setattr(RUNTIMES, "_warm_owners", set())
+    adapters = {
+        "missing": _adapter("missing", _Converter(available=False), warm=True),
+        "broken": _adapter("broken", _Converter(error=RuntimeError("boom")), warm=True),
+    }
+    warmup = asyncio.run(_warm(adapters))
+    assert warmup.states["missing"].status == "skipped"
+    assert warmup.states["missing"].note == "runtime missing"
+    assert warmup.states["broken"].status == "failed"
+    assert warmup.states["broken"].note == "boom"
+
+
+def test_ready_endpoint_waits_for_warmup(monkeypatch) -> None:
+    warmup = Warmup(ConversionExecutor(max_workers=1))
+    monkeypatch.setattr(main, "WARMUP", warmup)
+    response = Response()
+    assert main.ready(response)["ready"] is False and response.status_code == 503
+
+    warmup.finished.set()
+    response = Response()
+    assert main.ready(response)["ready"] is True and response.status_code != 503